@@ -10,6 +10,13 @@ from scipy.stats import norm, probplot
 import seaborn as sns
 import matplotlib.pyplot as plt
 from io import StringIO, BytesIO
+import charts
+import column_registry
+import data_store
+import density
+import ordinal_codec
+import ui
+from stats_engine import RunningStats
 
 # Configuration de la page
 st.set_page_config(
@@ -143,22 +150,67 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def load_dataset(version):
+    # Vue partagée avec les autres pages : chaque section n'en lit que ses colonnes
+    return data_store.shared_view(version=version)
+
+# Une seule version conservée : la précédente est libérée dès qu'une nouvelle est servie
+@st.cache_resource(max_entries=1)
+def load_feature_store(version):
+    return data_store.open_feature_store(version=version)
+
+@st.cache_resource(max_entries=1)
+def load_artifacts(version):
+    return data_store.load_artifacts(version=version)
+
+@st.cache_resource(max_entries=1)
+def load_registry(version):
+    return data_store.load_registry(version=version)
+
+@st.cache_data
+def load_histogram(version, column, transform='Original', bins=50):
+    # Effectifs calculés côté serveur : seules les classes sont envoyées au navigateur
+    return charts.binned_histogram(load_feature_store(version).array(column), bins, transform)
+
 @st.cache_data
-def load_dataset():
-    train = pd.read_csv("train.csv",
-                        sep=';', encoding='utf-8', on_bad_lines='warn')
-    test  = pd.read_csv("test.csv",
-                        sep=';', encoding='utf-8', on_bad_lines='warn')
-    
-    df = pd.concat([train, test], axis=0, ignore_index=True)
-    df = df.drop(columns=['Id'])
+def load_kde(version, column, bw_factor=1.0):
+    # Densité calculée une fois par (colonne, largeur de bande), par FFT sur une grille
+    return density.binned_kde(load_feature_store(version).array(column), bw_factor)
 
-    # Conversion ObjectDType → str
-    for col in df.columns:
-        if "object" in str(df[col].dtype) or "ObjectDType" in str(df[col].dtype):
-            df[col] = df[col].astype(str)
+@st.cache_data
+def load_violins(version, column, category, bw_factor=1.0):
+    # Densités de toutes les catégories en une passe, sur une grille commune
+    data = load_dataset(version).project([category, column])
+    codes, labels = pd.factorize(data[category], sort=True)
+    values = pd.to_numeric(data[column]).to_numpy(dtype=np.float64, na_value=np.nan)
+    x, densities, counts = density.grouped_kde(values, codes, len(labels), bw_factor)
+    labels = [str(label) for label in labels]
+    order = np.argsort(labels, kind='stable')
+    return x, densities[order], counts[order], [labels[i] for i in order]
 
-    return df
+@st.cache_data
+def load_box_extremes(version, column, category):
+    # Moustaches observées et outliers (bornés) de chaque catégorie, autour des boîtes des sketches
+    data = load_dataset(version).project([category, column]).dropna()
+    boxes = load_artifacts(version).sketches.boxes(category)
+    return {label: charts.box_extremes(values.to_numpy(dtype=np.float64), boxes.loc[label])
+            for label, values in data.groupby(category, observed=True)[column]
+            if label in boxes.index}
+
+@st.cache_data
+def load_raster(version, x, y, color=None, value=None, how='count', x_range=None, y_range=None):
+    # Une grille par (x, y, couleur, valeur, agrégation, fenêtre) : recalculée seulement au zoom
+    columns = list(dict.fromkeys(col for col in (x, y, color, value) if col))
+    data = load_dataset(version).project(columns).dropna()
+    if x in ordinal_codec.ORDINAL_SCALES:
+        data = data.assign(**{x: ordinal_codec.numeric_features(data, [x])[x]})
+    labels = None
+    if how == 'majority':
+        labels = [str(category) for category in data[color].cat.categories]
+        values = data[color].cat.codes
+    else:
+        values = data[value] if value else None
+    return charts.rasterize(data[x], data[y], values, how, x_range=x_range, y_range=y_range, labels=labels)
 
 def create_horizontal_navigation():
     """Crée la navigation horizontale unique"""
@@ -226,8 +278,79 @@ def create_horizontal_navigation():
     
     return st.session_state.analysis_section
 
-def analyze_target_variable(df):
+def raster_view(version, x_var, y_var, color_var=None, value_var=None, key="raster"):
+    """Carte de densité : agrégation par cellule choisie, fenêtre réglable par curseurs."""
+    aggregations = {"Nombre de ventes": 'count'}
+    if value_var:
+        aggregations[f"Moyenne de {value_var}"] = 'mean'
+    if color_var:
+        aggregations[f"{color_var} majoritaire"] = 'majority'
+    label = st.selectbox("Agrégation par cellule :", list(aggregations), key=f"{key}_how")
+    how = aggregations[label]
+    
+    # Vue complète (en cache) : ses bornes servent de limites aux curseurs de fenêtre
+    raster = load_raster(version, x_var, y_var, color_var, value_var, how)
+    x_bounds = (float(raster.x_edges[0]), float(raster.x_edges[-1]))
+    y_bounds = (float(raster.y_edges[0]), float(raster.y_edges[-1]))
+    col1, col2 = st.columns(2)
+    with col1:
+        x_range = st.slider(f"Fenêtre {x_var}", *x_bounds, value=x_bounds,
+                            key=f"{key}_x_{x_var}") if x_bounds[0] < x_bounds[1] else x_bounds
+    with col2:
+        y_range = st.slider(f"Fenêtre {y_var}", *y_bounds, value=y_bounds,
+                            key=f"{key}_y_{y_var}") if y_bounds[0] < y_bounds[1] else y_bounds
+    if (tuple(x_range), tuple(y_range)) != (x_bounds, y_bounds):
+        raster = load_raster(version, x_var, y_var, color_var, value_var, how, tuple(x_range), tuple(y_range))
+    
+    fig = go.Figure(charts.raster_heatmap(raster, name=label))
+    fig.update_layout(
+        title=f"Carte de densité {x_var} vs {y_var} ({label.lower()})",
+        xaxis_title=x_var,
+        yaxis_title=y_var,
+        height=550
+    )
+    if x_var in ordinal_codec.ORDINAL_SCALES:
+        fig.update_xaxes(**ordinal_codec.axis_ticks(x_var))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"🗺️ {raster.represented:,} observations agrégées en {raster.cells:,} cellules non vides "
+               f"(grille {charts.RASTER_SIZE}×{charts.RASTER_SIZE}, une seule trace envoyée)")
+
+def sketch_box(box, name, color=None, extremes=None):
+    """Boîte à moustaches précalculée à partir du résumé d'un sketch de quantiles.
+
+    `extremes` (voir `charts.box_extremes`) fournit les extrémités observées des
+    moustaches ; à défaut, les bornes théoriques du sketch sont tracées.
+    """
+    lower, upper = (box['lowerfence'], box['upperfence']) if extremes is None else extremes[:2]
+    return go.Box(
+        x=[name], q1=[box['q1']], median=[box['median']], q3=[box['q3']],
+        lowerfence=[lower], upperfence=[upper],
+        name=str(name), marker_color=color, boxpoints=False
+    )
+
+def outlier_markers(name, extremes, color=None):
+    """Outliers d'une boîte, tracés à part (au plus `charts.MAX_OUTLIERS`)."""
+    outliers = extremes[2]
+    return go.Scatter(x=[name] * len(outliers), y=outliers, mode='markers',
+                      marker=dict(color=color, size=5), name=str(name), showlegend=False)
+
+def analyze_target_variable(features, artifacts, version):
     """Analyse de la variable cible SalePrice"""
+    # Seule la colonne SalePrice est lue depuis la matrice mappée
+    price = features.series('SalePrice')
+    
+    # Moments de la cible et de ses transformations en un seul passage vectorisé
+    transforms = pd.DataFrame({
+        'Original': price,
+        'Log(x+1)': np.log1p(price),
+        'Racine Carrée': np.sqrt(price),
+    })
+    moments = RunningStats.from_frame(transforms, transforms.columns).summary()
+    target = moments.loc['Original']
+    # Médiane, quartiles et seuil d'outliers lus sur le sketch de quantiles (temps constant)
+    box = artifacts.sketches.column('SalePrice').box()
+    Q1, median, Q3 = box['q1'], box['median'], box['q3']
+    
     st.markdown("<div class='section-card'><h3>🎯 Analyse de la Variable Cible</h3></div>", unsafe_allow_html=True)
     
     # Métriques statistiques avancées
@@ -237,7 +360,7 @@ def analyze_target_variable(df):
         st.markdown(f"""
         <div class='metric-card'>
             <h4>Moyenne</h4>
-            <h3>${df['SalePrice'].mean():,.0f}</h3>
+            <h3>${target['mean']:,.0f}</h3>
         </div>
         """, unsafe_allow_html=True)
     
@@ -245,7 +368,7 @@ def analyze_target_variable(df):
         st.markdown(f"""
         <div class='metric-card'>
             <h4>Médiane</h4>
-            <h3>${df['SalePrice'].median():,.0f}</h3>
+            <h3>${median:,.0f}</h3>
         </div>
         """, unsafe_allow_html=True)
     
@@ -253,7 +376,7 @@ def analyze_target_variable(df):
         st.markdown(f"""
         <div class='metric-card'>
             <h4>Écart-type</h4>
-            <h3>${df['SalePrice'].std():,.0f}</h3>
+            <h3>${target['std']:,.0f}</h3>
         </div>
         """, unsafe_allow_html=True)
     
@@ -261,7 +384,7 @@ def analyze_target_variable(df):
         st.markdown(f"""
         <div class='metric-card'>
             <h4>Skewness</h4>
-            <h3>{df['SalePrice'].skew():.2f}</h3>
+            <h3>{target['skew']:.2f}</h3>
         </div>
         """, unsafe_allow_html=True)
     
@@ -272,29 +395,30 @@ def analyze_target_variable(df):
         # Histogramme avec courbe de densité et distribution normale
         fig = go.Figure()
         
-        # Histogramme
-        fig.add_trace(go.Histogram(
-            x=df['SalePrice'], 
-            nbinsx=50,
+        # Histogramme (classes pré-calculées)
+        fig.add_trace(charts.histogram_bar(
+            load_histogram(version, 'SalePrice', bins=50),
             name='Distribution',
-            marker_color='#667eea',
+            color='#667eea',
             opacity=0.7,
-            histnorm='probability density'
+            density=True
         ))
         
-        # Courbe de densité KDE
-        density = stats.gaussian_kde(df['SalePrice'].dropna())
-        x_range = np.linspace(df['SalePrice'].min(), df['SalePrice'].max(), 100)
+        # Courbe de densité KDE (grille FFT mise en cache, lue aux points tracés)
+        bw_factor = st.select_slider("Lissage de la densité (× Scott)", density.BANDWIDTH_FACTORS,
+                                     value=1.0, key="kde_bw")
+        kde = load_kde(version, 'SalePrice', bw_factor)
+        x_range = np.linspace(target['min'], target['max'], 100)
         fig.add_trace(go.Scatter(
             x=x_range, 
-            y=density(x_range),
+            y=kde(x_range),
             mode='lines',
             name='Densité KDE',
             line=dict(color='#ff6b6b', width=3)
         ))
         
         # Distribution normale théorique
-        mu, sigma = df['SalePrice'].mean(), df['SalePrice'].std()
+        mu, sigma = target['mean'], target['std']
         normal_curve = norm.pdf(x_range, mu, sigma)
         fig.add_trace(go.Scatter(
             x=x_range, 
@@ -313,17 +437,12 @@ def analyze_target_variable(df):
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        # Box plot avancé avec outliers
-        fig = px.box(df, y='SalePrice', 
-                    title="Analyse des Outliers - SalePrice",
-                    color_discrete_sequence=['#ffa726'])
-        
-        # Ajouter des annotations pour les outliers
-        Q1 = df['SalePrice'].quantile(0.25)
-        Q3 = df['SalePrice'].quantile(0.75)
-        IQR = Q3 - Q1
-        upper_bound = Q3 + 1.5 * IQR
-        outliers = df[df['SalePrice'] > upper_bound]
+        # Box plot avancé avec outliers : boîte issue du sketch, seuls les outliers sont tracés
+        upper_bound = box['outlier_bound']
+        extremes = charts.box_extremes(price, box)
+        fig = go.Figure([sketch_box(box, 'SalePrice', '#ffa726', extremes),
+                         outlier_markers('SalePrice', extremes, '#ffa726')])
+        fig.update_layout(title="Analyse des Outliers - SalePrice")
         
         fig.add_annotation(
             x=0, y=upper_bound,
@@ -348,7 +467,7 @@ def analyze_target_variable(df):
         fig = go.Figure()
         
         # Calcul des quantiles
-        sorted_data = np.sort(df['SalePrice'].dropna())
+        sorted_data = np.sort(price.dropna())
         theoretical_quantiles = stats.norm.ppf(
             np.linspace(0.01, 0.99, len(sorted_data))
         )
@@ -383,13 +502,9 @@ def analyze_target_variable(df):
         # Analyse des transformations
         st.subheader("🔧 Transformation des Données")
         
-        original_skew = df['SalePrice'].skew()
-        log_skew = np.log1p(df['SalePrice']).skew()
-        sqrt_skew = np.sqrt(df['SalePrice']).skew()
-        
         transform_data = {
-            'Transformation': ['Original', 'Log(x+1)', 'Racine Carrée'],
-            'Skewness': [original_skew, log_skew, sqrt_skew],
+            'Transformation': list(transforms.columns),
+            'Skewness': moments['skew'].to_numpy(),
             'Recommandation': ['Non recommandé', '✅ Optimal', 'Amélioration']
         }
         
@@ -400,27 +515,33 @@ def analyze_target_variable(df):
         fig = make_subplots(rows=1, cols=3, 
                     subplot_titles=['Original', 'Log Transformation', 'Racine Carrée'])
         
-        # Original
-        fig.add_trace(go.Histogram(x=df['SalePrice'], nbinsx=30, name='Original'), 1, 1)
-        # Log
-        fig.add_trace(go.Histogram(x=np.log1p(df['SalePrice']), nbinsx=30, name='Log'), 1, 2)
-        # Sqrt
-        fig.add_trace(go.Histogram(x=np.sqrt(df['SalePrice']), nbinsx=30, name='Sqrt'), 1, 3)
+        # Original, Log et Racine carrée : classes pré-calculées par transformation
+        for i, (transform, name) in enumerate(zip(transforms.columns, ['Original', 'Log', 'Sqrt']), start=1):
+            fig.add_trace(charts.histogram_bar(load_histogram(version, 'SalePrice', transform, bins=30),
+                                               name=name), 1, i)
         
         fig.update_layout(showlegend=False, height=300)
         st.plotly_chart(fig, use_container_width=True)
 
-def advanced_correlation_analysis(df):
+def advanced_correlation_analysis(features, artifacts, registry):
     """Analyse de corrélation avancée"""
     st.markdown("<div class='section-card'><h2>🔄 Analyse de Corrélation</h2></div>", unsafe_allow_html=True)
     
-    # Sélection des variables numériques
-    numeric_cols = df.select_dtypes(include=['number']).columns
+    # Sélection des variables numériques (vues sur la matrice mappée)
+    numeric_cols = features.columns
     seuil = 10  # Seuil plus élevé pour plus de précision
-    numeric_cols_filtered = [col for col in numeric_cols if df[col].nunique() > seuil]
+    # Cardinalités lues dans le registre des colonnes (aucun parcours des données)
+    numeric_cols_filtered = registry.above(numeric_cols, seuil)
+    
+    # Variables ordinales (qualité, état) : codes int8 utilisés directement
+    include_ordinal = st.checkbox("Inclure les variables ordinales (qualité, état, finition)",
+                                  value=True, key="corr_ordinal")
+    corr_cols = list(numeric_cols_filtered)
+    if include_ordinal:
+        corr_cols += [col for col in registry.columns(column_registry.ORDINAL) if col in artifacts.correlation.columns]
     
-    # Matrice de corrélation
-    corr_matrix = df[numeric_cols_filtered].corr()
+    # Matrice de corrélation (sommes croisées maintenues de façon incrémentale)
+    corr_matrix = artifacts.correlation.correlation().loc[corr_cols, corr_cols]
     
     # Heatmap interactive avancée
     fig = go.Figure(data=go.Heatmap(
@@ -473,28 +594,28 @@ def advanced_correlation_analysis(df):
         fig.update_layout(xaxis_title="Coefficient de Corrélation", yaxis_title="Variables")
         st.plotly_chart(fig, use_container_width=True)
 
-def variable_relationship_analysis(df):
+def variable_relationship_analysis(dataset, features, registry, version):
     """Analyse des relations entre variables"""
     st.markdown("<div class='section-card'><h3>📊 Analyse des relations entre les variables</h3></div>", unsafe_allow_html=True)
     
-    # Créer une copie du DataFrame
-    df_clean = df.copy()
-    
-    # Sélection des variables
-    numeric_cols = df_clean.select_dtypes(include=['number']).columns
+    # Sélection des variables (métadonnées et matrice mappée, sans charger le dataset)
+    numeric_cols = features.columns
     seuil = 10
-    numeric_cols_filtered = [col for col in numeric_cols if df_clean[col].nunique() > seuil]
+    numeric_cols_filtered = registry.above(numeric_cols, seuil)
     
     # S'assurer que SalePrice est dans la liste
     target_var = 'SalePrice'
     if target_var in numeric_cols and target_var not in numeric_cols_filtered:
         numeric_cols_filtered.append(target_var)
     
+    # Variables ordinales utilisables comme variable X
+    ordinal_cols = registry.columns(column_registry.ORDINAL)
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.markdown("<div class='variable-group'><h5>🔍 Variables Numériques</h5></div>", unsafe_allow_html=True)
-        x_var = st.selectbox("Variable X (Numérique):", numeric_cols_filtered, index=1, key="rel_x")
+        x_var = st.selectbox("Variable X (Numérique):", numeric_cols_filtered + ordinal_cols, index=1, key="rel_x")
     
     with col2:
         st.markdown("<div class='variable-group'><h5>🎯 Variable Cible</h5></div>", unsafe_allow_html=True)
@@ -504,7 +625,7 @@ def variable_relationship_analysis(df):
     
     with col3:
         st.markdown("<div class='variable-group'><h5>🎨 Variables Catégorielles</h5></div>", unsafe_allow_html=True)
-        categorical_cols = df_clean.select_dtypes(include=['object', 'category']).columns
+        categorical_cols = registry.categorical_columns
         color_var = st.selectbox("Variable de couleur (Catégorielle):", 
                                ['Aucune'] + list(categorical_cols), key="rel_color")
     
@@ -514,6 +635,9 @@ def variable_relationship_analysis(df):
         st.info("Veuillez sélectionner des variables différentes pour l'analyse.")
         return
     
+    # Seules les colonnes choisies sont lues depuis le stockage colonnaire
+    df_clean = dataset.project([x_var, y_var] + ([color_var] if color_var != 'Aucune' else []))
+    
     # Création du graphique SANS hover_data pour éviter les erreurs
     try:
         # Préparer les colonnes nécessaires
@@ -522,35 +646,60 @@ def variable_relationship_analysis(df):
             cols_needed.append(color_var)
         
         # Créer le DataFrame pour le graphique
-        plot_data = df_clean[cols_needed].dropna()
+        plot_data = df_clean[cols_needed]
+        if x_var in ordinal_cols:
+            # Codes ordinaux comme valeurs numériques, libellés restaurés sur l'axe
+            plot_data = plot_data.assign(**{x_var: ordinal_codec.numeric_features(plot_data, [x_var])[x_var]})
+        plot_data = plot_data.dropna()
         
         # Vérifier qu'il reste des données
         if len(plot_data) == 0:
             st.warning("⚠️ **Aucune donnée disponible** après suppression des valeurs manquantes.")
             return
         
+        # Très grands volumes : carte de densité agrégée côté serveur
+        mode = st.radio("Mode d'affichage :", ["Nuage de points", "Carte de densité"],
+                        index=1 if len(plot_data) > charts.RASTER_THRESHOLD else 0,
+                        horizontal=True, key="rel_mode")
+        if mode == "Carte de densité":
+            raster_view(version, x_var, y_var, color_var if color_var != 'Aucune' else None, key="rel_raster")
+            return
+        
+        # Points tracés : WebGL et échantillonnage par grille pour les grands volumes
+        scatter = charts.plan_scatter(plot_data, x_var, y_var)
+        trendline = None if scatter.sampled else "ols"
+        
         # Créer le graphique SANS hover_data (solution la plus simple et robuste)
         if color_var != 'Aucune':
             fig = px.scatter(
-                plot_data, 
+                scatter.data, 
                 x=x_var, 
                 y=y_var, 
                 color=color_var,
                 title=f"Relation {x_var} vs {y_var} par {color_var}",
-                trendline="ols",
+                trendline=trendline,
                 opacity=0.6,
+                render_mode=scatter.render_mode,
                 color_discrete_sequence=px.colors.qualitative.Set1
             )
         else:
             fig = px.scatter(
-                plot_data, 
+                scatter.data, 
                 x=x_var, 
                 y=y_var,
                 title=f"Relation {x_var} vs {y_var}",
-                trendline="ols",
+                trendline=trendline,
+                render_mode=scatter.render_mode,
                 color_discrete_sequence=['#667eea'],
                 opacity=0.6
             )
+        if scatter.sampled and color_var != 'Aucune':
+            # Une tendance par groupe, ajustée sur toutes ses observations, pas sur l'échantillon
+            colors = {trace.name: trace.marker.color for trace in fig.data}
+            fig.add_traces(charts.ols_lines(plot_data, x_var, y_var, color_var, colors))
+        elif scatter.sampled:
+            # Tendance ajustée sur toutes les observations, pas sur l'échantillon
+            fig.add_trace(charts.ols_line(plot_data[x_var], plot_data[y_var]))
         
         # Calcul des métriques
         correlation = plot_data[x_var].corr(plot_data[y_var])
@@ -568,6 +717,9 @@ def variable_relationship_analysis(df):
             font=dict(size=12, color="black")
         )
         
+        if x_var in ordinal_cols:
+            fig.update_xaxes(**ordinal_codec.axis_ticks(x_var))
+        
         # Personnaliser le layout
         fig.update_layout(
             xaxis_title=f"{x_var}",
@@ -579,6 +731,7 @@ def variable_relationship_analysis(df):
         
         # Afficher le graphique
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(scatter.caption())
         
         # Afficher des informations supplémentaires
         with st.expander("📈 Détails de l'analyse"):
@@ -661,11 +814,11 @@ def variable_relationship_analysis(df):
             except:
                 st.write("⚠️ Impossible d'afficher un graphique avec les variables sélectionnées.")
 
-def categorical_analysis(df):
+def categorical_analysis(dataset, artifacts, registry, version):
     """Analyse approfondie des variables catégorielles"""
     st.markdown("<div class='section-card'><h3>🏘️ Analyse des Variables Catégorielles</h3></div>", unsafe_allow_html=True)
     
-    categorical_cols = df.select_dtypes(include=['object']).columns
+    categorical_cols = registry.categorical_columns
     
     col1, col2 = st.columns(2)
     
@@ -679,22 +832,50 @@ def categorical_analysis(df):
                                 ["Box Plot", "Violin Plot", "Prix Moyen", "Distribution"])
     
     if analysis_type == "Box Plot":
-        fig = px.box(df, x=cat_var, y='SalePrice',
-                    title=f"Distribution des Prix par {cat_var}",
-                    color=cat_var)
-        fig.update_layout(xaxis_tickangle=-45)
+        # Une boîte précalculée par catégorie (sketches), sans envoyer les prix bruts
+        boxes = artifacts.sketches.boxes(cat_var)
+        extremes = load_box_extremes(version, 'SalePrice', cat_var)
+        colors = px.colors.qualitative.Plotly
+        fig = go.Figure()
+        for i, (category, box) in enumerate(boxes.iterrows()):
+            color = colors[i % len(colors)]
+            fig.add_trace(sketch_box(box, category, color, extremes.get(category)))
+            if category in extremes:
+                fig.add_trace(outlier_markers(category, extremes[category], color))
+        fig.update_layout(title=f"Distribution des Prix par {cat_var}", xaxis_title=cat_var,
+                          yaxis_title='SalePrice', legend_title_text=cat_var, xaxis_tickangle=-45)
         st.plotly_chart(fig, use_container_width=True)
+        n_outliers = sum(found[3] for found in extremes.values())
+        n_shown = sum(len(found[2]) for found in extremes.values())
+        st.caption(f"📦 Quartiles approchés (esquisses de quantiles) ; {n_shown:,} outliers tracés sur {n_outliers:,}"
+                   f" (au plus {charts.MAX_OUTLIERS} par catégorie, les plus éloignés)")
     
     elif analysis_type == "Violin Plot":
-        fig = px.violin(df, x=cat_var, y='SalePrice',
-                    title=f"Distribution en Violon - {cat_var}",
-                    color=cat_var,
-                    box=True)
-        fig.update_layout(xaxis_tickangle=-45)
+        # Violons tracés à partir des densités de chaque catégorie (toutes les lignes),
+        # boîtes issues des sketches
+        bw_factor = st.select_slider("Lissage des densités (× Scott)", density.BANDWIDTH_FACTORS,
+                                     value=1.0, key="violin_bw")
+        x, densities, counts, labels = load_violins(version, 'SalePrice', cat_var, bw_factor)
+        boxes = artifacts.sketches.boxes(cat_var)
+        extremes = {str(category): found for category, found in load_box_extremes(version, 'SalePrice', cat_var).items()}
+        boxes.index = boxes.index.map(str)
+        colors = px.colors.qualitative.Plotly
+        fig = go.Figure()
+        for i, label in enumerate(labels):
+            color = colors[i % len(colors)]
+            fig.add_trace(charts.kde_violin(x, densities[i], i, name=label, color=color))
+            if label in boxes.index:
+                fig.add_trace(sketch_box(boxes.loc[label], i, color, extremes.get(label)).update(
+                    name=label, width=0.1, showlegend=False, fillcolor='white'))
+        fig.update_layout(title=f"Distribution en Violon - {cat_var}", yaxis_title='SalePrice',
+                          legend_title_text=cat_var, xaxis_tickangle=-45,
+                          xaxis=dict(title=cat_var, tickvals=list(range(len(labels))), ticktext=labels))
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"🎻 Densités estimées sur {counts.sum():,} observations, "
+                   f"{len(x):,} points de grille par catégorie")
     
     elif analysis_type == "Prix Moyen":
-        avg_price = df.groupby(cat_var)['SalePrice'].agg(['mean', 'std', 'count']).reset_index()
+        avg_price = artifacts.categories.summary(cat_var).reset_index()
         avg_price = avg_price.sort_values('mean', ascending=True)
         
         fig = px.bar(avg_price, x='mean', y=cat_var,
@@ -706,19 +887,16 @@ def categorical_analysis(df):
         fig.update_layout(xaxis_title="Prix Moyen ($)", yaxis_title=cat_var)
         st.plotly_chart(fig, use_container_width=True)
 
-def multivariate_analysis(df):
+def multivariate_analysis(dataset, features, registry, version):
     """Analyse multivariée avancée"""
     st.markdown("<div class='section-card'><h3>🎭 Analyse Multivariée Avancée</h3></div>", unsafe_allow_html=True)
     
-    # Créer une copie pour éviter les modifications accidentelles
-    df_clean = df.copy()
-    
-    # Filtrer les colonnes numériques avec plus de valeurs uniques
-    numeric_cols = df_clean.select_dtypes(include=['number']).columns
-    categorical_cols = df_clean.select_dtypes(include=['object', 'category']).columns
+    # Filtrer les colonnes numériques avec plus de valeurs uniques (cardinalités précalculées)
+    numeric_cols = features.columns
+    categorical_cols = registry.categorical_columns
     
     seuil = 10
-    numeric_cols_filtered = [col for col in numeric_cols if df_clean[col].nunique() > seuil]
+    numeric_cols_filtered = registry.above(numeric_cols, seuil)
     
     # S'assurer que SalePrice est inclus s'il existe
     target_var = 'SalePrice'
@@ -775,8 +953,6 @@ def multivariate_analysis(df):
         return  # Arrêter l'exécution ici
     
     # Préparer les données pour le plot
-    plot_data = df_clean.copy()
-    
     # Gérer les valeurs manquantes pour les colonnes sélectionnées
     cols_to_clean = [x_var, y_var]
     if size_var != 'Aucune':
@@ -785,7 +961,7 @@ def multivariate_analysis(df):
         cols_to_clean.append(color_cat_var)
     
     # Supprimer les lignes avec NaN dans les colonnes utilisées
-    plot_data = plot_data[cols_to_clean].dropna()
+    plot_data = dataset.project(cols_to_clean).dropna()
     
     # Vérifier si on a suffisamment de données après nettoyage
     if len(plot_data) == 0:
@@ -793,48 +969,59 @@ def multivariate_analysis(df):
         st.info("Essayez de sélectionner d'autres variables ou vérifiez les données manquantes.")
         return
     
+    # Très grands volumes : carte de densité agrégée côté serveur
+    mode = st.radio("Mode d'affichage :", ["Nuage de points", "Carte de densité"],
+                    index=1 if len(plot_data) > charts.RASTER_THRESHOLD else 0,
+                    horizontal=True, key="multivar_mode")
+    if mode == "Carte de densité":
+        raster_view(version, x_var, y_var,
+                    color_cat_var if color_cat_var != 'Aucune' else None,
+                    size_var if size_var != 'Aucune' else None, key="multivar_raster")
+        return
+    
+    # Points tracés : WebGL et échantillonnage par grille pour les grands volumes
+    scatter = charts.plan_scatter(plot_data, x_var, y_var)
+    
     # Scatter plot avec gestion des erreurs
     try:
         if size_var != 'Aucune' and color_cat_var != 'Aucune':
             # S'assurer que la variable size est numérique
             if pd.api.types.is_numeric_dtype(plot_data[size_var]):
-                fig = px.scatter(plot_data, x=x_var, y=y_var, size=size_var, 
+                fig = px.scatter(scatter.data, x=x_var, y=y_var, size=size_var, 
                                color=color_cat_var,
                                title=f"Relation {x_var} vs {y_var} - Multidimensionnelle",
-                               hover_data=[col for col in plot_data.columns 
-                                         if col not in [x_var, y_var, size_var, color_cat_var]][:3],
-                               opacity=0.7,
+                               opacity=0.7, render_mode=scatter.render_mode,
                                color_discrete_sequence=px.colors.qualitative.Set1)
             else:
                 st.warning(f"La variable '{size_var}' doit être numérique pour l'utiliser comme taille.")
-                fig = px.scatter(plot_data, x=x_var, y=y_var, color=color_cat_var,
+                fig = px.scatter(scatter.data, x=x_var, y=y_var, color=color_cat_var,
                                title=f"Relation {x_var} vs {y_var} par {color_cat_var}",
-                               opacity=0.7,
+                               opacity=0.7, render_mode=scatter.render_mode,
                                color_discrete_sequence=px.colors.qualitative.Set1)
         
         elif size_var != 'Aucune':
             if pd.api.types.is_numeric_dtype(plot_data[size_var]):
-                fig = px.scatter(plot_data, x=x_var, y=y_var, size=size_var,
+                fig = px.scatter(scatter.data, x=x_var, y=y_var, size=size_var,
                                title=f"Relation {x_var} vs {y_var} (taille: {size_var})",
                                color_discrete_sequence=['#667eea'],
-                               opacity=0.7)
+                               opacity=0.7, render_mode=scatter.render_mode)
             else:
                 st.warning(f"La variable '{size_var}' doit être numérique pour l'utiliser comme taille.")
-                fig = px.scatter(plot_data, x=x_var, y=y_var,
+                fig = px.scatter(scatter.data, x=x_var, y=y_var,
                                title=f"Relation {x_var} vs {y_var}",
                                color_discrete_sequence=['#667eea'],
-                               opacity=0.7)
+                               opacity=0.7, render_mode=scatter.render_mode)
         
         elif color_cat_var != 'Aucune':
-            fig = px.scatter(plot_data, x=x_var, y=y_var, color=color_cat_var,
+            fig = px.scatter(scatter.data, x=x_var, y=y_var, color=color_cat_var,
                            title=f"Relation {x_var} vs {y_var} par {color_cat_var}",
-                           opacity=0.7,
+                           opacity=0.7, render_mode=scatter.render_mode,
                            color_discrete_sequence=px.colors.qualitative.Set1)
         else:
-            fig = px.scatter(plot_data, x=x_var, y=y_var,
+            fig = px.scatter(scatter.data, x=x_var, y=y_var,
                            title=f"Relation {x_var} vs {y_var}",
                            color_discrete_sequence=['#667eea'],
-                           opacity=0.7)
+                           opacity=0.7, render_mode=scatter.render_mode)
         
         # Personnaliser le layout
         fig.update_layout(
@@ -845,10 +1032,11 @@ def multivariate_analysis(df):
         )
         
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(scatter.caption())
         
         # Afficher les informations sur les données utilisées
         with st.expander("ℹ️ Informations sur les données utilisées"):
-            st.write(f"**Nombre de points affichés :** {len(plot_data)}")
+            st.write(f"**Nombre de points affichés :** {scatter.drawn:,} sur {scatter.represented:,} observations")
             st.write(f"**Colonnes utilisées :** {', '.join(cols_to_clean)}")
             if size_var != 'Aucune':
                 st.write(f"**Variable taille :** {size_var}")
@@ -861,24 +1049,24 @@ def multivariate_analysis(df):
         
         # Afficher un graphique simple de secours
         try:
-            fig = px.scatter(plot_data, x=x_var, y=y_var,
+            fig = px.scatter(scatter.data, x=x_var, y=y_var,
                            title=f"Relation {x_var} vs {y_var} (version simplifiée)",
                            color_discrete_sequence=['#667eea'],
-                           opacity=0.7)
+                           opacity=0.7, render_mode=scatter.render_mode)
             st.plotly_chart(fig, use_container_width=True)
         except:
             st.write("Impossible d'afficher le graphique avec les variables sélectionnées.")
 
-def temporal_analysis(df):
+def temporal_analysis(dataset, registry):
     """Analyse temporelle avancée"""
     st.markdown("<div class='section-card'><h3>📅 Analyse Temporelle et Saisonnière</h3></div>", unsafe_allow_html=True)
     
-    # Vérifier les colonnes temporelles disponibles
-    time_cols = ['YearBuilt', 'YearRemodAdd', 'YrSold', 'MoSold']
-    available_time_cols = [col for col in time_cols if col in df.columns]
+    # Colonnes temporelles du registre
+    available_time_cols = registry.columns(column_registry.TEMPORAL)
     
     if available_time_cols:
         time_var = st.selectbox("Variable temporelle:", available_time_cols, key="temporal_var")
+        df = dataset.project([time_var, 'SalePrice'])
         
         # Analyse par période
         temporal_stats = df.groupby(time_var)['SalePrice'].agg([
@@ -943,24 +1131,28 @@ def main():
     
     # Chargement optimisé des données
     with st.spinner('🔄 Chargement et préparation des données...'):
-        df = load_dataset()
+        version = ui.served_version()
+        dataset = load_dataset(version)
+        features = load_feature_store(version)
+        artifacts = load_artifacts(version)
+        registry = load_registry(version)
     
     # Navigation horizontale UNIQUE
     current_section = create_horizontal_navigation()
     
     # Affichage des sections d'analyse
     if current_section == "target":
-        analyze_target_variable(df)
+        analyze_target_variable(features, artifacts, version)
     elif current_section == "correlation":
-        advanced_correlation_analysis(df)
+        advanced_correlation_analysis(features, artifacts, registry)
     elif current_section == "relations":
-        variable_relationship_analysis(df)
+        variable_relationship_analysis(dataset, features, registry, version)
     elif current_section == "categorical":
-        categorical_analysis(df)
+        categorical_analysis(dataset, artifacts, registry, version)
     elif current_section == "multivariate":
-        multivariate_analysis(df)
+        multivariate_analysis(dataset, features, registry, version)
     elif current_section == "temporal":
-        temporal_analysis(df)
+        temporal_analysis(dataset, registry)
     
     # Section insights globaux
     st.markdown("<div class='section-card'><h4>💡 Insights et Recommandations Globales</h4></div>", unsafe_allow_html=True)
@@ -1,45 +1,91 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from io import BytesIO
+import charts
+import column_registry
+import data_store
+import descriptive
+import query
+import ui
+from indexes import bits_to_rows, count_bits, ordered_window
 import warnings
 warnings.filterwarnings('ignore')
 
-# ------------------------------
-# 🔧 Fonction pour corriger ObjectDType pour Plotly
-# ------------------------------
-def sanitize_df_for_plotly(df):
-    """Convertit les ObjectDType en string pour la compatibilité Plotly."""
-    df = df.copy()
-    for col in df.columns:
-        dtype_str = str(df[col].dtype)
-        if "ObjectDType" in dtype_str or "object" in dtype_str:
-            df[col] = df[col].astype(str)
-    return df
+# Variables proposées par défaut dans les filtres catégoriels
+FILTER_COLUMNS = ['Neighborhood', 'MSZoning', 'BldgType', 'HouseStyle', 'SaleCondition']
 
 # ------------------------------
 # 🚀 Chargement optimisé des données (cache)
 # ------------------------------
+# Les ressources indexées par version ne gardent que la dernière (max_entries=1) :
+# celles de la version précédente sont libérées dès qu'une nouvelle est servie
+def load_dataset(version):
+    """Dataset immobilier partagé par toutes les pages (une seule instance par processus)."""
+    return data_store.shared_dataset(version=version)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_feature_store(version):
+    """Ouvre la matrice numérique mappée, partagée entre sessions et processus."""
+    return data_store.open_feature_store(version=version)
+
+def load_indexes(version):
+    """Index de filtrage (triés, bitmap) construits à la demande, prolongés d'une version à la suivante.
+
+    Pas de cache de page : `data_store` ne conserve que les index de la version servie.
+    """
+    return data_store.shared_indexes(version=version)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_stats(version):
+    """Statistiques par colonne maintenues à l'ingestion (sans second passage)."""
+    return data_store.load_stats(version=version)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_registry(version):
+    """Rôle (continue, discrète, ordinale...) et statistiques de chaque colonne."""
+    return data_store.load_registry(version=version)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_summary(version):
+    """Résumé descriptif enregistré avec la version du dataset."""
+    return data_store.load_summary(version=version)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_missingness(version):
+    """Profil des valeurs manquantes (colonnes, lignes, co-absence) de la version."""
+    return data_store.load_missingness(version=version)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_filtered_stats(version, predicate_key, _predicate):
+    """Statistiques descriptives des lignes retenues par un filtre, calculées une fois par filtre.
+
+    `predicate_key` (la représentation du filtre) sert de clé de cache ; seules
+    les lignes retenues sont extraites du dataset.
+    """
+    registry = load_registry(version)
+    indexes = load_indexes(version)
+    rows = bits_to_rows(_predicate.bits(indexes), indexes.n_rows)
+    filtered = load_dataset(version).take(rows)
+    counts = descriptive.category_counts(filtered, registry.categorical_columns)
+    return (descriptive.numeric_table(filtered, registry.numeric_columns), counts,
+            descriptive.categorical_table(counts=counts, n_rows=len(filtered)))
+
 @st.cache_data(show_spinner=False)
-def load_dataset():
-    """Charge et prépare le dataset immobilier."""
-    train = pd.read_csv("train.csv",
-                        sep=';', encoding='utf-8', on_bad_lines='warn')
-    test = pd.read_csv("test.csv",
-                    sep=';', encoding='utf-8', on_bad_lines='warn')
-    
-    # Fusion des données train et test
-    df = pd.concat([train, test], axis=0, ignore_index=True)
-    df = df.drop(columns=['Id'])
-    
-    # Conversion des colonnes texte en string
-    for col in df.columns:
-        if "object" in str(df[col].dtype) or "ObjectDType" in str(df[col].dtype):
-            df[col] = df[col].astype(str)
-    
-    return df
+def load_histogram(version, column, bins=50):
+    """Classes d'un histogramme calculées côté serveur (seuls les effectifs sont envoyés)."""
+    return charts.binned_histogram(load_feature_store(version).array(column), bins)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_plotly_columns(version):
+    """Colonnes converties pour Plotly, mémorisées une fois par version et par colonne."""
+    return charts.PlotlyColumns(data_store.shared_view(version=version))
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_memory_report(version):
+    """Octets économisés par colonne grâce au schéma compact (recalculés pour chaque version)."""
+    return data_store.memory_report()
 
 # ------------------------------
 # 🎨 Configuration de la page
@@ -215,7 +261,13 @@ def main():
     
     # Chargement des données avec spinner personnalisé
     with st.spinner("🔄 Chargement et préparation des données en cours..."):
-        df = load_dataset()
+        version = ui.served_version()
+        df = load_dataset(version)
+        ingestion_stats = load_stats(version)
+        numeric_summary = ingestion_stats.summary()
+        summary = load_summary(version)
+        missingness = load_missingness(version)
+        registry = load_registry(version)
     
     # ------------------------------
     # 🎯 Section 1: Aperçu du Dataset
@@ -243,7 +295,7 @@ def main():
         """.format(len(df.columns)), unsafe_allow_html=True)
     
     with col3:
-        numeric_cols = len(df.select_dtypes(include=[np.number]).columns)
+        numeric_cols = len(registry.numeric_columns)
         st.markdown("""
         <div class="metric-card">
             <div style="font-size: 0.9rem; color: #718096; margin-bottom: 0.5rem;">🔢 Variables Numériques</div>
@@ -252,7 +304,7 @@ def main():
         """.format(numeric_cols), unsafe_allow_html=True)
     
     with col4:
-        cat_cols = len(df.select_dtypes(include=['object', 'category']).columns)
+        cat_cols = len(registry.categorical_columns)
         st.markdown("""
         <div class="metric-card">
             <div style="font-size: 0.9rem; color: #718096; margin-bottom: 0.5rem;">🏷️ Variables Catégorielles</div>
@@ -265,7 +317,7 @@ def main():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        avg_price = df['SalePrice'].mean()
+        avg_price = numeric_summary.loc['SalePrice', 'mean']
         st.markdown(f"""
         <div class="metric-card">
             <div style="font-size: 0.9rem; color: #718096; margin-bottom: 0.5rem;">💰 Prix Moyen</div>
@@ -274,7 +326,8 @@ def main():
         """, unsafe_allow_html=True)
     
     with col2:
-        median_price = df['SalePrice'].median()
+        # Médiane lue sur l'esquisse de quantiles du résumé (sans parcourir les ventes)
+        median_price = summary.numeric.loc['SalePrice', '50%']
         st.markdown(f"""
         <div class="metric-card">
             <div style="font-size: 0.9rem; color: #718096; margin-bottom: 0.5rem;">📊 Prix Médian</div>
@@ -283,7 +336,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with col3:
-        min_price = df['SalePrice'].min()
+        min_price = numeric_summary.loc['SalePrice', 'min']
         st.markdown(f"""
         <div class="metric-card">
             <div style="font-size: 0.9rem; color: #718096; margin-bottom: 0.5rem;">📉 Prix Minimum</div>
@@ -292,7 +345,7 @@ def main():
         """, unsafe_allow_html=True)
     
     with col4:
-        max_price = df['SalePrice'].max()
+        max_price = numeric_summary.loc['SalePrice', 'max']
         st.markdown(f"""
         <div class="metric-card">
             <div style="font-size: 0.9rem; color: #718096; margin-bottom: 0.5rem;">📈 Prix Maximum</div>
@@ -311,12 +364,12 @@ def main():
     
     with col1:
         show_rows = st.slider(
-            "**Lignes à afficher**",
+            "**Lignes par page**",
             min_value=5,
             max_value=100,
             value=20,
             step=5,
-            help="Sélectionnez le nombre de lignes à afficher dans le tableau"
+            help="Sélectionnez le nombre de lignes affichées sur chaque page du tableau"
         )
     
     with col2:
@@ -337,8 +390,10 @@ def main():
             selected_columns.insert(0, "SalePrice")
     
     with col3:
-        price_min = int(df['SalePrice'].min())
-        price_max = int(df['SalePrice'].max())
+        indexes = load_indexes(version)
+        price_index = indexes.sorted('SalePrice')
+        price_min = int(price_index.min)
+        price_max = int(price_index.max)
         price_range = st.slider(
             "**Plage de Prix**",
             min_value=price_min,
@@ -348,22 +403,89 @@ def main():
             help="Filtrez les données par fourchette de prix"
         )
     
-    # Application des filtres
-    filtered_df = df[selected_columns]
-    filtered_df = filtered_df[
-        (filtered_df['SalePrice'] >= price_range[0]) & 
-        (filtered_df['SalePrice'] <= price_range[1])
-    ]
+    # Filtres catégoriels : OU entre les modalités d'une variable, ET entre variables
+    with st.expander("🔎 Filtres avancés", expanded=False):
+        categorical_options = registry.categorical_columns
+        filter_columns = st.multiselect(
+            "**Variables de filtrage**",
+            options=categorical_options,
+            default=[col for col in FILTER_COLUMNS if col in categorical_options],
+            key="filter_columns"
+        )
+        category_filters = {}
+        filter_cols = st.columns(3)
+        for i, col in enumerate(filter_columns):
+            with filter_cols[i % 3]:
+                category_filters[col] = st.multiselect(
+                    col,
+                    options=indexes.bitmap(col).categories,
+                    key=f"filter_{col}"
+                )
+        
+        # Fenêtres temporelles (années de construction, de vente, mois de vente)
+        year_filters = {}
+        year_cols = st.columns(3)
+        for i, col in enumerate(['YearBuilt', 'YrSold', 'MoSold']):
+            year_index = indexes.sorted(col)
+            bounds = (int(year_index.min), int(year_index.max))
+            with year_cols[i]:
+                window = st.slider(col, min_value=bounds[0], max_value=bounds[1], value=bounds, key=f"window_{col}")
+            if window != bounds:
+                year_filters[col] = window
+        
+        exclude_missing = st.multiselect(
+            "**Exclure les valeurs manquantes de**",
+            options=df.columns.tolist(),
+            key="filter_not_null"
+        )
+    
+    # Requête composée : résolue sur les index (triés, bitmap) pour l'affichage,
+    # seules les lignes affichées sont extraites du dataset
+    predicate = query.all_of(
+        [query.Range('SalePrice', *price_range)]
+        + [query.In(col, chosen) for col, chosen in category_filters.items() if chosen]
+        + [query.year_window(col, *window) for col, window in year_filters.items()]
+        + [query.NotNull(col) for col in exclude_missing]
+    )
+    selection = predicate.bits(indexes)
+    n_filtered = count_bits(selection)
+    
+    # Pagination et tri côté serveur : seule la page visible est extraite,
+    # le tri parcourt une permutation précalculée de la colonne
+    n_pages = max(1, -(-n_filtered // show_rows))
+    if st.session_state.get("table_page", 1) > n_pages:
+        st.session_state["table_page"] = n_pages
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_column = st.selectbox(
+            "**Trier par**",
+            options=["(ordre du dataset)"] + selected_columns,
+            key="table_sort"
+        )
+    with col2:
+        ascending = st.radio("**Ordre**", ["Croissant", "Décroissant"], horizontal=True, key="table_order") == "Croissant"
+    with col3:
+        page = st.number_input("**Page**", min_value=1, max_value=n_pages, step=1, key="table_page")
+    
+    offset = (page - 1) * show_rows
+    if sort_column == "(ordre du dataset)":
+        page_rows = bits_to_rows(selection, len(df), limit=show_rows, offset=offset)
+    else:
+        page_rows = ordered_window(selection, indexes.order(sort_column, ascending), offset, show_rows)
     
     # Affichage du dataframe avec style
     st.dataframe(
-        filtered_df.head(show_rows),
+        df[selected_columns].take(page_rows),
         use_container_width=True,
         height=400
     )
     
     # Informations sur le filtrage
-    st.info(f"✅ **{len(filtered_df)}** maisons affichées sur **{len(df)}** totales | Prix: **${price_range[0]:,}** - **${price_range[1]:,}**")
+    active_filters = sum(1 for chosen in category_filters.values() if chosen) + len(year_filters) + len(exclude_missing)
+    st.info(f"✅ **{n_filtered}** maisons affichées sur **{len(df)}** totales | Prix: **${price_range[0]:,}** - **${price_range[1]:,}**"
+            + (f" | Filtres avancés: **{active_filters}**" if active_filters else "")
+            + f" | Page **{page}** / **{n_pages}**")
     st.markdown("</div>", unsafe_allow_html=True)
     
     # ------------------------------
@@ -372,34 +494,33 @@ def main():
     st.markdown("<div class='content-card fade-in'>", unsafe_allow_html=True)
     st.markdown("<h3><span style='color:#667eea'>📈</span> Analyse Statistique Avancée</h3>", unsafe_allow_html=True)
     
+    # Résumé précalculé pour la version ; recalcul uniquement sur une vue filtrée
+    if n_filtered < len(df):
+        st.caption(f"Statistiques calculées sur les {n_filtered:,} maisons retenues par les filtres")
+        stats_df, category_counts, cat_stats_df = load_filtered_stats(version, repr(predicate), predicate)
+    else:
+        st.caption("Quartiles approchés (esquisses de quantiles, erreur de rang < 2 %)")
+        stats_df = summary.numeric
+        category_counts = summary.category_counts
+        cat_stats_df = summary.categorical
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📊 Statistiques Numériques")
-        numeric_df = df.select_dtypes(include=[np.number])
-        stats_df = numeric_df.describe().T
-        stats_df['cv'] = (stats_df['std'] / stats_df['mean'] * 100).round(2)  # Coefficient de variation
         st.dataframe(stats_df, use_container_width=True)
     
     with col2:
         st.subheader("🏷️ Statistiques Catégorielles")
+        st.dataframe(cat_stats_df, use_container_width=True, hide_index=True)
         
-        # Sélection des principales variables catégorielles
-        cat_cols = df.select_dtypes(include=['object']).columns.tolist()[:5]
-        categorical_stats = []
-        
-        for col in cat_cols:
-            stats = {
-                'Variable': col,
-                'Catégories': df[col].nunique(),
-                'Mode': df[col].mode()[0] if not df[col].mode().empty else 'N/A',
-                'Fréq. Mode': df[col].value_counts().iloc[0],
-                '% Mode': f"{(df[col].value_counts().iloc[0] / len(df) * 100):.1f}%"
-            }
-            categorical_stats.append(stats)
-        
-        cat_stats_df = pd.DataFrame(categorical_stats)
-        st.dataframe(cat_stats_df, use_container_width=True)
+        with st.expander("🔝 Modalités les plus fréquentes", expanded=False):
+            top_col = st.selectbox("Variable :", list(category_counts), key="top_values_col")
+            top_k = st.slider("Nombre de modalités", min_value=3, max_value=20, value=10, key="top_values_k")
+            st.dataframe(
+                descriptive.top_values(category_counts[top_col], n_filtered, top_k),
+                use_container_width=True, hide_index=True
+            )
     st.markdown("</div>", unsafe_allow_html=True)
     
     # ------------------------------
@@ -414,10 +535,7 @@ def main():
         st.subheader("📊 Répartition des Types de Données")
         
         # Analyse des types de données
-        dtype_info = pd.DataFrame(df.dtypes.value_counts()).reset_index()
-        dtype_info.columns = ['Type', 'Count']
-        dtype_info['Pourcentage'] = (dtype_info['Count'] / len(df.columns) * 100).round(1)
-        dtype_info = sanitize_df_for_plotly(dtype_info)
+        dtype_info = charts.sanitize_for_plotly(summary.dtypes)
         
         fig = px.pie(
             dtype_info, 
@@ -434,8 +552,8 @@ def main():
     with col2:
         st.subheader("⚠️ Analyse des Valeurs Manquantes")
         
-        # Calcul des valeurs manquantes
-        missing_percent = (df.isnull().sum() / len(df) * 100).sort_values(ascending=False)
+        # Taux de valeurs manquantes (profil calculé une fois par version)
+        missing_percent = missingness.rates()
         missing_df = pd.DataFrame({
             'Variable': missing_percent.index,
             'Pourcentage': missing_percent.values.round(2)
@@ -473,6 +591,43 @@ def main():
         else:
             st.success("✅ Aucune valeur manquante détectée dans le dataset !")
     
+    # Co-absence : les variables manquent-elles sur les mêmes lignes ?
+    if not missingness.co_missing.empty:
+        with st.expander("🔗 Co-absence des Valeurs Manquantes"):
+            top_missing = missing_percent[missing_percent > 0].head(10).index.tolist()
+            col1, col2 = st.columns([3, 2])
+            with col1:
+                fig = px.imshow(
+                    missingness.conditional(top_missing).round(1),
+                    text_auto=True,
+                    color_continuous_scale='Reds',
+                    zmin=0,
+                    zmax=100,
+                    title="% des lignes où la colonne manque, parmi celles où la ligne manque"
+                )
+                fig.update_layout(height=500)
+                st.plotly_chart(fig, use_container_width=True)
+            with col2:
+                histogram = missingness.rows_histogram
+                fig = px.bar(
+                    x=histogram.index,
+                    y=histogram.values,
+                    title="Valeurs manquantes par observation",
+                    labels={'x': 'Variables manquantes', 'y': "Nombre d'observations"},
+                    color_discrete_sequence=['#667eea']
+                )
+                fig.update_layout(height=500)
+                st.plotly_chart(fig, use_container_width=True)
+    
+    # Empreinte mémoire du schéma compact
+    with st.expander("💾 Empreinte Mémoire par Colonne"):
+        if st.button("Calculer l'empreinte mémoire", key="memory_report"):
+            report = load_memory_report(version)
+            total_before = report['Octets avant'].sum()
+            total_after = report['Octets après'].sum()
+            st.info(f"✅ **{total_before:,}** octets → **{total_after:,}** octets (÷{total_before / total_after:.1f})")
+            st.dataframe(report, use_container_width=True, hide_index=True)
+    
     st.markdown("</div>", unsafe_allow_html=True)
     
     # ------------------------------
@@ -486,37 +641,25 @@ def main():
     with col1:
         st.subheader("🔢 Variables Numériques")
         
-        # Filtrage des variables numériques (exclure SalePrice et binaires)
-        numeric_features = [col for col in df.select_dtypes(include=[np.number]).columns 
-                        if col != 'SalePrice']
-        
-        # Détection des variables binaires (0/1)
-        binary_features = []
-        for feature in numeric_features:
-            unique_vals = df[feature].dropna().unique()
-            if len(unique_vals) == 2 and set(unique_vals) == {0, 1}:
-                binary_features.append(feature)
-        
-        # Variables numériques continues
-        continuous_features = [f for f in numeric_features if f not in binary_features]
+        # Variables numériques hors cible et binaires, d'après le registre
+        continuous_features = registry.columns(column_registry.CONTINUOUS, column_registry.DISCRETE,
+                                               column_registry.TEMPORAL)
         
         selected_numeric = st.selectbox(
             "Choisissez une variable numérique continue :",
-            continuous_features[:15],  # Limiter pour lisibilité
+            continuous_features,
             key="numeric_select"
         )
         
         if selected_numeric:
-            df_clean = sanitize_df_for_plotly(df)
-            fig = px.histogram(
-                df_clean, 
-                x=selected_numeric,
-                nbins=50,
-                title=f"Distribution de {selected_numeric}",
-                color_discrete_sequence=['#667eea'],
+            # Classes calculées côté serveur sur la colonne de la matrice mappée
+            fig = go.Figure(charts.histogram_bar(
+                load_histogram(version, selected_numeric, bins=50),
+                color='#667eea',
                 opacity=0.8
-            )
+            ))
             fig.update_layout(
+                title=f"Distribution de {selected_numeric}",
                 showlegend=False,
                 height=400,
                 xaxis_title=selected_numeric,
@@ -528,19 +671,20 @@ def main():
         st.subheader("🏷️ Variables Catégorielles")
         
         # Variables catégorielles
-        categorical_features = df.select_dtypes(include=['object']).columns.tolist()
+        categorical_features = registry.categorical_columns
         
         selected_categorical = st.selectbox(
             "Choisissez une variable catégorielle :",
-            categorical_features[:15],  # Limiter pour lisibilité
+            categorical_features,
             key="cat_select"
         )
         
         if selected_categorical:
-            df_clean = sanitize_df_for_plotly(df)
+            # Seule la colonne choisie est convertie (une fois par version)
+            column = load_plotly_columns(version).column(selected_categorical)
             
             # Top 20 catégories pour lisibilité
-            value_counts = df_clean[selected_categorical].value_counts().head(20)
+            value_counts = column.value_counts().head(20)
             
             fig = px.bar(
                 x=value_counts.index,
@@ -583,6 +727,7 @@ def main():
     
     with col2:
         if st.button("📊 Télécharger Données Filtrées", use_container_width=True):
+            filtered_df = data_store.query_store(predicate, selected_columns, version=version)
             csv_filtered = filtered_df.to_csv(index=False)
             st.download_button(
                 label="Cliquez pour télécharger",
@@ -598,8 +743,9 @@ def main():
             excel_buffer = BytesIO()
             with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
                 df.to_excel(writer, sheet_name='Données Brutes', index=False)
+                filtered_df = data_store.query_store(predicate, selected_columns, version=version)
                 filtered_df.to_excel(writer, sheet_name='Données Filtrees', index=False)
-                stats_df.to_excel(writer, sheet_name='Statistiques')
+                summary.numeric.to_excel(writer, sheet_name='Statistiques')
             
             excel_buffer.seek(0)
             st.download_button(
@@ -627,7 +773,7 @@ def main():
         """.format(len(df), len(df.columns)), unsafe_allow_html=True)
     
     with col2:
-        missing_total = df.isnull().sum().sum()
+        missing_total = missingness.total
         st.markdown("""
         <div style="text-align: center; padding: 1rem;">
             <h4>⚠️ Données Manquantes</h4>
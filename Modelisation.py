@@ -4,6 +4,8 @@ import pickle
 import numpy as np
 from pathlib import Path
 import os
+import data_store
+from reloader import BackgroundReloader, file_fingerprint
 
 # Configuration de la page
 st.set_page_config(
@@ -85,52 +87,71 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Fonction pour charger le modèle
+# Recherche du fichier de modèle
+def find_model_path():
+    # Essayer plusieurs chemins possibles
+    possible_paths = [
+        Path("xgboost_model.pkl"),
+    ]
+    
+    for path in possible_paths:
+        if path.exists():
+            return path
+    
+    # Essayer de trouver le fichier dans le répertoire courant
+    files = os.listdir()
+    pkl_files = [f for f in files if f.endswith('.pkl') or f.endswith('.joblib')]
+    if pkl_files:
+        return Path(pkl_files[0])
+    return None
+
+# Lecture du modèle depuis le disque
+def read_model(model_path):
+    # Essayer différentes méthodes de chargement
+    try:
+        # Méthode 1: pickle standard
+        with open(model_path, 'rb') as file:
+            return pickle.load(file)
+    except Exception:
+        # Méthode 2: joblib (si utilisé)
+        import joblib
+        return joblib.load(model_path)
+
+def model_fingerprint():
+    """Empreinte (chemin, taille, date) du fichier de modèle courant."""
+    model_path = find_model_path()
+    if model_path is None:
+        return None
+    return (str(model_path),) + file_fingerprint(model_path)
+
+# Rechargeur partagé : le modèle n'est relu que si le fichier change sur disque,
+# et le nouveau est préchargé en arrière-plan pendant que l'ancien reste servi
 @st.cache_resource
+def model_reloader():
+    return BackgroundReloader(model_fingerprint, lambda fingerprint: read_model(fingerprint[0]))
+
+# Fonction pour charger le modèle
 def load_model():
     try:
-        # Essayer plusieurs chemins possibles
-        possible_paths = [
-            Path("xgboost_model.pkl"),
-        ]
-        
-        model = None
-        model_path = None
+        if find_model_path() is None:
+            st.error("Aucun fichier de modèle trouvé")
+            return None
         
-        for path in possible_paths:
-            if path.exists():
-                model_path = path
-                break
-        
-        if model_path is None:
-            # Essayer de trouver le fichier dans le répertoire courant
-            files = os.listdir()
-            pkl_files = [f for f in files if f.endswith('.pkl') or f.endswith('.joblib')]
-            if pkl_files:
-                model_path = Path(pkl_files[0])
-            else:
-                st.error("Aucun fichier de modèle trouvé")
-                return None
-        
-        # Essayer différentes méthodes de chargement
         try:
-            # Méthode 1: pickle standard
-            with open(model_path, 'rb') as file:
-                model = pickle.load(file)
-        except Exception as e1:
-            try:
-                # Méthode 2: joblib (si utilisé)
-                import joblib
-                model = joblib.load(model_path)
-            except Exception as e2:
-                st.error(f"Échec du chargement du modèle: {str(e2)}")
-                return None
-        return model
+            return model_reloader().get()
+        except Exception as e2:
+            st.error(f"Échec du chargement du modèle: {str(e2)}")
+            return None
         
     except Exception as e:
         st.error(f"Erreur lors du chargement du modèle : {str(e)}")
         return None
 
+# Registre des colonnes : rôle de chaque variable pour typer l'entrée du modèle
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_registry(version):
+    return data_store.load_registry(version=version)
+
 
 # Fonction principale
 def main():
@@ -307,20 +328,21 @@ def main():
     # Prédiction
     if predict_button:
         try:
-            # Création du dataframe d'entrée
-            input_data = pd.DataFrame({
-                'LotArea': [LotArea],
-                'OverallQual': [OverallQual],
-                'YearRemodAdd': [YearRemodAdd],
-                'TotalBsmtSF': [TotalBsmtSF],
-                '1stFlrSF': [_1stFlrSF],
-                'GrLivArea': [GrLivArea],
-                'FullBath': [FullBath],
-                'TotRmsAbvGrd': [TotRmsAbvGrd],
-                'GarageYrBlt': [GarageYrBlt],
-                'GarageCars': [GarageCars],
-                'GarageArea': [GarageArea],
-                'YrSold': [YrSold]
+            # Création du dataframe d'entrée, typé d'après le registre des colonnes
+            registry = load_registry(data_store.dataset_version())
+            input_data = registry.model_input({
+                'LotArea': LotArea,
+                'OverallQual': OverallQual,
+                'YearRemodAdd': YearRemodAdd,
+                'TotalBsmtSF': TotalBsmtSF,
+                '1stFlrSF': _1stFlrSF,
+                'GrLivArea': GrLivArea,
+                'FullBath': FullBath,
+                'TotRmsAbvGrd': TotRmsAbvGrd,
+                'GarageYrBlt': GarageYrBlt,
+                'GarageCars': GarageCars,
+                'GarageArea': GarageArea,
+                'YrSold': YrSold
             })
             
             with st.spinner("Calcul de l'estimation en cours..."):
@@ -0,0 +1,159 @@
+"""
+Artefacts dérivés du dataset, mis à jour de façon incrémentale.
+
+Chaque artefact est un accumulateur fusionnable : l'ajout d'un lot de ventes
+ne coûte que le traitement de ce lot, quelle que soit la taille de
+l'historique.
+
+- statistiques descriptives et profil des valeurs manquantes (`RunningStats`) ;
+- sommes croisées pour la matrice de corrélation (variables numériques et
+  codes ordinaux) ;
+- agrégats de SalePrice par catégorie de chaque variable qualitative ;
+- sketches de quantiles par colonne numérique et, pour SalePrice, par
+  catégorie de chaque variable qualitative ;
+- métadonnées de colonnes (valeurs distinctes, variables binaires, plages).
+"""
+import numpy as np
+import pandas as pd
+
+import ordinal_codec
+import schema
+from column_metadata import ColumnMetadata
+from sketches import QuantileSketches
+from stats_engine import RunningStats
+
+TARGET = 'SalePrice'
+
+
+# ------------------------------
+# 🔄 Sommes pour la corrélation
+# ------------------------------
+class CorrelationSums:
+    """Sommes par paires de colonnes pour une corrélation de Pearson incrémentale.
+
+    Comme `DataFrame.corr()`, chaque paire n'utilise que les lignes où les deux
+    valeurs sont présentes. Les valeurs sont centrées sur un décalage fixé au
+    premier lot pour limiter les erreurs d'arrondi.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.shift = None
+        self.n = np.zeros((k, k))
+        self.sx = np.zeros((k, k))
+        self.sxx = np.zeros((k, k))
+        self.sxy = np.zeros((k, k))
+
+    def update(self, frame):
+        values = frame[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        if self.shift is None:
+            with np.errstate(invalid='ignore'):
+                self.shift = np.nan_to_num(np.nanmean(np.where(present, values, np.nan), axis=0))
+        centered = np.where(present, values - self.shift, 0.0)
+        mask = present.astype(np.float64)
+
+        self.n += mask.T @ mask
+        self.sx += centered.T @ mask
+        self.sxx += (centered ** 2).T @ mask
+        self.sxy += centered.T @ centered
+        return self
+
+    def correlation(self):
+        """Matrice de corrélation de Pearson (paires complètes)."""
+        sy, syy = self.sx.T, self.sxx.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self.n * self.sxy - self.sx * sy
+            var_x = self.n * self.sxx - self.sx ** 2
+            var_y = self.n * syy - sy ** 2
+            corr = cov / np.sqrt(var_x * var_y)
+        corr[self.n < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+
+# ------------------------------
+# 🏷️ Agrégats par catégorie
+# ------------------------------
+class CategoryAggregates:
+    """Effectif, somme et somme des carrés de la cible par catégorie."""
+
+    def __init__(self, columns, target=TARGET):
+        self.columns = list(columns)
+        self.target = target
+        self.sums = {}
+
+    def update(self, frame):
+        target = frame[self.target].astype(np.float64)
+        squared = target ** 2
+        for col in self.columns:
+            keys = frame[col].astype(object)
+            batch = pd.DataFrame({
+                'count': target.notna().groupby(keys).sum(),
+                'sum': target.groupby(keys).sum(),
+                'sumsq': squared.groupby(keys).sum(),
+            })
+            previous = self.sums.get(col)
+            self.sums[col] = batch if previous is None else previous.add(batch, fill_value=0)
+        return self
+
+    def summary(self, column):
+        """Moyenne, écart-type et effectif de la cible pour chaque catégorie."""
+        sums = self.sums[column]
+        count = sums['count']
+        mean = sums['sum'] / count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (sums['sumsq'] - count * mean ** 2) / (count - 1)
+        result = pd.DataFrame({
+            'mean': mean,
+            'std': np.sqrt(variance.clip(lower=0)),
+            'count': count.astype(np.int64),
+        })
+        result.index.name = column
+        return result[result['count'] > 0]
+
+
+# ------------------------------
+# 📦 Ensemble des artefacts
+# ------------------------------
+class DerivedArtifacts:
+    """Regroupe les artefacts dérivés et les met à jour lot par lot."""
+
+    def __init__(self, stats, correlation, categories, sketches, metadata):
+        self.stats = stats
+        self.correlation = correlation
+        self.categories = categories
+        self.sketches = sketches
+        self.metadata = metadata
+
+    @classmethod
+    def for_columns(cls, numeric_columns, columns):
+        """Artefacts vides pour un schéma donné (utilisable comme accumulateur d'ingestion)."""
+        numeric = list(numeric_columns)
+        ordinal = [col for col in ordinal_codec.ORDINAL_SCALES if col in columns]
+        categorical = [col for col in columns if col not in numeric]
+        return cls(RunningStats(numeric, columns), CorrelationSums(numeric + ordinal),
+                   CategoryAggregates(categorical), QuantileSketches(numeric, categorical),
+                   ColumnMetadata(columns))
+
+    def update(self, frame):
+        """Intègre un nouveau lot de lignes dans tous les artefacts."""
+        self.stats.update(frame)
+        typed = schema.apply_schema(frame)
+        ordinal_cols = [col for col in self.correlation.columns if col in ordinal_codec.ORDINAL_SCALES]
+        numeric_cols = [col for col in self.correlation.columns if col not in ordinal_cols]
+        self.correlation.update(pd.concat(
+            [typed[numeric_cols], ordinal_codec.numeric_features(typed, ordinal_cols)], axis=1
+        ))
+        if TARGET in typed.columns:
+            self.categories.update(typed)
+        self.sketches.update(typed)
+        self.metadata.update(typed)
+        return self
+
+    def save(self, path):
+        pd.to_pickle(self, path)
+
+    @staticmethod
+    def load(path):
+        return pd.read_pickle(path)
@@ -0,0 +1,65 @@
+"""
+Benchmark : ajout incrémental d'un lot de ventes vs reconstruction complète.
+
+Le temps d'ajout couvre tout le chemin jusqu'à l'affichage : `append_sales`
+(fragment, artefacts, matrice numérique, résumé et profil de manquants
+fusionnés), puis le chargement de la nouvelle version par les pages
+(matrice, registre, résumé, profil de manquants). La reconstruction complète
+refait les mêmes artefacts depuis tout l'historique.
+
+Usage : python benchmarks/bench_append.py [--scales 10 100] [--batch 100]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+from bench_data_store import replicate_sources
+
+
+def load_version(data_dir, version):
+    """Charge ce que les pages lisent pour afficher une version."""
+    data_store.open_feature_store(data_dir, version=version)
+    data_store.load_registry(data_dir, version=version)
+    data_store.load_summary(data_dir, version=version)
+    data_store.load_missingness(data_dir, version=version)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'échelle':>8} {'historique':>11} {'lot':>6} {'ajout (s)':>10} "
+          f"{'chargement (s)':>15} {'reconstruction (s)':>19}")
+    for factor in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            replicate_sources(tmp, factor)
+            data_store.build_columnar_cache(tmp)
+            history = data_store.load_stats(tmp).rows
+
+            batch = pd.read_csv(Path(tmp) / data_store.SOURCE_FILES[0], nrows=args.batch,
+                                **data_store.CSV_OPTIONS).drop(columns=['Id'])
+            start = time.perf_counter()
+            version = data_store.append_sales(batch, tmp)
+            append_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            load_version(tmp, version)
+            load_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            data_store.build_columnar_cache(tmp)
+            rebuild_time = time.perf_counter() - start
+            print(f"{factor:>7}x {history:>11,} {len(batch):>6} {append_time:>10.3f} "
+                  f"{load_time:>15.3f} {rebuild_time:>19.3f}")
+
+
+if __name__ == "__main__":
+    main()
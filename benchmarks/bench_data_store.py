@@ -0,0 +1,52 @@
+"""
+Benchmark : parsing CSV vs lecture du cache colonnaire.
+
+Les sources sont répliquées 1x, 100x et 1000x dans un répertoire temporaire
+puis chargées par les deux chemins de `data_store`.
+
+Usage : python benchmarks/bench_data_store.py [--scales 1 100 1000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+
+
+def replicate_sources(target_dir, factor):
+    """Écrit des copies des sources contenant `factor` fois les lignes d'origine."""
+    for name in data_store.SOURCE_FILES:
+        source = pd.read_csv(data_store.DATA_DIR / name, **data_store.CSV_OPTIONS)
+        scaled = pd.concat([source] * factor, ignore_index=True)
+        scaled.to_csv(Path(target_dir) / name, sep=';', index=False)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100, 1000])
+    args = parser.parse_args()
+
+    print(f"{'échelle':>8} {'lignes':>10} {'CSV (s)':>10} {'build (s)':>10} {'Parquet (s)':>12} {'gain':>7}")
+    for factor in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            replicate_sources(tmp, factor)
+            csv_time, df = timed(data_store.read_sources_csv, tmp)
+            build_time, _ = timed(data_store.build_columnar_cache, tmp)
+            parquet_time, _ = timed(data_store.load_dataset, tmp)
+            print(f"{factor:>7}x {len(df):>10,} {csv_time:>10.3f} {build_time:>10.3f} "
+                  f"{parquet_time:>12.3f} {csv_time / parquet_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark : filtres catégoriels par masques pandas vs index bitmap.
+
+Le dataset est répliqué jusqu'à `--rows` lignes ; la même combinaison
+(plage de prix ET quartiers OU ET zonage) est évaluée par les deux chemins.
+
+Usage : python benchmarks/bench_filters.py [--rows 100000 1000000 5000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+from indexes import BitmapIndex, SortedIndex, bits_to_rows, count_bits
+
+PRICE_RANGE = (100_000, 250_000)
+FILTERS = {'Neighborhood': ['NAmes', 'CollgCr', 'OldTown'], 'MSZoning': ['RL']}
+SHOW_ROWS = 20
+
+
+def with_masks(df):
+    mask = df['SalePrice'].between(*PRICE_RANGE)
+    for col, chosen in FILTERS.items():
+        mask &= df[col].isin(chosen)
+    filtered = df[mask]
+    return len(filtered), filtered.head(SHOW_ROWS)
+
+
+def with_bitmaps(df, price_index, bitmaps):
+    selection = price_index.bits(*PRICE_RANGE)
+    for col, chosen in FILTERS.items():
+        selection &= bitmaps[col].any_of(chosen)
+    return count_bits(selection), df.take(bits_to_rows(selection, len(df), limit=SHOW_ROWS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    base = data_store.shared_view().project(['SalePrice', *FILTERS])
+    print(f"{'lignes':>10} {'index (s)':>10} {'masques (ms)':>13} {'bitmaps (ms)':>13} {'gain':>7}")
+    for n_rows in args.rows:
+        df = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+
+        start = time.perf_counter()
+        price_index = SortedIndex(df['SalePrice'].to_numpy(dtype=np.float64))
+        bitmaps = {col: BitmapIndex(df[col]) for col in FILTERS}
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected_count, expected_head = with_masks(df)
+        mask_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count, head = with_bitmaps(df, price_index, bitmaps)
+        bitmap_time = time.perf_counter() - start
+
+        assert count == expected_count
+        pd.testing.assert_frame_equal(head, expected_head)
+        print(f"{n_rows:>10,} {build_time:>10.2f} {mask_time * 1e3:>13.1f} {bitmap_time * 1e3:>13.1f} "
+              f"{mask_time / bitmap_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark : histogramme sur valeurs brutes vs classes pré-calculées.
+
+La colonne SalePrice est répliquée jusqu'à `--rows` valeurs. Pour chaque
+taille on mesure la taille du JSON envoyé au navigateur et le temps de
+sérialisation d'une figure `go.Histogram` (valeurs brutes) et d'une figure
+de barres construite à partir de `charts.binned_histogram`.
+
+Usage : python benchmarks/bench_histograms.py [--rows 1428 100000 1000000] [--bins 50]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import charts
+import data_store
+
+
+def payload(build, values, bins):
+    start = time.perf_counter()
+    size = len(go.Figure(build(values, bins)).to_json())
+    return size, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1428, 100_000, 1_000_000])
+    parser.add_argument("--bins", type=int, default=50)
+    args = parser.parse_args()
+
+    base = data_store.open_feature_store().array('SalePrice')
+    raw = lambda values, bins: go.Histogram(x=values, nbinsx=bins)
+    binned = lambda values, bins: charts.histogram_bar(charts.binned_histogram(values, bins))
+
+    print(f"{'lignes':>11} {'brut (Ko)':>10} {'brut (s)':>9} {'classes (Ko)':>13} {'classes (s)':>12}")
+    for n_rows in args.rows:
+        values = np.resize(base, n_rows)
+        raw_size, raw_time = payload(raw, values, args.bins)
+        binned_size, binned_time = payload(binned, values, args.bins)
+        print(f"{n_rows:>11,} {raw_size / 1024:>10,.1f} {raw_time:>9.3f} "
+              f"{binned_size / 1024:>13,.1f} {binned_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark : courbe de densité de SalePrice, `gaussian_kde` vs KDE sur grille FFT.
+
+La colonne SalePrice est répliquée jusqu'à `--rows` lignes, avec un léger
+bruit. Pour chaque taille on mesure le temps d'évaluation de
+`scipy.stats.gaussian_kde` sur les 100 points de la courbe tracée (mesuré
+jusqu'à `--exact-limit` lignes), celui de `density.binned_kde`, et l'écart
+maximal entre les deux courbes rapporté au pic de densité.
+
+Usage : python benchmarks/bench_kde.py [--rows 1428 100000 1000000 5000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+import density
+
+COLUMN = 'SalePrice'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1428, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--exact-limit", type=int, default=100_000)
+    args = parser.parse_args()
+
+    base = data_store.open_feature_store().array(COLUMN).astype(np.float64)
+    base = base[np.isfinite(base)]
+    rng = np.random.default_rng(0)
+    print(f"{'lignes':>11} {'gaussian_kde (s)':>17} {'FFT (s)':>9} {'écart max':>10}")
+    for n_rows in args.rows:
+        values = np.resize(base, n_rows)
+        if n_rows > len(base):
+            values = values + rng.normal(scale=0.01 * base.std(), size=n_rows)
+        points = np.linspace(values.min(), values.max(), 100)
+
+        start = time.perf_counter()
+        kde = density.binned_kde(values)
+        curve = kde(points)
+        binned_time = time.perf_counter() - start
+
+        exact_time, error = np.nan, np.nan
+        if n_rows <= args.exact_limit:
+            start = time.perf_counter()
+            exact = stats.gaussian_kde(values)(points)
+            exact_time = time.perf_counter() - start
+            error = np.abs(curve - exact).max() / exact.max()
+        print(f"{n_rows:>11,} {exact_time:>17.3f} {binned_time:>9.3f} {error:>10.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark : mémoire allouée par session, copies par page vs instance partagée.
+
+Reproduit le parcours d'une session (chargement dans chaque page, sections
+relations et multivariée, graphique catégoriel) selon les deux stratégies :
+
+- copies : chaque page obtient sa propre copie du dataset (`st.cache_data`
+  désérialise une copie à chaque appel) et chaque section recopie le frame ;
+- partagé : une seule instance par processus (`data_store.shared_dataset`) et
+  des projections de colonnes.
+
+Usage : python benchmarks/bench_memory.py [--sessions 5]
+"""
+import argparse
+import pickle
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+
+PAGES = 2
+PLOT_COLUMNS = ['GrLivArea', 'SalePrice', 'Neighborhood']
+CATEGORY = 'Neighborhood'
+
+
+def session_with_copies(blob):
+    frames = [pickle.loads(blob) for _ in range(PAGES)]
+    df = frames[-1]
+    relations = df.copy()[PLOT_COLUMNS].dropna()
+    multivariate = df.copy().copy()[PLOT_COLUMNS].dropna()
+    sanitized = df.copy()
+    sanitized[CATEGORY] = sanitized[CATEGORY].astype(str)
+    return frames, relations, multivariate, sanitized
+
+
+def session_shared():
+    frames = [data_store.shared_dataset() for _ in range(PAGES)]
+    df = frames[-1]
+    relations = df[PLOT_COLUMNS].dropna()
+    multivariate = df[PLOT_COLUMNS].dropna()
+    sanitized = df[[CATEGORY]].copy()
+    sanitized[CATEGORY] = sanitized[CATEGORY].astype(str)
+    return frames, relations, multivariate, sanitized
+
+
+def measure(run, sessions):
+    """Octets alloués et retenus par `sessions` sessions simultanées."""
+    tracemalloc.start()
+    retained = [run() for _ in range(sessions)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5)
+    args = parser.parse_args()
+
+    shared = data_store.shared_dataset()
+    blob = pickle.dumps(shared)
+
+    print(f"{'stratégie':>10} {'retenu/session (Mo)':>20} {'pic total (Mo)':>15}")
+    for name, run in (("copies", lambda: session_with_copies(blob)), ("partagé", session_shared)):
+        current, peak = measure(run, args.sessions)
+        print(f"{name:>10} {current / args.sessions / 1e6:>20.2f} {peak / 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
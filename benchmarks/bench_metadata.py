@@ -0,0 +1,59 @@
+"""
+Benchmark : classification des colonnes par `nunique()` vs registre de métadonnées.
+
+Le dataset est répliqué jusqu'à `--rows` lignes avec un identifiant unique
+par ligne (colonne `RowId`) pour faire basculer le comptage sur le sketch
+HyperLogLog. Pour chaque taille on mesure le filtrage des colonnes
+numériques au seuil de 10 valeurs distinctes par `nunique()`, la
+construction du registre (payée une fois à l'ingestion) et sa lecture, ainsi
+que l'erreur relative de l'estimation sur `RowId`.
+
+Usage : python benchmarks/bench_metadata.py [--rows 1428 1000000 5000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+from column_metadata import ColumnMetadata
+
+THRESHOLD = 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1428, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    view = data_store.shared_view()
+    base = view.project(view.numeric_columns)
+    print(f"{'lignes':>11} {'nunique (s)':>12} {'registre (s)':>13} {'lecture (ms)':>13} {'erreur RowId':>13}")
+    for n_rows in args.rows:
+        df = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+        df['RowId'] = np.arange(n_rows, dtype=np.float64)
+        columns = df.columns.tolist()
+
+        start = time.perf_counter()
+        expected = [col for col in columns if df[col].nunique() > THRESHOLD]
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        metadata = ColumnMetadata(columns).update(df)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = metadata.above(columns, THRESHOLD)
+        lookup_ms = (time.perf_counter() - start) * 1e3
+
+        assert result == expected
+        error = metadata.distinct('RowId') / n_rows - 1
+        print(f"{n_rows:>11,} {scan_time:>12.3f} {build_time:>13.3f} {lookup_ms:>13.2f} {error:>12.2%}")
+
+
+if __name__ == "__main__":
+    main()
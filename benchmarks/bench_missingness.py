@@ -0,0 +1,57 @@
+"""
+Benchmark : profil des valeurs manquantes avec pandas vs ensembles de bits.
+
+Le dataset est répliqué jusqu'à `--rows` lignes. Le profil pandas calcule
+`isnull().sum()`, le nombre de manquants par ligne et la matrice de
+co-absence (produit matriciel du masque des colonnes incomplètes) ; le
+profil par ensembles de bits (`MissingnessProfile`) obtient les mêmes
+résultats par comptage de bits.
+
+Usage : python benchmarks/bench_missingness.py [--rows 1428 1000000 5000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+from missingness import MissingnessProfile
+
+
+def pandas_profile(df):
+    missing = df.isnull()
+    counts = missing.sum()
+    incomplete = missing.loc[:, counts > 0].to_numpy(dtype=np.int64)
+    return counts, incomplete.T @ incomplete, np.bincount(missing.sum(axis=1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1428, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    base = data_store.shared_dataset()
+    print(f"{'lignes':>11} {'pandas (s)':>11} {'bits (s)':>9} {'gain':>7}")
+    for n_rows in args.rows:
+        df = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+
+        start = time.perf_counter()
+        counts, co_missing, histogram = pandas_profile(df)
+        pandas_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        profile = MissingnessProfile.from_frame(df)
+        bits_time = time.perf_counter() - start
+
+        assert (profile.counts == counts).all()
+        assert (profile.co_missing.to_numpy() == co_missing).all()
+        assert (profile.rows_histogram.to_numpy() == histogram).all()
+        print(f"{n_rows:>11,} {pandas_time:>11.3f} {bits_time:>9.3f} {pandas_time / bits_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark : coût d'affichage d'une page du tableau selon la taille du dataset.
+
+Le dataset est répliqué jusqu'à `--rows` lignes ; pour chaque taille on mesure
+l'extraction d'une page (ordre du dataset ou tri sur une colonne) au début et
+au milieu du résultat filtré. Les index sont construits avant la mesure,
+comme dans l'application (une fois par version).
+
+Usage : python benchmarks/bench_pagination.py [--rows 1428 1000000 10000000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+import query
+from indexes import IndexSet, bits_to_rows, count_bits, ordered_window
+from lazy_frame import LazyFrame
+
+COLUMNS = ['SalePrice', 'Neighborhood', 'YearBuilt', 'LotFrontage']
+PAGE_SIZE = 20
+PREDICATE = query.Range('SalePrice', 100_000, 300_000) & query.In('MSZoning', ['RL', 'RM'])
+
+
+def page(df, indexes, selection, offset, sort_column=None):
+    if sort_column is None:
+        rows = bits_to_rows(selection, len(df), limit=PAGE_SIZE, offset=offset)
+    else:
+        rows = ordered_window(selection, indexes.order(sort_column), offset, PAGE_SIZE)
+    return df.take(rows)
+
+
+def timed_ms(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1428, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    base = data_store.shared_view().project(COLUMNS + ['MSZoning'])
+    print(f"{'lignes':>11} {'page 1 (ms)':>12} {'milieu (ms)':>12} {'tri p.1 (ms)':>13} {'tri milieu (ms)':>16}")
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            df = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+            df.to_parquet(Path(tmp) / "data.parquet", engine='pyarrow', index=False)
+            view = LazyFrame(tmp)
+            df = view.project(COLUMNS)
+            indexes = IndexSet(view, n_rows)
+            selection = PREDICATE.bits(indexes)
+            indexes.order('SalePrice')
+            middle = count_bits(selection) // 2
+
+            print(f"{n_rows:>11,} {timed_ms(page, df, indexes, selection, 0):>12.2f} "
+                  f"{timed_ms(page, df, indexes, selection, middle):>12.2f} "
+                  f"{timed_ms(page, df, indexes, selection, 0, 'SalePrice'):>13.2f} "
+                  f"{timed_ms(page, df, indexes, selection, middle, 'SalePrice'):>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
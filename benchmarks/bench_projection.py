@@ -0,0 +1,76 @@
+"""
+Benchmark : premier graphique d'une section, dataset complet vs projection.
+
+Le dataset est élargi à `--columns` colonnes (copies des colonnes
+numériques) et répliqué `--scale` fois, puis la section temporelle est
+simulée : lecture, puis agrégation de SalePrice par année de vente.
+
+Usage : python benchmarks/bench_projection.py [--columns 80 500] [--scale 100]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+from lazy_frame import LazyFrame
+
+SECTION_COLUMNS = ['YrSold', 'SalePrice']
+
+
+def widen(target_dir, n_columns, factor):
+    """Écrit un dataset Parquet de `n_columns` colonnes et `factor` fois plus de lignes."""
+    base = pd.read_parquet(data_store.part_paths(data_store.read_manifest()), engine='pyarrow')
+    numeric = base.select_dtypes(include='number').columns
+    extra = {}
+    i = 0
+    while base.shape[1] + len(extra) < n_columns:
+        col = numeric[i % len(numeric)]
+        extra[f"{col}_{i}"] = base[col]
+        i += 1
+    wide = pd.concat([base, pd.DataFrame(extra)], axis=1)
+    wide = pd.concat([wide] * factor, ignore_index=True)
+    target = Path(target_dir) / "parts"
+    target.mkdir()
+    wide.to_parquet(target / data_store.part_name('bench', 0), engine='pyarrow', index=False)
+    return target
+
+
+def first_chart_full(source):
+    df = data_store.schema.apply_schema(pd.read_parquet(source, engine='pyarrow'))
+    return df.groupby(SECTION_COLUMNS[0])['SalePrice'].agg(['count', 'mean'])
+
+
+def first_chart_projected(source):
+    df = LazyFrame(source).project(SECTION_COLUMNS)
+    return df.groupby(SECTION_COLUMNS[0])['SalePrice'].agg(['count', 'mean'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--columns", type=int, nargs="+", default=[80, 500])
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'colonnes':>9} {'lignes':>10} {'complet (s)':>12} {'projection (s)':>15} {'gain':>7}")
+    for n_columns in args.columns:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = widen(tmp, n_columns, args.scale)
+            start = time.perf_counter()
+            full = first_chart_full(source)
+            full_time = time.perf_counter() - start
+            start = time.perf_counter()
+            projected = first_chart_projected(source)
+            projected_time = time.perf_counter() - start
+            pd.testing.assert_frame_equal(full, projected)
+            rows = int(full['count'].sum())
+            print(f"{n_columns:>9} {rows:>10,} {full_time:>12.3f} {projected_time:>15.3f} "
+                  f"{full_time / projected_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
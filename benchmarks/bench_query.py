@@ -0,0 +1,71 @@
+"""
+Benchmark : requêtes avec filtre poussé vers Parquet vs lecture complète + masque.
+
+Les sources sont répliquées puis ingérées par blocs (un groupe de lignes par
+bloc). Deux requêtes sont comparées : une sélective (quelques lignes) et une
+non sélective (presque tout le dataset).
+
+Usage : python benchmarks/bench_query.py [--scales 10 100] [--chunksize 20000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+import ingestion
+import query
+from bench_data_store import replicate_sources
+
+COLUMNS = ['SalePrice', 'Neighborhood', 'YrSold', 'YearBuilt']
+QUERIES = {
+    'sélective': query.In('Neighborhood', ['Blueste', 'NPkVill']) & query.year_window('YrSold', 2010, 2010),
+    'non sélective': query.Range('SalePrice', 50_000) & query.NotNull('YearBuilt'),
+}
+# Mêmes filtres exprimés en masques pandas
+MASKS = {
+    'sélective': lambda df: df['Neighborhood'].isin(['Blueste', 'NPkVill']) & (df['YrSold'] == 2010),
+    'non sélective': lambda df: (df['SalePrice'] >= 50_000) & df['YearBuilt'].notna(),
+}
+
+
+def full_scan(source, mask):
+    df = data_store.schema.apply_schema(pd.read_parquet(source, engine='pyarrow'))
+    return df[mask(df)][COLUMNS].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--chunksize", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'échelle':>8} {'requête':>14} {'lignes':>10} {'complet (s)':>12} {'poussé (s)':>11} {'gain':>7}")
+    for factor in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            replicate_sources(tmp, factor)
+            parts = Path(tmp) / "parts"
+            parts.mkdir()
+            ingestion.ingest_csv([Path(tmp) / name for name in data_store.SOURCE_FILES],
+                                 parts / data_store.part_name('bench', 0), chunksize=args.chunksize)
+
+            for name, predicate in QUERIES.items():
+                start = time.perf_counter()
+                expected = full_scan(parts, MASKS[name])
+                full_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                result = query.execute(parts, predicate, COLUMNS)
+                pushed_time = time.perf_counter() - start
+
+                pd.testing.assert_frame_equal(result, expected, check_categorical=False)
+                print(f"{factor:>7}x {name:>14} {len(result):>10,} {full_time:>12.3f} {pushed_time:>11.3f} "
+                      f"{full_time / pushed_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark : carte de densité rasterisée vs nuage de points échantillonné.
+
+Les colonnes GrLivArea, SalePrice et Neighborhood sont répliquées jusqu'à
+`--rows` lignes. Pour chaque taille on mesure le calcul de la grille
+(effectif, moyenne de SalePrice, quartier majoritaire) et la taille du JSON
+de la figure, comparée à celle du nuage de points échantillonné.
+
+Usage : python benchmarks/bench_raster.py [--rows 1000000 10000000 30000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import charts
+import data_store
+
+X, Y, COLOR = 'GrLivArea', 'SalePrice', 'Neighborhood'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 30_000_000])
+    args = parser.parse_args()
+
+    base = data_store.shared_view().project([X, Y, COLOR])
+    labels = [str(category) for category in base[COLOR].cat.categories]
+    print(f"{'lignes':>11} {'effectif (s)':>13} {'moyenne (s)':>12} {'majorité (s)':>13} "
+          f"{'grille (Ko)':>12} {'nuage (Ko)':>11}")
+    for n_rows in args.rows:
+        x = np.resize(base[X].to_numpy(dtype=np.float64), n_rows)
+        y = np.resize(base[Y].to_numpy(dtype=np.float64), n_rows)
+        codes = np.resize(base[COLOR].cat.codes.to_numpy(), n_rows)
+
+        timings = []
+        for how, values in (('count', None), ('mean', y), ('majority', codes)):
+            start = time.perf_counter()
+            raster = charts.rasterize(x, y, values, how, labels=labels)
+            timings.append(time.perf_counter() - start)
+        raster_size = len(go.Figure(charts.raster_heatmap(raster, COLOR)).to_json())
+
+        plan = charts.plan_scatter(pd.DataFrame({X: x, Y: y}), X, Y)
+        scatter_size = len(px.scatter(plan.data, x=X, y=Y, render_mode=plan.render_mode).to_json())
+        print(f"{n_rows:>11,} {timings[0]:>13.3f} {timings[1]:>12.3f} {timings[2]:>13.3f} "
+              f"{raster_size / 1024:>12,.0f} {scatter_size / 1024:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
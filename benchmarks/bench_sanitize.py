@@ -0,0 +1,71 @@
+"""
+Benchmark : mémoire allouée par rendu pour préparer une colonne à Plotly.
+
+Compare l'ancienne conversion (copie du DataFrame puis conversion des
+colonnes `object`) à `charts.PlotlyColumns`, qui ne convertit que la colonne
+demandée et la mémorise pour la version du dataset. Le dataset est répliqué
+jusqu'à `--rows` lignes ; le pic d'allocation de la préparation des colonnes
+d'un graphique est mesuré avec `tracemalloc` sur `--reruns` rendus
+successifs, pour le dataset entier et pour une seule colonne.
+
+Usage : python benchmarks/bench_sanitize.py [--rows 1428 1000000] [--reruns 5]
+"""
+import argparse
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import charts
+import data_store
+from lazy_frame import LazyFrame
+
+COLUMN = 'Neighborhood'
+
+
+def copy_and_cast(df):
+    """Conversion d'origine : copie complète puis `astype(str)` des colonnes object."""
+    df = df.copy()
+    for col in df.columns:
+        if "object" in str(df[col].dtype):
+            df[col] = df[col].astype(str)
+    return df
+
+
+def allocated_mib(render, reruns):
+    tracemalloc.start()
+    for _ in range(reruns):
+        render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1428, 1_000_000])
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    base = data_store.shared_dataset()
+    print(f"{'lignes':>11} {'copie dataset (Mio)':>20} {'copie colonne (Mio)':>20} {'mémorisée (Mio)':>16}")
+    for n_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            df = pd.concat([base] * (n_rows // len(base) + 1), ignore_index=True).iloc[:n_rows]
+            df.to_parquet(Path(tmp) / "data.parquet", engine='pyarrow', index=False)
+            view = LazyFrame(tmp)
+            df = view.frame()
+            columns = charts.PlotlyColumns(view)
+            columns.column(COLUMN)
+
+            full = allocated_mib(lambda: copy_and_cast(df)[COLUMN], args.reruns)
+            single = allocated_mib(lambda: copy_and_cast(df[[COLUMN]])[COLUMN], args.reruns)
+            memoized = allocated_mib(lambda: columns.column(COLUMN), args.reruns)
+            print(f"{n_rows:>11,} {full:>20.2f} {single:>20.2f} {memoized:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark : nuage de points brut vs plan de tracé (WebGL + échantillonnage par grille).
+
+Les colonnes GrLivArea et SalePrice sont répliquées jusqu'à `--rows` lignes,
+avec un léger bruit pour que les copies ne se superposent pas. Pour chaque
+taille on mesure le temps de préparation, le nombre de points tracés et la
+taille du JSON envoyé au navigateur (figure brute mesurée jusqu'à un million
+de lignes), ainsi que l'écart de corrélation entre l'échantillon et
+l'ensemble des points.
+
+Usage : python benchmarks/bench_scatter.py [--rows 1428 100000 1000000 5000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import charts
+import data_store
+
+X, Y = 'GrLivArea', 'SalePrice'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1428, 100_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    base = data_store.shared_view().project([X, Y]).astype(np.float64)
+    rng = np.random.default_rng(0)
+    print(f"{'lignes':>11} {'brut (Mo)':>10} {'préparation (s)':>16} {'points':>8} {'plan (Mo)':>10} {'Δ corr.':>8}")
+    for n_rows in args.rows:
+        df = pd.DataFrame({col: np.resize(base[col].to_numpy(), n_rows) for col in (X, Y)})
+        df += rng.normal(scale=0.01, size=df.shape) * df.std().to_numpy()
+        raw_size = len(px.scatter(df, x=X, y=Y, render_mode='webgl').to_json()) if n_rows <= 1_000_000 else np.nan
+
+        start = time.perf_counter()
+        plan = charts.plan_scatter(df, X, Y)
+        prepare_time = time.perf_counter() - start
+        plan_size = len(px.scatter(plan.data, x=X, y=Y, render_mode=plan.render_mode).to_json())
+
+        delta = plan.data[X].corr(plan.data[Y]) - df[X].corr(df[Y])
+        print(f"{n_rows:>11,} {raw_size / 1e6:>10.1f} {prepare_time:>16.3f} {plan.drawn:>8,} "
+              f"{plan_size / 1e6:>10.1f} {delta:>+8.3f}")
+
+
+if __name__ == "__main__":
+    main()
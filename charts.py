@@ -0,0 +1,404 @@
+"""
+Graphiques pré-agrégés côté serveur.
+
+Plutôt que d'envoyer toutes les valeurs brutes au navigateur pour que
+Plotly les regroupe, les histogrammes sont calculés avec NumPy : seules les
+bornes des classes et les effectifs (quelques dizaines de nombres) sont
+transmis, sous forme de barres. La taille du graphique et son temps
+d'affichage ne dépendent plus du nombre de lignes.
+
+Les pages mettent les histogrammes en cache par version du dataset et par
+(colonne, transformation, nombre de classes). De même, les violons sont
+tracés à partir de densités calculées côté serveur (module `density`) :
+seul leur contour est transmis.
+
+Les colonnes passées aux figures Plotly sont converties une par une, et
+seulement si nécessaire : une colonne numérique est transmise telle quelle
+(vue, sans copie), une colonne catégorielle ne voit que ses libellés
+convertis en texte (les codes sont partagés) et seule une colonne `object`
+ou `string` est intégralement convertie en texte. `PlotlyColumns` mémorise
+ces conversions pour une version du dataset.
+
+Les nuages de points passent en WebGL (`Scattergl`) au-delà de
+`WEBGL_THRESHOLD` points, et sont sous-échantillonnés au-delà de
+`SAMPLE_THRESHOLD` : l'échantillonnage est stratifié sur une grille, chaque
+cellule gardant une part de ses points proportionnelle à sa densité, et les
+points des cellules presque vides (valeurs isolées, outliers) sont tous
+conservés. Au-delà de `RASTER_THRESHOLD` points, les pages proposent par
+défaut une carte de densité : les points sont agrégés sur une grille
+(effectif, moyenne d'une variable ou catégorie majoritaire par cellule) et
+seule la grille est envoyée, sous forme d'une unique trace `Heatmap`.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+# Transformations proposées pour l'étude de la distribution d'une variable
+TRANSFORMS = {
+    'Original': None,
+    'Log(x+1)': np.log1p,
+    'Racine Carrée': np.sqrt,
+}
+
+
+# ------------------------------
+# 📊 Histogrammes
+# ------------------------------
+class BinnedHistogram:
+    """Bornes et effectifs des classes d'un histogramme."""
+
+    def __init__(self, edges, counts):
+        self.edges = edges
+        self.counts = counts
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    @property
+    def centers(self):
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    @property
+    def widths(self):
+        return np.diff(self.edges)
+
+    def density(self):
+        """Densité de probabilité de chaque classe (comme `histnorm='probability density'`)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.counts / (max(self.total, 1) * self.widths)
+
+
+def binned_histogram(values, bins=50, transform='Original'):
+    """Histogramme des valeurs (transformées), calculé sans envoyer les valeurs brutes.
+
+    Les valeurs manquantes ou non finies après transformation sont ignorées ;
+    les classes sont de même largeur entre le minimum et le maximum.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    function = TRANSFORMS[transform]
+    if function is not None:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = function(values)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return BinnedHistogram(np.array([0.0, 1.0]), np.zeros(1, dtype=np.int64))
+    counts, edges = np.histogram(values, bins=bins)
+    return BinnedHistogram(edges, counts)
+
+
+def histogram_bar(histogram, name=None, color=None, opacity=None, density=False):
+    """Trace de barres jointives équivalente à un `go.Histogram` sur les valeurs brutes."""
+    return go.Bar(
+        x=histogram.centers,
+        y=histogram.density() if density else histogram.counts,
+        width=histogram.widths,
+        name=name,
+        marker=dict(color=color, line=dict(width=0)),
+        opacity=opacity,
+        customdata=np.column_stack([histogram.edges[:-1], histogram.edges[1:]]),
+        hovertemplate="[%{customdata[0]:.4g} ; %{customdata[1]:.4g}] : %{y}<extra></extra>",
+    )
+
+
+def kde_violin(x, density, position, name=None, color=None, width=0.8, trim=1e-3):
+    """Violon tracé à partir d'une densité précalculée (voir `density.grouped_kde`).
+
+    Le contour est une trace remplie symétrique autour de `position` sur un
+    axe numérique ; les extrémités où la densité est inférieure à `trim` fois
+    son maximum sont coupées.
+    """
+    peak = density.max()
+    if not peak > 0:
+        return go.Scatter(x=[], y=[], name=name)
+    kept = np.flatnonzero(density >= trim * peak)
+    x, half = x[kept[0]:kept[-1] + 1], density[kept[0]:kept[-1] + 1] / peak * width / 2
+    return go.Scatter(
+        x=np.concatenate([position - half, (position + half)[::-1]]),
+        y=np.concatenate([x, x[::-1]]),
+        fill='toself', mode='lines', name=name,
+        line=dict(color=color, width=1), hoverinfo='name',
+    )
+
+
+# ------------------------------
+# 📦 Boîtes à moustaches
+# ------------------------------
+# Outliers tracés au plus par boîte (les plus éloignés de la boîte)
+MAX_OUTLIERS = 200
+
+
+def box_extremes(values, box, whisker=1.5, max_outliers=MAX_OUTLIERS):
+    """Extrémités observées des moustaches et outliers d'une boîte issue d'un sketch.
+
+    Comme `px.box`, chaque moustache s'arrête à la valeur observée la plus
+    extrême dans la limite de `whisker`×IQR ; les valeurs au-delà sont des
+    outliers, dont seuls les `max_outliers` plus éloignés de la boîte sont
+    conservés. Retourne (moustache basse, moustache haute, outliers, nombre
+    total d'outliers).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    iqr = box['q3'] - box['q1']
+    low, high = box['q1'] - whisker * iqr, box['q3'] + whisker * iqr
+    inside = values[(values >= low) & (values <= high)]
+    outliers = values[(values < low) | (values > high)]
+    n_outliers = len(outliers)
+    if n_outliers > max_outliers:
+        distance = np.maximum(low - outliers, outliers - high)
+        outliers = outliers[np.argpartition(distance, -max_outliers)[-max_outliers:]]
+    lower = inside.min() if len(inside) else box['q1']
+    upper = inside.max() if len(inside) else box['q3']
+    return lower, upper, np.sort(outliers), n_outliers
+
+
+# ------------------------------
+# ✨ Nuages de points
+# ------------------------------
+# Au-delà de ce nombre de points, rendu WebGL plutôt que SVG
+WEBGL_THRESHOLD = 5_000
+# Au-delà de ce nombre de points, sous-échantillonnage (taille visée)
+SAMPLE_THRESHOLD = 50_000
+# Cellules par axe de la grille d'échantillonnage
+GRID_SIZE = 200
+# Une cellule d'au plus ce nombre de points est conservée entière
+ISOLATED_CELL = 2
+
+
+def _grid_cells_within(values, bounds, grid):
+    """Indice de cellule de chaque valeur pour `grid` cellules égales entre `bounds`."""
+    low, high = bounds
+    span = high - low if high > low else 1.0
+    return np.clip(((values - low) / span * grid).astype(np.int64), 0, grid - 1)
+
+
+def _grid_cells(values, grid):
+    return _grid_cells_within(values, (np.nanmin(values), np.nanmax(values)), grid)
+
+
+def grid_sample(x, y, max_points=SAMPLE_THRESHOLD, grid=GRID_SIZE, isolated=ISOLATED_CELL, seed=0):
+    """Positions d'un sous-échantillon de points qui préserve la densité du nuage.
+
+    Le plan est découpé en `grid` × `grid` cellules. Les points des cellules
+    d'au plus `isolated` points sont tous gardés ; dans les autres cellules,
+    chaque point est tiré avec la même probabilité (au moins un point attendu
+    par cellule), de sorte que le nombre total visé soit d'environ
+    `max_points`. Le tirage est en O(n), sans tri.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) <= max_points:
+        return np.arange(len(x))
+    cell = _grid_cells(x, grid) * grid + _grid_cells(y, grid)
+    counts = np.bincount(cell, minlength=grid * grid)
+    kept = counts[cell] <= isolated
+    dense = len(x) - int(kept.sum())
+    rate = min(1.0, max(max_points - (len(x) - dense), 0) / dense) if dense else 0.0
+    with np.errstate(divide='ignore'):
+        cell_rate = np.maximum(rate, 1.0 / counts)
+    rng = np.random.default_rng(seed)
+    kept |= rng.random(len(x)) < cell_rate[cell]
+    return np.flatnonzero(kept)
+
+
+class ScatterPlan:
+    """Points à tracer et mode de rendu d'un nuage de points."""
+
+    def __init__(self, data, represented):
+        self.data = data
+        self.represented = represented
+
+    @property
+    def drawn(self):
+        return len(self.data)
+
+    @property
+    def sampled(self):
+        return self.drawn < self.represented
+
+    @property
+    def render_mode(self):
+        """Mode de rendu pour `px.scatter` ('webgl' produit des traces `Scattergl`)."""
+        return 'webgl' if self.represented > WEBGL_THRESHOLD else 'svg'
+
+    def caption(self):
+        mode = "WebGL" if self.render_mode == 'webgl' else "SVG"
+        if self.sampled:
+            return (f"🔎 {self.drawn:,} points tracés représentant {self.represented:,} observations "
+                    f"(échantillonnage par grille, points isolés conservés) · rendu {mode}")
+        return f"🔎 {self.drawn:,} points tracés · rendu {mode}"
+
+
+def plan_scatter(frame, x, y, max_points=SAMPLE_THRESHOLD):
+    """Prépare le tracé de `frame` : sous-échantillonnage par grille si nécessaire."""
+    if len(frame) <= max_points:
+        return ScatterPlan(frame, len(frame))
+    positions = grid_sample(frame[x].to_numpy(dtype=np.float64), frame[y].to_numpy(dtype=np.float64),
+                            max_points)
+    return ScatterPlan(frame.take(positions), len(frame))
+
+
+def ols_line(x, y, name='Tendance (MCO)', color='#2d3748'):
+    """Droite des moindres carrés ajustée sur toutes les valeurs (pas seulement celles tracées)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    slope, intercept = np.polyfit(x, y, 1)
+    ends = np.array([x.min(), x.max()])
+    return go.Scatter(x=ends, y=slope * ends + intercept, mode='lines', name=name,
+                      line=dict(color=color, width=2))
+
+
+def ols_lines(frame, x, y, group, colors):
+    """Une droite des moindres carrés par modalité de `group`, comme `trendline='ols'` de Plotly.
+
+    Chaque droite est ajustée sur toutes les valeurs du groupe et prend la
+    couleur de ses points (`colors` : libellé du groupe → couleur) ; les
+    groupes de moins de deux abscisses distinctes n'ont pas de droite.
+    """
+    lines = []
+    for label, values in frame.groupby(group, observed=True, sort=False):
+        if values[x].nunique() < 2:
+            continue
+        lines.append(ols_line(values[x], values[y], name=f"Tendance {label}",
+                              color=colors.get(str(label), '#2d3748')))
+    return lines
+
+
+# ------------------------------
+# 🗺️ Cartes de densité (rasterisation)
+# ------------------------------
+# Au-delà de ce nombre de points, la carte de densité est proposée par défaut
+RASTER_THRESHOLD = 1_000_000
+# Cellules par axe de la grille de rasterisation
+RASTER_SIZE = 300
+AGGREGATIONS = ('count', 'mean', 'majority')
+# Couleurs des catégories majoritaires (26 teintes distinctes)
+CATEGORY_PALETTE = qualitative.Alphabet
+
+
+class Raster:
+    """Grille agrégée d'un nuage de points (une valeur par cellule, NaN si vide)."""
+
+    def __init__(self, x_edges, y_edges, values, counts, how, labels=None):
+        self.x_edges = x_edges
+        self.y_edges = y_edges
+        self.values = values
+        self.counts = counts
+        self.how = how
+        self.labels = labels
+
+    @property
+    def represented(self):
+        return int(self.counts.sum())
+
+    @property
+    def cells(self):
+        return int(np.count_nonzero(self.counts))
+
+
+def rasterize(x, y, values=None, how='count', bins=RASTER_SIZE, x_range=None, y_range=None, labels=None):
+    """Agrège les points (x, y) sur une grille `bins` × `bins` limitée à la fenêtre donnée.
+
+    `how` vaut 'count' (effectif par cellule), 'mean' (moyenne de `values`)
+    ou 'majority' (code de catégorie le plus fréquent ; `values` contient
+    alors des codes entiers positifs et `labels` leurs libellés). Les points
+    hors de la fenêtre ou non finis sont ignorés.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Agrégation inconnue : {how} ({', '.join(AGGREGATIONS)})")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_range = x_range or (np.nanmin(x), np.nanmax(x))
+    y_range = y_range or (np.nanmin(y), np.nanmax(y))
+    x_edges = np.linspace(*x_range, bins + 1)
+    y_edges = np.linspace(*y_range, bins + 1)
+
+    inside = ((x >= x_range[0]) & (x <= x_range[1]) & (y >= y_range[0]) & (y <= y_range[1]))
+    x_bin = _grid_cells_within(x[inside], x_range, bins)
+    y_bin = _grid_cells_within(y[inside], y_range, bins)
+    # Ligne = classe de y, colonne = classe de x (convention de `go.Heatmap`)
+    cell = y_bin * bins + x_bin
+    counts = np.bincount(cell, minlength=bins * bins).reshape(bins, bins)
+
+    if how == 'count':
+        result = np.where(counts > 0, counts, np.nan)
+    elif how == 'mean':
+        weights = np.asarray(values, dtype=np.float64)[inside]
+        sums = np.bincount(cell, weights=weights, minlength=bins * bins).reshape(bins, bins)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.where(counts > 0, sums / counts, np.nan)
+    else:
+        codes = np.asarray(values, dtype=np.int64)[inside]
+        k = int(codes.max()) + 1 if len(codes) else 1
+        by_category = np.bincount(cell * k + codes, minlength=bins * bins * k).reshape(bins, bins, k)
+        result = np.where(counts > 0, by_category.argmax(axis=2), np.nan)
+    return Raster(x_edges, y_edges, result, counts, how, labels)
+
+
+def raster_heatmap(raster, name=None, colorscale='Viridis'):
+    """Trace `Heatmap` unique représentant la grille (cellules vides transparentes)."""
+    x = (raster.x_edges[:-1] + raster.x_edges[1:]) / 2
+    y = (raster.y_edges[:-1] + raster.y_edges[1:]) / 2
+    if raster.how != 'majority':
+        return go.Heatmap(x=x, y=y, z=raster.values, colorscale=colorscale, name=name,
+                          colorbar=dict(title=name), hoverongaps=False)
+
+    # Catégorie majoritaire : échelle de couleurs discrète, une couleur par libellé
+    labels = list(raster.labels)
+    palette = CATEGORY_PALETTE
+    k = max(len(labels), 1)
+    scale = []
+    for i in range(k):
+        color = palette[i % len(palette)]
+        scale += [[i / k, color], [(i + 1) / k, color]]
+    text = np.where(np.isnan(raster.values), '',
+                    np.asarray(labels + [''], dtype=object)[np.nan_to_num(raster.values, nan=k).astype(int)])
+    return go.Heatmap(x=x, y=y, z=raster.values, zmin=-0.5, zmax=k - 0.5, colorscale=scale, name=name,
+                      text=text, hovertemplate="%{text}<extra></extra>", hoverongaps=False,
+                      colorbar=dict(title=name, tickvals=list(range(k)), ticktext=labels))
+
+
+# ------------------------------
+# 🔧 Colonnes compatibles Plotly
+# ------------------------------
+def plotly_safe(series):
+    """Colonne dans un type que Plotly sérialise, sans copie quand rien n'est à convertir."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if categories.dtype == object and all(isinstance(value, str) for value in categories):
+            return series
+        return series.cat.rename_categories(categories.astype(str))
+    if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+        return series.astype(str)
+    return series
+
+
+def sanitize_for_plotly(df, columns=None):
+    """DataFrame limité à `columns`, chaque colonne rendue compatible Plotly."""
+    columns = df.columns if columns is None else columns
+    return pd.DataFrame({col: plotly_safe(df[col]) for col in columns}, copy=False)
+
+
+class PlotlyColumns:
+    """Colonnes d'une vue du dataset converties pour Plotly, une seule fois par colonne.
+
+    `view` doit fournir `project(columns)` (voir `lazy_frame.LazyFrame`).
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def column(self, column):
+        with self._lock:
+            if column not in self._columns:
+                self._columns[column] = plotly_safe(self.view.project([column])[column])
+            return self._columns[column]
+
+    def frame(self, columns):
+        """DataFrame des colonnes demandées, sans copie des colonnes déjà converties."""
+        return pd.DataFrame({col: self.column(col) for col in columns}, copy=False)
@@ -0,0 +1,180 @@
+"""
+Métadonnées de colonnes : cardinalité, variables binaires et plages de valeurs.
+
+Les pages classent les variables (continues, binaires...) d'après leur
+nombre de valeurs distinctes. Ce registre le calcule une fois, au fil de
+l'ingestion, et se met à jour lot par lot avec les autres artefacts.
+
+Tant qu'une colonne a peu de valeurs distinctes (`EXACT_LIMIT`), l'ensemble
+exact de ses valeurs est conservé : le comptage et la détection des
+variables binaires sont exacts. Au-delà, seul un sketch HyperLogLog est
+gardé : sa taille est fixe (2**p registres d'un octet) et son erreur
+relative type vaut 1,04 / sqrt(2**p), soit environ 0,8 % pour `p = 14`.
+Comme `EXACT_LIMIT` est très supérieur aux seuils utilisés par les pages,
+l'approximation ne change jamais la classification d'une colonne.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_PRECISION = 14
+# Au-delà de ce nombre de valeurs distinctes, seul le sketch HyperLogLog est conservé
+EXACT_LIMIT = 1024
+
+
+# ------------------------------
+# 🔢 HyperLogLog
+# ------------------------------
+def _bit_length(values):
+    """Nombre de bits significatifs de chaque entier non signé 64 bits."""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        large = values >= np.uint64(1 << shift)
+        length[large] += shift
+        values[large] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+def hash_values(values):
+    """Empreintes 64 bits des valeurs (les zéros signés sont confondus)."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        values = values + 0.0
+    return pd.util.hash_array(values)
+
+
+class HyperLogLog:
+    """Sketch HyperLogLog du nombre de valeurs distinctes, fusionnable."""
+
+    def __init__(self, p=DEFAULT_PRECISION):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values):
+        """Ajoute un lot de valeurs (sans valeurs manquantes)."""
+        if len(values) == 0:
+            return self
+        hashes = hash_values(values)
+        suffix_bits = 64 - self.p
+        buckets = (hashes >> np.uint64(suffix_bits)).astype(np.intp)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # Rang du premier bit à 1 dans les bits restants
+        ranks = (suffix_bits + 1 - _bit_length(suffix)).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+        return self
+
+    def merge(self, other):
+        """Fusionne un autre sketch (construit avec la même précision)."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """Estimation du nombre de valeurs distinctes."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Petites cardinalités : comptage linéaire des registres vides
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self):
+        return 1.04 / np.sqrt(len(self.registers))
+
+
+# ------------------------------
+# 🧮 Comptage des valeurs distinctes
+# ------------------------------
+class DistinctCounter:
+    """Valeurs distinctes d'une colonne : exactes tant qu'elles sont peu nombreuses."""
+
+    def __init__(self, p=DEFAULT_PRECISION):
+        self.values = np.empty(0)
+        self.sketch = HyperLogLog(p)
+
+    @property
+    def exact(self):
+        return self.values is not None
+
+    def update(self, values):
+        uniques = pd.unique(values)
+        self.sketch.update(uniques)
+        if self.exact:
+            self.values = np.union1d(self.values, uniques) if len(self.values) else np.sort(uniques)
+            if len(self.values) > EXACT_LIMIT:
+                self.values = None
+        return self
+
+    def count(self):
+        return len(self.values) if self.exact else self.sketch.count()
+
+
+# ------------------------------
+# 🗂️ Registre des colonnes
+# ------------------------------
+class ColumnMetadata:
+    """Cardinalité, indicateur binaire et plage de valeurs de chaque colonne."""
+
+    def __init__(self, columns, p=DEFAULT_PRECISION):
+        self.columns = list(columns)
+        self.counters = {col: DistinctCounter(p) for col in self.columns}
+        self.numeric = {}
+        self.min = {}
+        self.max = {}
+
+    def update(self, frame):
+        """Intègre un lot de lignes typé (voir `schema.apply_schema`)."""
+        for col in self.columns:
+            series = frame[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Seules les catégories présentes dans le lot sont comptées
+                codes = series.cat.codes.to_numpy()
+                values = series.cat.categories.to_numpy()[np.unique(codes[codes >= 0])]
+                self.numeric.setdefault(col, False)
+            elif pd.api.types.is_numeric_dtype(series):
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                values = values[~np.isnan(values)]
+                self.numeric.setdefault(col, True)
+                if len(values):
+                    self.min[col] = min(self.min.get(col, np.inf), values.min())
+                    self.max[col] = max(self.max.get(col, -np.inf), values.max())
+            else:
+                values = series.dropna().to_numpy(dtype=object)
+                self.numeric.setdefault(col, False)
+            self.counters[col].update(values)
+        return self
+
+    # ------------------------------
+    # 📊 Requêtes
+    # ------------------------------
+    def distinct(self, column):
+        """Nombre (exact ou estimé) de valeurs distinctes non manquantes."""
+        return self.counters[column].count()
+
+    def is_exact(self, column):
+        return self.counters[column].exact
+
+    def is_binary(self, column):
+        """Variable numérique ne prenant que les valeurs 0 et 1 (toutes deux présentes)."""
+        counter = self.counters[column]
+        return (self.numeric.get(column, False) and counter.exact
+                and len(counter.values) == 2 and set(counter.values) == {0, 1})
+
+    def value_range(self, column):
+        return self.min.get(column, np.nan), self.max.get(column, np.nan)
+
+    def above(self, columns, threshold):
+        """Colonnes de `columns` ayant strictement plus de `threshold` valeurs distinctes."""
+        return [col for col in columns if self.distinct(col) > threshold]
+
+    def table(self):
+        """Tableau récapitulatif, une ligne par colonne."""
+        return pd.DataFrame({
+            'Valeurs distinctes': [self.distinct(col) for col in self.columns],
+            'Exact': [self.is_exact(col) for col in self.columns],
+            'Binaire': [self.is_binary(col) for col in self.columns],
+            'Min': [self.value_range(col)[0] for col in self.columns],
+            'Max': [self.value_range(col)[1] for col in self.columns],
+        }, index=self.columns)
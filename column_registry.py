@@ -0,0 +1,132 @@
+"""
+Registre typé des colonnes du dataset.
+
+Chaque colonne reçoit un rôle unique, déterminé une fois par version à
+partir du schéma et des artefacts d'ingestion (aucun parcours des données) :
+
+- `target` : la variable à prédire (SalePrice) ;
+- `temporal` : années et mois (construction, rénovation, vente) ;
+- `ordinal` : échelles de qualité et d'état (`ordinal_codec`) ;
+- `nominal` : autres variables qualitatives ;
+- `binary` : variables numériques ne prenant que les valeurs 0 et 1 ;
+- `discrete` : variables numériques d'au plus `DISCRETE_THRESHOLD` valeurs ;
+- `continuous` : autres variables numériques.
+
+Le registre conserve aussi les statistiques déjà calculées de chaque
+colonne (valeurs distinctes, manquants, plage, moyenne, écart-type) et les
+pages l'interrogent au lieu de refaire des `select_dtypes` à chaque rendu.
+"""
+import numpy as np
+import pandas as pd
+
+import ordinal_codec
+from schema import YEAR_COLUMNS
+
+TARGET = 'SalePrice'
+# Une variable numérique d'au plus 10 valeurs distinctes est considérée comme discrète
+DISCRETE_THRESHOLD = 10
+
+CONTINUOUS = 'continuous'
+DISCRETE = 'discrete'
+BINARY = 'binary'
+ORDINAL = 'ordinal'
+NOMINAL = 'nominal'
+TEMPORAL = 'temporal'
+KIND_TARGET = 'target'
+KINDS = (CONTINUOUS, DISCRETE, BINARY, ORDINAL, NOMINAL, TEMPORAL, KIND_TARGET)
+NUMERIC_KINDS = (CONTINUOUS, DISCRETE, BINARY, TEMPORAL, KIND_TARGET)
+CATEGORICAL_KINDS = (ORDINAL, NOMINAL)
+
+
+def classify(column, numeric, distinct, binary):
+    """Rôle d'une colonne d'après son nom, son type de stockage et sa cardinalité."""
+    if column == TARGET:
+        return KIND_TARGET
+    if column in YEAR_COLUMNS:
+        return TEMPORAL
+    if column in ordinal_codec.ORDINAL_SCALES:
+        return ORDINAL
+    if not numeric:
+        return NOMINAL
+    if binary:
+        return BINARY
+    return DISCRETE if distinct <= DISCRETE_THRESHOLD else CONTINUOUS
+
+
+class ColumnRegistry:
+    """Rôle et statistiques en cache de chaque colonne d'une version du dataset."""
+
+    def __init__(self, kinds, table):
+        self.kinds = dict(kinds)
+        self.table = table
+
+    @classmethod
+    def from_artifacts(cls, artifacts):
+        """Registre construit à partir des métadonnées et statistiques d'ingestion."""
+        metadata, stats = artifacts.metadata, artifacts.stats
+        kinds = {
+            col: classify(col, metadata.numeric.get(col, False), metadata.distinct(col), metadata.is_binary(col))
+            for col in metadata.columns
+        }
+        moments = stats.summary()
+        table = pd.DataFrame({
+            'Type': pd.Series(kinds),
+            'Valeurs distinctes': [metadata.distinct(col) for col in metadata.columns],
+            'Manquants': stats.missing_counts().reindex(metadata.columns).to_numpy(),
+            'Min': [metadata.value_range(col)[0] for col in metadata.columns],
+            'Max': [metadata.value_range(col)[1] for col in metadata.columns],
+            'Moyenne': moments['mean'].reindex(metadata.columns).to_numpy(),
+            'Écart-type': moments['std'].reindex(metadata.columns).to_numpy(),
+        }, index=metadata.columns)
+        return cls(kinds, table)
+
+    # ------------------------------
+    # 🔎 Requêtes
+    # ------------------------------
+    def kind(self, column):
+        return self.kinds[column]
+
+    def columns(self, *kinds):
+        """Colonnes des rôles demandés, dans l'ordre du dataset."""
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise ValueError(f"Rôle(s) inconnu(s) : {', '.join(sorted(unknown))}")
+        return [col for col, kind in self.kinds.items() if kind in kinds]
+
+    @property
+    def numeric_columns(self):
+        return self.columns(*NUMERIC_KINDS)
+
+    @property
+    def categorical_columns(self):
+        return self.columns(*CATEGORICAL_KINDS)
+
+    def above(self, columns, threshold):
+        """Colonnes de `columns` ayant strictement plus de `threshold` valeurs distinctes."""
+        distinct = self.table['Valeurs distinctes']
+        return [col for col in columns if distinct[col] > threshold]
+
+    def stats(self, column):
+        """Statistiques en cache d'une colonne (ligne du tableau du registre)."""
+        return self.table.loc[column]
+
+    # ------------------------------
+    # 🤖 Entrée du modèle
+    # ------------------------------
+    def model_input(self, values):
+        """DataFrame d'une ligne pour le modèle, typé selon le rôle de chaque variable.
+
+        Les variables continues sont passées en flottants, les autres
+        variables numériques en entiers ; une variable absente du registre
+        ou qualitative lève une `ValueError`.
+        """
+        columns = {}
+        for col, value in values.items():
+            if col not in self.kinds:
+                raise ValueError(f"{col} n'est pas une colonne du dataset")
+            kind = self.kinds[col]
+            if kind not in NUMERIC_KINDS:
+                raise ValueError(f"{col} est une variable qualitative ({kind})")
+            dtype = np.float64 if kind in (CONTINUOUS, KIND_TARGET) else np.int64
+            columns[col] = np.array([value], dtype=dtype)
+        return pd.DataFrame(columns)
@@ -0,0 +1,653 @@
+"""
+Stockage colonnaire partagé du dataset immobilier.
+
+Les sources `train.csv` et `test.csv` (séparateur `;`) sont converties une
+seule fois en dataset Parquet typé, rangé dans `housing_store/` à côté des
+sources. Toutes les pages chargent le dataset via ce module : un démarrage à
+froid se résume alors à une lecture colonnaire au lieu d'un parsing CSV
+complet.
+
+La conversion passe par l'ingestion en streaming : les artefacts dérivés
+(statistiques, corrélations, agrégats par catégorie) sont produits pendant
+l'écriture. Un manifeste enregistre l'empreinte des sources, la version du
+dataset et la liste des fragments Parquet ; l'ajout de nouvelles ventes crée
+un fragment supplémentaire et met les artefacts à jour sans tout recalculer.
+
+Chaque version est immuable : son manifeste (`manifest-v{N}.json`) nomme
+ses fragments et ses fichiers dérivés, et les lecteurs n'ouvrent que ceux de
+la version qui leur a été servie. Une nouvelle version (reconstruction ou
+ajout) est entièrement préparée à côté de la précédente, puis publiée en
+remplaçant `manifest.json` en une seule opération.
+
+Les pages passent par `current_manifest` : lorsqu'une source change sur
+disque, la version déjà construite continue d'être servie pendant que la
+nouvelle est préparée en arrière-plan ; un échec de cette préparation est
+exposé par `reload_error`.
+
+Le dataset typé n'est chargé qu'une fois par processus (`shared_view`) et
+partagé, en lecture seule, par toutes les pages et toutes les sessions ; ses
+colonnes ne sont lues qu'au moment où une page en a besoin. Le copy-on-write
+de pandas est activé : les projections de colonnes ne copient rien tant
+qu'elles ne sont pas modifiées.
+"""
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import ingestion
+import query
+import schema
+from artifacts import DerivedArtifacts
+from column_registry import ColumnRegistry
+from descriptive import DescriptiveSummary
+from feature_store import FeatureStore, append_rows, build_feature_store
+from indexes import IndexSet
+from ingestion import CSV_OPTIONS
+from lazy_frame import LazyFrame
+from missingness import MissingnessProfile
+from reloader import BackgroundReloader, file_fingerprint
+
+# ------------------------------
+# ⚙️ Configuration
+# ------------------------------
+DATA_DIR = Path(__file__).resolve().parent
+SOURCE_FILES = ("train.csv", "test.csv")
+STORE_NAME = "housing_store"
+# À incrémenter dès que la préparation des données change
+CACHE_FORMAT_VERSION = "13"
+# Vérifier aussi le contenu (hash) quand la taille est inchangée mais la date différente
+CHECK_CONTENT_HASH = True
+
+_build_lock = threading.RLock()
+# Registre des rechargeurs et des vues ; distinct du verrou de construction pour
+# que les pages ne soient jamais bloquées par une construction en cours
+_state_lock = threading.RLock()
+_reloaders = {}
+_views = {}
+_indexes = {}
+
+pd.set_option('mode.copy_on_write', True)
+
+
+# ------------------------------
+# 🔑 Empreinte des sources
+# ------------------------------
+def sources_hash(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Calcule l'empreinte SHA-1 (tronquée) du contenu des fichiers sources."""
+    digest = hashlib.sha1(CACHE_FORMAT_VERSION.encode())
+    for name in sources:
+        digest.update(name.encode())
+        with open(Path(data_dir) / name, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def source_fingerprints(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Taille et date de modification de chaque source (sans lecture du contenu)."""
+    return {name: list(file_fingerprint(Path(data_dir) / name)) for name in sources}
+
+
+# ------------------------------
+# 🗂️ Emplacements et manifeste
+# ------------------------------
+def store_dir(data_dir=DATA_DIR):
+    return Path(data_dir) / STORE_NAME
+
+
+def parts_dir(data_dir=DATA_DIR):
+    return store_dir(data_dir) / "parts"
+
+
+def part_name(build, index):
+    """Nom d'un fragment, unique d'une construction à l'autre."""
+    return f"part-{build}-{index:05d}.parquet"
+
+
+def part_paths(manifest, data_dir=DATA_DIR):
+    """Fragments Parquet d'une version, et seulement ceux-là."""
+    return [parts_dir(data_dir) / name for name in manifest['parts']]
+
+
+def _manifest_name(version=None):
+    return "manifest.json" if version is None else f"manifest-v{version}.json"
+
+
+def read_manifest(data_dir=DATA_DIR, version=None):
+    """Manifeste publié (ou celui d'une version donnée), None s'il n'existe pas."""
+    try:
+        with open(store_dir(data_dir) / _manifest_name(version), encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def _atomic_replace(path, write):
+    """Écrit un fichier via un fichier temporaire renommé en une seule opération."""
+    tmp = Path(path).with_name(Path(path).name + f".{uuid.uuid4().hex[:8]}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def write_manifest(path, manifest):
+    def write(tmp):
+        with open(tmp, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2)
+    _atomic_replace(path, write)
+
+
+def _version_files(manifest):
+    """Fichiers (relatifs au stockage) dont une version a besoin."""
+    return {_manifest_name(manifest['version']), manifest['artifacts'], manifest['features'],
+            Path(manifest['features']).with_suffix('.json').name, manifest['summary'], manifest['missing'],
+            *(f"parts/{name}" for name in manifest['parts'])}
+
+
+def _publish(manifest, data_dir=DATA_DIR):
+    """Rend une version préparée visible, puis retire les fichiers des versions antérieures.
+
+    Le manifeste de la version est écrit à part, puis `manifest.json` est
+    remplacé en une seule opération : une version n'est visible qu'une fois
+    tous ses fichiers en place. Les fichiers de la version publiée
+    précédemment sont conservés jusqu'à la publication suivante, le temps que
+    les pages qui la servent encore basculent.
+    """
+    directory = store_dir(data_dir)
+    previous = read_manifest(data_dir)
+    write_manifest(directory / _manifest_name(manifest['version']), manifest)
+    write_manifest(directory / _manifest_name(), manifest)
+
+    keep = _version_files(manifest)
+    if previous is not None and previous.get('format') == CACHE_FORMAT_VERSION:
+        keep |= _version_files(previous)
+    for path in [*directory.iterdir(), *parts_dir(data_dir).iterdir()]:
+        name = path.relative_to(directory).as_posix()
+        if path.is_file() and name != _manifest_name() and not name.endswith('.tmp') and name not in keep:
+            path.unlink(missing_ok=True)
+
+
+def is_current(manifest, data_dir=DATA_DIR, sources=SOURCE_FILES, content_hash=CHECK_CONTENT_HASH):
+    """Le dataset stocké correspond-il encore aux sources sur disque ?
+
+    L'empreinte taille + date suffit dans le cas courant. Avec `content_hash`,
+    une source simplement touchée (même taille, contenu identique) ne
+    déclenche pas de reconstruction : seul le manifeste est mis à jour.
+    """
+    if manifest is None or manifest.get('format') != CACHE_FORMAT_VERSION:
+        return False
+    fingerprints = source_fingerprints(data_dir, sources)
+    if manifest.get('sources') == fingerprints:
+        return True
+    same_sizes = all(manifest['sources'].get(name, [None])[0] == fingerprints[name][0] for name in sources)
+    if content_hash and same_sizes and manifest.get('content_hash') == sources_hash(data_dir, sources):
+        manifest = dict(manifest, sources=fingerprints)
+        write_manifest(store_dir(data_dir) / _manifest_name(manifest['version']), manifest)
+        write_manifest(store_dir(data_dir) / _manifest_name(), manifest)
+        return True
+    return False
+
+
+# ------------------------------
+# 📄 Lecture CSV (chemin lent)
+# ------------------------------
+def read_raw_csv(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Parse les CSV sources et les fusionne, sans conversion de types."""
+    frames = [pd.read_csv(Path(data_dir) / name, **CSV_OPTIONS) for name in sources]
+
+    # Fusion des données train et test
+    df = pd.concat(frames, axis=0, ignore_index=True)
+    return df.drop(columns=['Id'])
+
+
+def read_sources_csv(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Parse les CSV sources et applique le schéma compact."""
+    return schema.apply_schema(read_raw_csv(data_dir, sources))
+
+
+def memory_report(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Octets économisés par colonne entre le parsing brut et le schéma compact."""
+    raw = read_raw_csv(data_dir, sources)
+    return schema.memory_report(raw, schema.apply_schema(raw))
+
+
+# ------------------------------
+# 🗄️ Construction du dataset colonnaire
+# ------------------------------
+def _version_manifest(version, **fields):
+    """Manifeste d'une nouvelle version ; chaque version a ses propres fichiers dérivés."""
+    return {'format': CACHE_FORMAT_VERSION, 'version': version, **fields,
+            'artifacts': f"artifacts-v{version}.pkl", 'features': f"features-v{version}.npy",
+            'summary': f"summary-v{version}.pkl", 'missing': f"missing-v{version}.pkl"}
+
+
+def _prepare_version(manifest, data_dir=DATA_DIR, base=None, added=None):
+    """Construit la matrice numérique, le résumé et le profil de manquants d'une version.
+
+    Pour une version issue d'un ajout, `base` est le manifeste de la version
+    précédente et `added` le lot ajouté (typé) : seuls ses résultats sont
+    calculés puis fusionnés à ceux de `base`.
+    """
+    _feature_store_for(manifest, data_dir)
+    _summary_for(manifest, data_dir, base, added)
+    _missingness_for(manifest, data_dir, base, added)
+
+
+def _remove_files(paths):
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
+
+class _VersionAccumulator:
+    """Artefacts, matrice numérique, résumé et profil de manquants d'une version, bloc par bloc.
+
+    Accumulateur d'ingestion (voir `ingestion.ingest_csv`) : chaque bloc typé
+    est ajouté aux artefacts dérivés, écrit à la suite de la matrice et
+    fusionné au résumé et au profil de manquants, sans jamais relire le
+    dataset complet.
+    """
+
+    def __init__(self, numeric_columns, columns, features_path):
+        self.derived = DerivedArtifacts.for_columns(numeric_columns, columns)
+        self.features_path = features_path
+        self.rows = 0
+        self.summary = None
+        self.missing = None
+
+    def update(self, frame):
+        self.derived.update(frame)
+        typed = schema.apply_schema(frame)
+        if self.summary is None:
+            build_feature_store(typed, self.features_path)
+            self.summary = DescriptiveSummary.from_frame(typed, self.derived)
+            self.missing = MissingnessProfile.from_frame(typed)
+        else:
+            append_rows(self.features_path, typed, self.rows, self.features_path)
+            self.summary = self.summary.update(typed, self.derived)
+            self.missing = self.missing.merge(MissingnessProfile.from_frame(typed))
+        self.rows += len(typed)
+
+
+def build_columnar_cache(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Convertit les CSV en une nouvelle version du dataset Parquet et la publie.
+
+    Les fichiers de la nouvelle version portent des noms qui lui sont propres :
+    la version servie jusque-là reste lisible pendant toute la construction.
+    """
+    with _build_lock:
+        parts_dir(data_dir).mkdir(parents=True, exist_ok=True)
+        fingerprints = source_fingerprints(data_dir, sources)
+        # Version croissante d'une construction à l'autre (clé des caches des pages)
+        previous_manifest = read_manifest(data_dir) or {}
+        version = previous_manifest.get('version', 0) + 1
+        build = uuid.uuid4().hex[:8]
+        paths = [Path(data_dir) / name for name in sources]
+        first_part = parts_dir(data_dir) / part_name(build, 0)
+
+        manifest = _version_manifest(
+            version,
+            content_hash=sources_hash(data_dir, sources),
+            sources=fingerprints,
+            build=build,
+            parts=[first_part.name],
+        )
+
+        # Ingestion par blocs : artefacts dérivés, matrice, résumé et profil de
+        # manquants en un seul passage ; le plus grand `Id` est relevé au fil
+        # des blocs, sans relire les sources
+        max_id = 0
+
+        def track_id(chunk):
+            nonlocal max_id
+            max_id = max(max_id, int(chunk['Id'].max()))
+
+        def accumulator(numeric_columns, columns):
+            return _VersionAccumulator(numeric_columns, columns, store_dir(data_dir) / manifest['features'])
+
+        try:
+            built = ingestion.ingest_csv(paths, first_part, accumulator=accumulator, on_chunk=track_id)
+            manifest.update(rows=built.rows, next_id=max_id + 1)
+            _atomic_replace(store_dir(data_dir) / manifest['artifacts'], built.derived.save)
+            _atomic_replace(store_dir(data_dir) / manifest['summary'], built.summary.save)
+            _atomic_replace(store_dir(data_dir) / manifest['missing'], built.missing.save)
+        except BaseException:
+            _remove_files(store_dir(data_dir) / name for name in _version_files(manifest))
+            raise
+        _publish(manifest, data_dir)
+        return store_dir(data_dir)
+
+
+def ensure_store(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Retourne le manifeste à jour, en reconstruisant le dataset si les sources ont changé."""
+    manifest = read_manifest(data_dir)
+    if is_current(manifest, data_dir, sources):
+        return manifest
+    with _build_lock:
+        manifest = read_manifest(data_dir)
+        if not is_current(manifest, data_dir, sources):
+            build_columnar_cache(data_dir, sources)
+            manifest = read_manifest(data_dir)
+    return manifest
+
+
+def _prepare_store(data_dir, sources):
+    """Manifeste à jour, dont la matrice numérique, le résumé et le profil de manquants sont prêts."""
+    manifest = ensure_store(data_dir, sources)
+    _prepare_version(manifest, data_dir)
+    return manifest
+
+
+def _reloader(data_dir, sources):
+    key = (str(data_dir), tuple(sources))
+    with _state_lock:
+        if key not in _reloaders:
+            manifest = read_manifest(data_dir)
+            if manifest is not None and manifest.get('format') != CACHE_FORMAT_VERSION:
+                manifest = None
+            _reloaders[key] = BackgroundReloader(
+                lambda: source_fingerprints(data_dir, sources),
+                lambda fingerprint: _prepare_store(data_dir, sources),
+                initial=manifest,
+                initial_fingerprint=manifest['sources'] if manifest else None,
+            )
+        return _reloaders[key]
+
+
+def current_manifest(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Manifeste servi aux pages, sans attendre une éventuelle reconstruction.
+
+    Si les sources ont changé, la version précédente reste servie pendant que
+    la nouvelle est construite en arrière-plan ; seul le tout premier
+    démarrage (aucun dataset sur disque) est bloquant.
+    """
+    return _reloader(data_dir, sources).get()
+
+
+def reload_error(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Erreur de la dernière préparation en arrière-plan (None si elle a réussi).
+
+    Tant qu'elle est renseignée, les pages servent une version antérieure aux
+    sources sur disque.
+    """
+    return _reloader(data_dir, sources).error
+
+
+def manifest_for(version=None, data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Manifeste d'une version donnée (par défaut, celle servie aux pages).
+
+    Une page lit toutes ses données dans la version obtenue en début de rendu,
+    même si une nouvelle version est publiée entre-temps.
+    """
+    manifest = current_manifest(data_dir, sources)
+    if version is None or version == manifest['version']:
+        return manifest
+    manifest = read_manifest(data_dir, version)
+    if manifest is None:
+        raise LookupError(f"La version {version} du dataset n'est plus disponible")
+    return manifest
+
+
+def dataset_version(data_dir=DATA_DIR, sources=SOURCE_FILES):
+    """Numéro de version du dataset (incrémenté à chaque ajout ou reconstruction)."""
+    return current_manifest(data_dir, sources)['version']
+
+
+# ------------------------------
+# 📖 Chargement
+# ------------------------------
+def read_store(data_dir=DATA_DIR, manifest=None):
+    """Lit les fragments Parquet d'une version (la publiée par défaut) et réapplique le schéma compact."""
+    manifest = manifest or read_manifest(data_dir)
+    return schema.apply_schema(pd.read_parquet(part_paths(manifest, data_dir), engine='pyarrow'))
+
+
+def load_dataset(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Charge le dataset depuis le stockage colonnaire, en le construisant si besoin."""
+    return read_store(data_dir, manifest_for(version, data_dir, sources))
+
+
+def shared_view(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Vue paresseuse unique sur la version servie, partagée par toutes les pages.
+
+    Les colonnes sont lues à la première projection qui les demande puis
+    conservées ; la vue de la version précédente est libérée dès qu'une
+    nouvelle version est servie. La vue ne lit que les fragments de sa version.
+    """
+    manifest = manifest_for(version, data_dir, sources)
+    key = (str(data_dir), tuple(sources))
+    with _state_lock:
+        cached = _views.get(key)
+        if cached is not None and cached[0] == manifest['version']:
+            return cached[1]
+        view = LazyFrame(part_paths(manifest, data_dir))
+        if cached is None or cached[0] < manifest['version']:
+            _views[key] = (manifest['version'], view)
+        return view
+
+
+def shared_indexes(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Index de filtrage (voir `indexes.IndexSet`) de la version servie, partagés par les pages.
+
+    Lorsque la version ne fait qu'ajouter des fragments à la précédente, les
+    index déjà construits de celle-ci sont prolongés avec les seuls fragments
+    ajoutés plutôt que reconstruits.
+    """
+    manifest = manifest_for(version, data_dir, sources)
+    key = (str(data_dir), tuple(sources))
+    with _state_lock:
+        cached = _indexes.get(key)
+    if cached is not None and cached[0]['version'] == manifest['version']:
+        return cached[1]
+
+    view = shared_view(data_dir, sources, manifest['version'])
+    previous = cached[0]['parts'] if cached is not None else []
+    if cached is not None and previous == manifest['parts'][:len(previous)]:
+        added = LazyFrame([parts_dir(data_dir) / name for name in manifest['parts'][len(previous):]])
+        indexes = cached[1].extended(view, manifest['rows'], added)
+    else:
+        indexes = IndexSet(view, manifest['rows'])
+    with _state_lock:
+        cached = _indexes.get(key)
+        if cached is None or cached[0]['version'] < manifest['version']:
+            _indexes[key] = (manifest, indexes)
+    return indexes
+
+
+def shared_dataset(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Dataset complet de la version servie, construit sur la vue partagée.
+
+    Le DataFrame ne doit pas être modifié : les pages en extraient des
+    projections de colonnes.
+    """
+    return shared_view(data_dir, sources, version).frame()
+
+
+def query_store(predicate=None, columns=None, data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Lignes de la version servie satisfaisant `predicate` (voir `query`).
+
+    Le filtre est poussé vers les fragments Parquet : seules les colonnes et
+    les groupes de lignes utiles sont lus.
+    """
+    return query.execute(part_paths(manifest_for(version, data_dir, sources), data_dir), predicate, columns)
+
+
+def _artifacts_for(manifest, data_dir=DATA_DIR):
+    return DerivedArtifacts.load(store_dir(data_dir) / manifest['artifacts'])
+
+
+def load_artifacts(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Artefacts dérivés (statistiques, corrélations, agrégats) de la version servie."""
+    return _artifacts_for(manifest_for(version, data_dir, sources), data_dir)
+
+
+def load_stats(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Statistiques par colonne produites lors de l'ingestion des sources."""
+    return load_artifacts(data_dir, sources, version).stats
+
+
+def load_metadata(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Métadonnées de colonnes (valeurs distinctes, binaires, plages) de la version servie."""
+    return load_artifacts(data_dir, sources, version).metadata
+
+
+def load_registry(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Registre typé des colonnes (rôle et statistiques) de la version servie."""
+    return ColumnRegistry.from_artifacts(load_artifacts(data_dir, sources, version))
+
+
+def _feature_store_for(manifest, data_dir=DATA_DIR):
+    """Matrice numérique mappée d'une version donnée, construite si besoin.
+
+    Plusieurs versions peuvent partager la même matrice : chacune n'en lit que
+    ses `rows` premières lignes.
+    """
+    path = store_dir(data_dir) / manifest['features']
+    if not path.exists():
+        with _build_lock:
+            if not path.exists():
+                build_feature_store(read_store(data_dir, manifest), path)
+    return FeatureStore(path, manifest['rows'])
+
+
+def open_feature_store(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Ouvre la matrice numérique mappée de la version servie."""
+    return _feature_store_for(manifest_for(version, data_dir, sources), data_dir)
+
+
+def _per_version(manifest, data_dir, key, build, load):
+    """Artefact `manifest[key]` d'une version donnée, calculé une seule fois par `build()`."""
+    path = store_dir(data_dir) / manifest[key]
+    if not path.exists():
+        with _build_lock:
+            if not path.exists():
+                _atomic_replace(path, build().save)
+    return load(path)
+
+
+def _summary_for(manifest, data_dir=DATA_DIR, base=None, added=None):
+    """Résumé descriptif d'une version donnée, calculé une seule fois.
+
+    Après un ajout, le résumé de `base` est mis à jour avec le seul lot `added`.
+    """
+    def build():
+        artifacts = _artifacts_for(manifest, data_dir)
+        if base is not None:
+            return _summary_for(base, data_dir).update(added, artifacts)
+        return DescriptiveSummary.from_frame(read_store(data_dir, manifest), artifacts)
+    return _per_version(manifest, data_dir, "summary", build, DescriptiveSummary.load)
+
+
+def load_summary(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Résumé descriptif (statistiques, modes, types) de la version servie."""
+    return _summary_for(manifest_for(version, data_dir, sources), data_dir)
+
+
+def _missingness_for(manifest, data_dir=DATA_DIR, base=None, added=None):
+    """Profil des valeurs manquantes d'une version donnée, calculé une seule fois.
+
+    Après un ajout, le profil du seul lot `added` est fusionné à celui de `base`.
+    """
+    def build():
+        if base is not None:
+            return _missingness_for(base, data_dir).merge(MissingnessProfile.from_frame(added))
+        return MissingnessProfile.from_frame(read_store(data_dir, manifest))
+    return _per_version(manifest, data_dir, "missing", build, MissingnessProfile.load)
+
+
+def load_missingness(data_dir=DATA_DIR, sources=SOURCE_FILES, version=None):
+    """Valeurs manquantes par colonne, par ligne et par paire de colonnes de la version servie."""
+    return _missingness_for(manifest_for(version, data_dir, sources), data_dir)
+
+
+# ------------------------------
+# ➕ Ajout incrémental de ventes
+# ------------------------------
+def _ends_with_newline(path):
+    with open(path, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() == 0:
+            return True
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b'\n'
+
+
+def append_sales(batch, data_dir=DATA_DIR, sources=SOURCE_FILES, csv_name=SOURCE_FILES[0]):
+    """Ajoute un lot de ventes sans reconstruire le dataset.
+
+    Le lot est écrit dans un nouveau fragment Parquet et intégré à une copie
+    des artefacts dérivés ; la nouvelle version (fragments de la précédente
+    plus le nouveau) n'est publiée qu'une fois prête, si bien que la version
+    servie entre-temps ne change pas. Le coût dépend de la taille du lot, pas
+    de celle de l'historique.
+    """
+    with _build_lock:
+        manifest = ensure_store(data_dir, sources)
+        arrow_schema = pq.read_schema(part_paths(manifest, data_dir)[0]).remove_metadata()
+
+        # Identifiants attribués à la suite des ventes existantes
+        batch = batch.copy()
+        if 'Id' not in batch.columns:
+            batch.insert(0, 'Id', range(manifest['next_id'], manifest['next_id'] + len(batch)))
+        next_id = max(manifest['next_id'], int(batch['Id'].max()) + 1)
+
+        stored = batch.drop(columns=['Id'])
+        if set(stored.columns) == set(arrow_schema.names):
+            stored = stored[arrow_schema.names]
+        frame, _ = ingestion.type_chunk(stored, arrow_schema)
+        typed = schema.apply_schema(frame)
+
+        new_part = parts_dir(data_dir) / part_name(manifest['build'], len(manifest['parts']))
+        updated = _version_manifest(
+            manifest['version'] + 1,
+            # Le hash complet n'est pas recalculé : il coûterait un passage sur l'historique
+            content_hash=None,
+            build=manifest['build'],
+            parts=manifest['parts'] + [new_part.name],
+            rows=manifest['rows'] + len(frame),
+            next_id=next_id,
+        )
+        csv_size = None
+        try:
+            # 1. Nouveau fragment Parquet (invisible tant que la version n'est pas publiée)
+            pq.write_table(ingestion.to_arrow(frame, arrow_schema), new_part)
+
+            # 2. Artefacts dérivés de la nouvelle version, mis à jour avec le seul lot
+            derived = _artifacts_for(manifest, data_dir).update(frame)
+            _atomic_replace(store_dir(data_dir) / updated['artifacts'], derived.save)
+
+            # 3. Lignes du lot écrites à la suite de la matrice numérique (recopiée
+            #    dans une matrice plus grande seulement si sa réserve est épuisée)
+            matrix = _feature_store_for(manifest, data_dir).path
+            updated['features'] = append_rows(matrix, typed, manifest['rows'],
+                                              store_dir(data_dir) / updated['features']).name
+
+            # 4. Résumé et profil de manquants fusionnés avec ceux du seul lot
+            _prepare_version(updated, data_dir, base=manifest, added=typed)
+
+            # 5. CSV source (référence), en dernier : un échec plus tôt le laisse intact
+            csv_path = Path(data_dir) / csv_name
+            csv_size = csv_path.stat().st_size
+            with open(csv_path, encoding='utf-8') as file:
+                header = file.readline().rstrip('\r\n').split(CSV_OPTIONS['sep'])
+            needs_newline = not _ends_with_newline(csv_path)
+            with open(csv_path, 'a', encoding='utf-8', newline='') as file:
+                if needs_newline:
+                    file.write('\n')
+                batch[header].to_csv(file, sep=CSV_OPTIONS['sep'], header=False, index=False, na_rep='NA')
+            updated['sources'] = source_fingerprints(data_dir, sources)
+        except BaseException:
+            # Les fichiers partagés avec la version servie (fragments, matrice) sont conservés
+            _remove_files(store_dir(data_dir) / name for name in _version_files(updated) - _version_files(manifest))
+            if csv_size is not None:
+                # Lignes déjà ajoutées au CSV retirées : les sources restent celles de la version servie
+                os.truncate(csv_path, csv_size)
+            raise
+
+        # 6. Bascule : la nouvelle version devient visible d'un coup
+        _publish(updated, data_dir)
+        return updated['version']
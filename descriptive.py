@@ -0,0 +1,181 @@
+"""
+Résumé descriptif du dataset, calculé une fois par version.
+
+Le résumé regroupe tout ce qu'affiche la page Données sans dépendre des
+filtres : statistiques numériques (describe + coefficient de variation),
+mode de chaque variable catégorielle et répartition des types (les valeurs
+manquantes ont leur propre profil, voir `missingness`). Il est enregistré
+à côté du dataset pour que l'affichage de la page ne dépende plus de la
+taille des données.
+
+Le résumé d'une version se déduit des artefacts d'ingestion (moments de
+`RunningStats`, quartiles des sketches KLL) et d'effectifs par catégorie qui
+s'additionnent : après un ajout de ventes, seul le lot est parcouru
+(`update`). Les quartiles du résumé sont donc approchés (erreur de rang
+inférieure à 1,7 %, voir `sketches`) ; ceux d'une vue filtrée restent exacts.
+"""
+import numpy as np
+import pandas as pd
+
+from column_registry import ColumnRegistry
+from stats_engine import RunningStats
+
+
+# ------------------------------
+# 📊 Tableaux
+# ------------------------------
+def _describe(moments, quartiles):
+    """Tableau au format de `describe()` à partir des moments et des quartiles, avec le CV (%)."""
+    stats_df = pd.DataFrame({
+        'count': moments['count'].astype(np.float64),
+        'mean': moments['mean'],
+        'std': moments['std'],
+        'min': moments['min'],
+        '25%': quartiles[0.25],
+        '50%': quartiles[0.5],
+        '75%': quartiles[0.75],
+        'max': moments['max'],
+    })
+    stats_df['cv'] = (stats_df['std'] / stats_df['mean'] * 100).round(2)
+    return stats_df
+
+
+def numeric_table(df, numeric):
+    """Tableau de `describe()` des colonnes `numeric`, avec le coefficient de variation (%).
+
+    Les moments viennent d'un seul passage de `RunningStats` ; seuls les
+    quartiles demandent un calcul séparé.
+    """
+    numeric = list(numeric)
+    moments = RunningStats.from_frame(df, numeric).summary()
+    return _describe(moments, df[numeric].quantile([0.25, 0.5, 0.75]).T)
+
+
+def artifacts_numeric_table(artifacts):
+    """Même tableau, lu sur les artefacts d'ingestion (quartiles des sketches KLL)."""
+    moments = artifacts.stats.summary()
+    quartiles = pd.DataFrame(
+        [artifacts.sketches.column(col).quantile([0.25, 0.5, 0.75]) for col in moments.index],
+        index=moments.index, columns=[0.25, 0.5, 0.75],
+    )
+    return _describe(moments, quartiles)
+
+
+def category_counts(df, columns):
+    """Effectif de chaque catégorie des colonnes catégorielles `columns`, toutes à la fois.
+
+    Les codes de catégorie des colonnes sont décalés pour occuper des plages
+    disjointes, puis comptés par un unique `bincount` ; les valeurs
+    manquantes (code -1) sont ignorées.
+    """
+    columns = list(columns)
+    categoricals = [df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category')
+                    for col in columns]
+    sizes = np.array([len(values.cat.categories) for values in categoricals], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    codes = np.column_stack([values.cat.codes.to_numpy(dtype=np.int64) for values in categoricals]) \
+        if columns else np.empty((len(df), 0), dtype=np.int64)
+    present = codes >= 0
+    counts = np.bincount((codes + offsets)[present], minlength=int(sizes.sum()))
+    return {
+        col: pd.Series(counts[offset:offset + size], index=values.cat.categories, name=col)
+        for col, values, offset, size in zip(columns, categoricals, offsets, sizes)
+    }
+
+
+def categorical_table(df=None, columns=None, counts=None, n_rows=None):
+    """Nombre de catégories, mode et fréquence du mode de chaque variable catégorielle."""
+    if counts is None:
+        counts = category_counts(df, columns)
+    if n_rows is None:
+        n_rows = len(df)
+    rows = []
+    for col, col_counts in counts.items():
+        present = col_counts.to_numpy()
+        mode_freq = int(present.max()) if len(present) and present.max() > 0 else 0
+        rows.append({
+            'Variable': col,
+            'Catégories': int((present > 0).sum()),
+            'Mode': col_counts.index[present.argmax()] if mode_freq else 'N/A',
+            'Fréq. Mode': mode_freq,
+            '% Mode': f"{(mode_freq / max(n_rows, 1) * 100):.1f}%",
+        })
+    return pd.DataFrame(rows)
+
+
+def top_values(counts, n_rows, k=10):
+    """Les `k` catégories les plus fréquentes d'une colonne et leur part des lignes."""
+    top = counts[counts > 0].sort_values(ascending=False, kind='stable').head(k)
+    return pd.DataFrame({
+        'Catégorie': top.index.astype(str),
+        'Effectif': top.to_numpy(),
+        'Part (%)': (top.to_numpy() / max(n_rows, 1) * 100).round(1),
+    })
+
+
+def dtype_table(dtypes):
+    """Nombre et pourcentage de colonnes par type (`dtypes` : type de chaque colonne)."""
+    dtype_info = pd.DataFrame(dtypes.astype(str).value_counts()).reset_index()
+    dtype_info.columns = ['Type', 'Count']
+    dtype_info['Pourcentage'] = (dtype_info['Count'] / len(dtypes) * 100).round(1)
+    return dtype_info
+
+
+def common_dtype(left, right):
+    """Type compact d'une colonne réunissant deux lots : le plus large des deux."""
+    if left == right:
+        return left
+    if 'category' in (left, right):
+        return 'category'
+    return str(np.promote_types(left, right))
+
+
+# ------------------------------
+# 📦 Résumé d'une version
+# ------------------------------
+class DescriptiveSummary:
+    """Résumé descriptif d'une version du dataset."""
+
+    def __init__(self, n_rows, numeric, categorical, category_counts, column_dtypes):
+        self.n_rows = n_rows
+        self.numeric = numeric
+        self.categorical = categorical
+        self.category_counts = category_counts
+        self.column_dtypes = column_dtypes
+
+    @classmethod
+    def from_frame(cls, df, artifacts):
+        """Résumé complet d'une version (`df` typé selon le schéma compact)."""
+        counts = category_counts(df, ColumnRegistry.from_artifacts(artifacts).categorical_columns)
+        return cls(len(df), artifacts_numeric_table(artifacts), categorical_table(df, counts=counts),
+                   counts, df.dtypes.astype(str))
+
+    def update(self, frame, artifacts):
+        """Résumé après l'ajout du lot `frame`, à partir des artefacts déjà mis à jour avec ce lot."""
+        batch_counts = category_counts(frame, list(self.category_counts))
+        counts = {col: self.category_counts[col].add(batch_counts[col], fill_value=0).astype(np.int64)
+                  for col in self.category_counts}
+        n_rows = self.n_rows + len(frame)
+        batch_dtypes = frame.dtypes.astype(str)
+        dtypes = pd.Series({col: common_dtype(dtype, batch_dtypes[col]) for col, dtype in self.column_dtypes.items()})
+        return DescriptiveSummary(n_rows, artifacts_numeric_table(artifacts),
+                                  categorical_table(counts=counts, n_rows=n_rows), counts, dtypes)
+
+    @property
+    def n_columns(self):
+        return len(self.column_dtypes)
+
+    @property
+    def dtypes(self):
+        return dtype_table(self.column_dtypes)
+
+    def top_values(self, column, k=10):
+        return top_values(self.category_counts[column], self.n_rows, k)
+
+    def save(self, path):
+        pd.to_pickle(self, path)
+
+    @staticmethod
+    def load(path):
+        return pd.read_pickle(path)
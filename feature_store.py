@@ -0,0 +1,135 @@
+"""
+Magasin de variables numériques mappé en mémoire.
+
+Les colonnes numériques sont écrites une seule fois dans une matrice `.npy`
+(une ligne de la matrice par colonne du dataset) accompagnée d'un index de
+colonnes JSON. Les pages lisent ensuite des tranches sans copie de cette
+matrice : les pages mémoire sont partagées par le cache de l'OS entre tous
+les processus du serveur au lieu d'une copie pandas par processus.
+
+La matrice réserve de la place pour des lignes futures (`GROWTH`) : un ajout
+de ventes écrit ses lignes à la suite, sans toucher aux précédentes, et
+plusieurs versions du dataset partagent le même fichier, chacune n'en lisant
+que ses `n_rows` premières lignes. La matrice n'est recopiée dans un fichier
+plus grand que lorsque la réserve est épuisée.
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FEATURE_DTYPE = np.float64
+# Capacité réservée à chaque (ré)allocation, en multiple du nombre de lignes
+GROWTH = 1.5
+
+
+def index_path(matrix_path):
+    """Chemin de l'index de colonnes associé à une matrice."""
+    return Path(matrix_path).with_suffix('.json')
+
+
+# ------------------------------
+# 🏗️ Construction
+# ------------------------------
+def numeric_columns(df):
+    """Colonnes stockées dans la matrice : numériques, hors catégories."""
+    return [col for col in df.columns
+            if pd.api.types.is_numeric_dtype(df[col]) and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+
+
+def _allocate(matrix_path, columns, capacity):
+    """Crée une matrice vide de `capacity` lignes (fichier creux) et son index de colonnes."""
+    tmp = matrix_path.with_name(matrix_path.name + f".{os.getpid()}.tmp")
+    matrix = np.lib.format.open_memmap(tmp, mode='w+', dtype=FEATURE_DTYPE, shape=(len(columns), capacity))
+    with open(index_path(tmp), 'w', encoding='utf-8') as file:
+        json.dump({'columns': columns}, file)
+    return tmp, matrix
+
+
+def _install(tmp, matrix_path):
+    os.replace(index_path(tmp), index_path(matrix_path))
+    os.replace(tmp, matrix_path)
+    return matrix_path
+
+
+def _write_rows(matrix, columns, df, start):
+    for i, col in enumerate(columns):
+        matrix[i, start:start + len(df)] = df[col].to_numpy(dtype=FEATURE_DTYPE, na_value=np.nan)
+
+
+def build_feature_store(df, matrix_path):
+    """Écrit les colonnes numériques du DataFrame dans une matrice mappée."""
+    matrix_path = Path(matrix_path)
+    columns = numeric_columns(df)
+
+    # Stockage par colonne : chaque variable est une tranche contiguë
+    tmp, matrix = _allocate(matrix_path, columns, int(np.ceil(len(df) * GROWTH)))
+    _write_rows(matrix, columns, df, 0)
+    matrix.flush()
+    del matrix
+    return _install(tmp, matrix_path)
+
+
+def append_rows(matrix_path, df, start, grown_path):
+    """Écrit les lignes de `df` à partir de la ligne `start` d'une matrice existante.
+
+    Les lignes `0..start-1` ne sont jamais réécrites. Si la réserve est
+    insuffisante, la matrice est recopiée dans `grown_path`, plus grande.
+    Retourne le chemin de la matrice contenant les nouvelles lignes.
+    """
+    matrix_path = Path(matrix_path)
+    with open(index_path(matrix_path), encoding='utf-8') as file:
+        columns = json.load(file)['columns']
+    end = start + len(df)
+    matrix = np.load(matrix_path, mmap_mode='r+')
+    if end <= matrix.shape[1]:
+        _write_rows(matrix, columns, df, start)
+        matrix.flush()
+        return matrix_path
+
+    grown_path = Path(grown_path)
+    tmp, grown = _allocate(grown_path, columns, int(np.ceil(end * GROWTH)))
+    grown[:, :start] = matrix[:, :start]
+    _write_rows(grown, columns, df, start)
+    grown.flush()
+    del grown
+    return _install(tmp, grown_path)
+
+
+# ------------------------------
+# 📖 Lecture sans copie
+# ------------------------------
+class FeatureStore:
+    """Accès en lecture seule aux colonnes numériques d'une matrice mappée."""
+
+    def __init__(self, matrix_path, n_rows):
+        self.path = Path(matrix_path)
+        with open(index_path(self.path), encoding='utf-8') as file:
+            index = json.load(file)
+        self.columns = index['columns']
+        self._positions = {col: i for i, col in enumerate(self.columns)}
+        matrix = np.load(self.path, mmap_mode='r')
+        # Seules les `n_rows` premières lignes appartiennent à la version lue,
+        # les suivantes sont la réserve des ajouts à venir
+        self.n_rows = n_rows
+        self.matrix = matrix[:, :self.n_rows]
+
+    def __contains__(self, column):
+        return column in self._positions
+
+    def __len__(self):
+        return self.n_rows
+
+    def array(self, column):
+        """Vue NumPy (sans copie) d'une colonne."""
+        return self.matrix[self._positions[column]]
+
+    def series(self, column):
+        """Série pandas adossée à la vue mappée d'une colonne."""
+        return pd.Series(self.array(column), name=column, copy=False)
+
+    def frame(self, columns):
+        """DataFrame limité aux colonnes demandées, sans copie des données."""
+        return pd.DataFrame({col: self.series(col) for col in columns}, copy=False)
@@ -0,0 +1,315 @@
+"""
+Index en mémoire pour filtrer le dataset sans parcourir toutes les lignes.
+
+`SortedIndex` conserve, pour une colonne numérique, la permutation qui la
+trie (argsort) et les valeurs triées : une plage de valeurs se résout par
+recherche dichotomique en une tranche de positions, en O(log n), et le
+nombre de lignes correspondantes se lit directement sur les bornes.
+
+`BitmapIndex` associe à chaque catégorie d'une colonne qualitative un
+ensemble de bits compacté (un bit par ligne, 8 lignes par octet). Toute
+combinaison ET/OU de filtres se résout par opérations bit à bit sur ces
+tableaux, et le nombre de lignes retenues par un comptage de bits.
+
+`IndexSet` construit ces index à la demande, colonne par colonne, et les
+conserve pour toute la durée de vie d'une version du dataset. Après un ajout
+de ventes, `IndexSet.extended` prolonge les index déjà construits avec les
+seules nouvelles lignes (fusion des valeurs triées, bits ajoutés en fin
+d'ensemble) au lieu de les reconstruire sur tout l'historique.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Nombre de bits à 1 pour chaque valeur d'octet
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+# ------------------------------
+# 🧮 Ensembles de bits compactés
+# ------------------------------
+def empty_bits(n_rows):
+    return np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+
+
+def pack_mask(mask):
+    """Ensemble de bits d'un masque booléen."""
+    return np.packbits(np.asarray(mask, dtype=bool), bitorder='little')
+
+
+def rows_to_bits(positions, n_rows):
+    """Ensemble de bits des lignes aux positions données."""
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[positions] = True
+    return pack_mask(mask)
+
+
+def append_bits(bits, n_rows, mask):
+    """Ensemble de bits des `n_rows` lignes de `bits` suivies des lignes de `mask`.
+
+    Les nouvelles lignes sont décalées de `n_rows % 8` bits pour compléter le
+    dernier octet, dont les bits inutilisés sont nuls.
+    """
+    shift = n_rows % 8
+    if shift == 0:
+        return np.concatenate([bits, pack_mask(mask)])
+    added = pack_mask(np.concatenate([np.zeros(shift, dtype=bool), np.asarray(mask, dtype=bool)]))
+    return np.concatenate([bits[:-1], bits[-1:] | added[:1], added[1:]])
+
+
+def count_bits(bits):
+    """Nombre de lignes présentes dans l'ensemble."""
+    return int(_POPCOUNT[bits].sum(dtype=np.int64))
+
+
+def count_bits_by_set(bits):
+    """Nombre de lignes présentes dans chaque ensemble d'une matrice (un ensemble par ligne)."""
+    return _POPCOUNT[bits].sum(axis=-1, dtype=np.int64)
+
+
+def bits_to_rows(bits, n_rows, limit=None, offset=0, block=1 << 16):
+    """Positions des lignes présentes, dans l'ordre du dataset.
+
+    Retourne au plus `limit` lignes à partir de la `offset`-ième. Avec
+    `limit`, l'ensemble est parcouru par blocs : les blocs entièrement avant
+    `offset` sont sautés par simple comptage de bits et le parcours s'arrête
+    dès que la fenêtre est complète.
+    """
+    if limit is None and offset == 0:
+        return np.flatnonzero(np.unpackbits(bits, count=n_rows, bitorder='little'))
+    found = []
+    total = 0
+    for start in range(0, len(bits), block):
+        chunk = bits[start:start + block]
+        if offset:
+            present = count_bits(chunk)
+            if present <= offset:
+                offset -= present
+                continue
+        rows = np.flatnonzero(np.unpackbits(chunk, bitorder='little')) + start * 8
+        rows = rows[rows < n_rows][offset:]
+        offset = 0
+        if limit is not None:
+            rows = rows[:limit - total]
+        found.append(rows)
+        total += len(rows)
+        if limit is not None and total >= limit:
+            break
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def ordered_window(bits, order, offset, limit, block=1 << 16):
+    """Lignes `offset` à `offset + limit` de l'ensemble, dans l'ordre d'une permutation.
+
+    `order` est une suite de tableaux de positions parcourus l'un après
+    l'autre (par exemple les valeurs triées puis les valeurs manquantes).
+    Seuls les blocs nécessaires pour atteindre la fenêtre sont examinés.
+    """
+    found = []
+    total = 0
+    for positions in order:
+        for start in range(0, len(positions), block):
+            chunk = positions[start:start + block]
+            selected = chunk[(bits[chunk >> 3] >> (chunk & 7).astype(np.uint8)) & 1 == 1]
+            if len(selected) <= offset:
+                offset -= len(selected)
+                continue
+            selected = selected[offset:limit - total + offset]
+            offset = 0
+            found.append(selected)
+            total += len(selected)
+            if total >= limit:
+                return np.concatenate(found)
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+# ------------------------------
+# 📈 Index trié
+# ------------------------------
+class SortedIndex:
+    """Index trié d'une colonne numérique (valeurs manquantes exclues)."""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        present = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[present], kind='stable')
+        self.positions = present[order]
+        self.values = values[self.positions]
+        self.n_rows = len(values)
+
+    def extended(self, values):
+        """Nouvel index couvrant aussi les lignes `values`, ajoutées après les lignes indexées.
+
+        Les valeurs ajoutées sont triées seules puis insérées dans les valeurs
+        déjà triées (après les valeurs égales, l'ordre reste stable).
+        """
+        added = SortedIndex(values)
+        where = np.searchsorted(self.values, added.values, side='right')
+        index = SortedIndex.__new__(SortedIndex)
+        index.values = np.insert(self.values, where, added.values)
+        index.positions = np.insert(self.positions, where, added.positions + self.n_rows)
+        index.n_rows = self.n_rows + added.n_rows
+        return index
+
+    @property
+    def min(self):
+        return self.values[0] if len(self.values) else np.nan
+
+    @property
+    def max(self):
+        return self.values[-1] if len(self.values) else np.nan
+
+    def bounds(self, low, high):
+        """Tranche [start, stop) des valeurs comprises entre `low` et `high` (inclus)."""
+        start = np.searchsorted(self.values, low, side='left')
+        stop = np.searchsorted(self.values, high, side='right')
+        return int(start), int(max(start, stop))
+
+    def count(self, low, high):
+        start, stop = self.bounds(low, high)
+        return stop - start
+
+    def rows(self, low, high, limit=None):
+        """Positions des lignes de la plage, dans l'ordre d'origine du dataset.
+
+        Avec `limit`, seules les `limit` premières lignes sont extraites
+        (sélection partielle, sans trier toute la plage).
+        """
+        start, stop = self.bounds(low, high)
+        positions = self.positions[start:stop]
+        if limit is not None and limit < len(positions):
+            positions = np.partition(positions, limit - 1)[:limit]
+        return np.sort(positions)
+
+    def bits(self, low, high):
+        """Ensemble de bits des lignes de la plage, combinable avec `BitmapIndex`."""
+        start, stop = self.bounds(low, high)
+        return rows_to_bits(self.positions[start:stop], self.n_rows)
+
+
+# ------------------------------
+# 🏷️ Index bitmap
+# ------------------------------
+class BitmapIndex:
+    """Un ensemble de bits compacté par catégorie d'une colonne qualitative."""
+
+    def __init__(self, series):
+        series = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+        codes = series.cat.codes.to_numpy()
+        self.n_rows = len(codes)
+        self.categories = list(series.cat.categories)
+        self._bits = {category: pack_mask(codes == code) for code, category in enumerate(self.categories)}
+
+    def extended(self, series):
+        """Nouvel index couvrant aussi les lignes `series`, ajoutées après les lignes indexées."""
+        added = BitmapIndex(series)
+        index = BitmapIndex.__new__(BitmapIndex)
+        index.categories = self.categories + [c for c in added.categories if c not in self._bits]
+        index._bits = {category: append_bits(self.bits(category), self.n_rows,
+                                             np.unpackbits(added.bits(category), count=added.n_rows,
+                                                           bitorder='little'))
+                       for category in index.categories}
+        index.n_rows = self.n_rows + added.n_rows
+        return index
+
+    def bits(self, category):
+        if category not in self._bits:
+            return empty_bits(self.n_rows)
+        return self._bits[category]
+
+    def any_of(self, categories):
+        """Lignes appartenant à l'une des catégories (OU)."""
+        result = empty_bits(self.n_rows)
+        for category in categories:
+            result |= self.bits(category)
+        return result
+
+    @property
+    def nbytes(self):
+        return sum(bits.nbytes for bits in self._bits.values())
+
+
+# ------------------------------
+# 🗂️ Ensemble d'index d'un dataset
+# ------------------------------
+class IndexSet:
+    """Index construits à la demande, colonne par colonne, sur une vue du dataset.
+
+    `view` doit fournir `project(columns)` (voir `lazy_frame.LazyFrame`) ;
+    chaque index n'est construit qu'une fois puis conservé.
+    """
+
+    def __init__(self, view, n_rows):
+        self.view = view
+        self.n_rows = n_rows
+        self._sorted = {}
+        self._bitmaps = {}
+        self._nulls = {}
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def _column(self, column):
+        return self.view.project([column])[column]
+
+    def extended(self, view, n_rows, added):
+        """Index de `view` (`n_rows` lignes) : celles de cet ensemble suivies de celles de `added`.
+
+        Les index triés, bitmap et de valeurs manquantes déjà construits sont
+        prolongés avec les seules lignes de `added` (une vue sur les fragments
+        ajoutés) ; les autres index et les ordres de tri seront construits à
+        la demande sur `view`.
+        """
+        with self._lock:
+            sorted_, bitmaps, nulls = dict(self._sorted), dict(self._bitmaps), dict(self._nulls)
+        new_rows = added.project(list(dict.fromkeys([*sorted_, *bitmaps, *nulls])))
+        indexes = IndexSet(view, n_rows)
+        for column, index in sorted_.items():
+            indexes._sorted[column] = index.extended(new_rows[column].to_numpy(dtype=np.float64, na_value=np.nan))
+        for column, index in bitmaps.items():
+            indexes._bitmaps[column] = index.extended(new_rows[column])
+        for column, bits in nulls.items():
+            indexes._nulls[column] = append_bits(bits, self.n_rows, new_rows[column].isna().to_numpy())
+        return indexes
+
+    def sorted(self, column):
+        with self._lock:
+            if column not in self._sorted:
+                values = self._column(column).to_numpy(dtype=np.float64, na_value=np.nan)
+                self._sorted[column] = SortedIndex(values)
+            return self._sorted[column]
+
+    def bitmap(self, column):
+        with self._lock:
+            if column not in self._bitmaps:
+                self._bitmaps[column] = BitmapIndex(self._column(column))
+            return self._bitmaps[column]
+
+    def nulls(self, column):
+        """Ensemble de bits des lignes où la colonne est manquante."""
+        with self._lock:
+            if column not in self._nulls:
+                self._nulls[column] = pack_mask(self._column(column).isna().to_numpy())
+            return self._nulls[column]
+
+    def order(self, column, ascending=True):
+        """Permutation de tri de la colonne, valeurs manquantes en dernier.
+
+        Retourne deux tableaux de positions à parcourir successivement : les
+        valeurs présentes triées, puis les valeurs manquantes. L'ordre
+        décroissant est une vue inversée, sans nouveau tri.
+        """
+        with self._lock:
+            if column not in self._orders:
+                values = self._column(column)
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    keys = values.cat.codes.to_numpy().astype(np.float64)
+                    keys[keys < 0] = np.nan
+                else:
+                    keys = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = np.isnan(keys)
+                present = np.flatnonzero(~missing)
+                self._orders[column] = (present[np.argsort(keys[present], kind='stable')],
+                                        np.flatnonzero(missing))
+            ranked, missing = self._orders[column]
+        return (ranked if ascending else ranked[::-1]), missing
@@ -0,0 +1,162 @@
+"""
+Ingestion en streaming des exports de ventes (CSV séparés par `;`).
+
+Les fichiers sont lus par blocs de `chunksize` lignes : chaque bloc est
+validé, typé selon un schéma de stockage fixe puis ajouté comme groupe de
+lignes au fichier Parquet. Les statistiques par colonne sont mises à jour au
+passage, si bien que la mémoire maximale dépend de la taille d'un bloc et
+non de celle du fichier.
+"""
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import ordinal_codec
+import schema
+from stats_engine import RunningStats
+
+DEFAULT_CHUNKSIZE = 100_000
+CSV_OPTIONS = dict(sep=';', encoding='utf-8', on_bad_lines='warn')
+
+
+class IngestionError(ValueError):
+    """Bloc de données incompatible avec le schéma de stockage."""
+
+
+# ------------------------------
+# 📐 Schéma de stockage
+# ------------------------------
+def storage_schema(columns, first_chunk):
+    """Schéma Arrow stable pour tous les blocs d'une ingestion.
+
+    Les colonnes qualitatives sont stockées en dictionnaire de chaînes et
+    toutes les colonnes numériques en float64 : un bloc ultérieur contenant
+    une valeur manquante ou une valeur plus grande reste ainsi compatible.
+    Le schéma compact est réappliqué à la lecture.
+    """
+    fields = []
+    for col in columns:
+        if col in schema.CATEGORICAL_COLUMNS or not pd.api.types.is_numeric_dtype(first_chunk[col]):
+            fields.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            fields.append(pa.field(col, pa.float64()))
+    return pa.schema(fields)
+
+
+def type_chunk(chunk, arrow_schema):
+    """Valide un bloc et le convertit au schéma de stockage.
+
+    Retourne le bloc typé et le nombre de valeurs numériques invalides
+    (non convertibles) remplacées par des valeurs manquantes. Un libellé
+    absent de l'échelle d'une colonne ordinale rejette le bloc.
+    """
+    expected = arrow_schema.names
+    if list(chunk.columns) != expected:
+        missing = sorted(set(expected) - set(chunk.columns))
+        extra = sorted(set(chunk.columns) - set(expected))
+        raise IngestionError(f"Colonnes incompatibles (manquantes: {missing}, inattendues: {extra})")
+
+    unknown = {}
+    for col in ordinal_codec.ordinal_columns(chunk):
+        labels = ordinal_codec.unknown_labels(chunk[col])
+        if labels:
+            unknown[col] = labels
+    if unknown:
+        details = ", ".join(f"{col}: {labels}" for col, labels in unknown.items())
+        raise IngestionError(f"Libellés hors des échelles ordinales ({details})")
+
+    invalid = 0
+    typed = {}
+    for field in arrow_schema:
+        values = chunk[field.name]
+        if pa.types.is_dictionary(field.type):
+            typed[field.name] = values.astype('string').astype(object)
+        else:
+            numeric = pd.to_numeric(values, errors='coerce').astype(np.float64)
+            invalid += int(numeric.isna().sum() - values.isna().sum())
+            typed[field.name] = numeric
+
+    return pd.DataFrame(typed), invalid
+
+
+def to_arrow(frame, arrow_schema):
+    """Table Arrow d'un bloc typé, prête à être écrite."""
+    return pa.Table.from_pandas(frame, schema=arrow_schema, preserve_index=False)
+
+
+# ------------------------------
+# 🌊 Ingestion
+# ------------------------------
+def iter_chunks(csv_paths, chunksize=DEFAULT_CHUNKSIZE, drop_columns=('Id',), csv_options=CSV_OPTIONS):
+    """Parcourt successivement les fichiers CSV par blocs de lignes."""
+    for path in csv_paths:
+        for chunk in pd.read_csv(path, chunksize=chunksize, **csv_options):
+            yield chunk.drop(columns=[col for col in drop_columns if col in chunk.columns])
+
+
+def ingest_csv(csv_paths, target, chunksize=DEFAULT_CHUNKSIZE, drop_columns=('Id',),
+               csv_options=CSV_OPTIONS, accumulator=RunningStats, on_chunk=None):
+    """Écrit les CSV dans un fichier Parquet, bloc par bloc, et retourne les statistiques.
+
+    `accumulator` est appelé avec (colonnes numériques, colonnes) au premier
+    bloc ; l'objet obtenu reçoit ensuite chaque bloc typé via `update`.
+    `on_chunk`, s'il est fourni, reçoit chaque bloc brut avant la
+    suppression de `drop_columns` (par exemple pour suivre le dernier `Id`).
+    """
+    target = Path(target)
+    tmp = target.with_name(target.name + f".{os.getpid()}.tmp")
+    writer = None
+    stats = None
+    invalid = 0
+
+    try:
+        for chunk in iter_chunks(csv_paths, chunksize, (), csv_options):
+            if on_chunk is not None:
+                on_chunk(chunk)
+            chunk = chunk.drop(columns=[col for col in drop_columns if col in chunk.columns])
+            if writer is None:
+                arrow_schema = storage_schema(list(chunk.columns), chunk)
+                numeric_columns = [f.name for f in arrow_schema if not pa.types.is_dictionary(f.type)]
+                stats = accumulator(numeric_columns, arrow_schema.names)
+                writer = pq.ParquetWriter(tmp, arrow_schema)
+
+            frame, chunk_invalid = type_chunk(chunk, arrow_schema)
+            writer.write_table(to_arrow(frame, arrow_schema))
+            stats.update(frame)
+            invalid += chunk_invalid
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    if writer is None:
+        raise IngestionError("Aucune ligne à ingérer")
+    writer.close()
+    os.replace(tmp, target)
+
+    if invalid:
+        warnings.warn(f"{invalid} valeurs numériques invalides remplacées par des valeurs manquantes")
+    return stats
+
+
+# ------------------------------
+# 🚀 Utilisation en ligne de commande
+# ------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ingestion en streaming d'exports de ventes CSV")
+    parser.add_argument("csv_paths", nargs="+", help="Fichiers CSV (séparateur ';')")
+    parser.add_argument("--output", required=True, help="Fichier Parquet de destination")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    result = ingest_csv(args.csv_paths, args.output, chunksize=args.chunksize)
+    result.save(Path(args.output).with_suffix('.stats.json'))
+    print(f"{result.rows:,} lignes ingérées dans {args.output}")
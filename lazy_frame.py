@@ -0,0 +1,72 @@
+"""
+Dataset colonnaire chargé colonne par colonne, à la demande.
+
+Le schéma Parquet suffit à connaître les colonnes et leur nature (numérique
+ou qualitative) sans rien lire. Une section d'analyse demande ensuite les
+colonnes dont elle a besoin via `project` : seules celles qui ne sont pas
+encore en mémoire sont lues depuis le stockage, typées selon le schéma
+compact puis conservées pour les sections suivantes.
+"""
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import schema
+
+
+class LazyFrame:
+    """Vue paresseuse, en lecture seule, sur un dataset Parquet."""
+
+    def __init__(self, source):
+        # Un répertoire, un fichier ou une liste de fragments (ceux d'une version)
+        self.source = [Path(path) for path in source] if isinstance(source, (list, tuple)) else Path(source)
+        self.arrow_schema = pq.ParquetDataset(self.source).schema
+        self.columns = list(self.arrow_schema.names)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------
+    # 📐 Métadonnées (sans lecture)
+    # ------------------------------
+    @property
+    def categorical_columns(self):
+        """Colonnes qualitatives (stockées en dictionnaire), ordinales comprises."""
+        return [f.name for f in self.arrow_schema if pa.types.is_dictionary(f.type)]
+
+    @property
+    def numeric_columns(self):
+        return [f.name for f in self.arrow_schema if not pa.types.is_dictionary(f.type)]
+
+    @property
+    def loaded_columns(self):
+        return list(self._loaded)
+
+    def memory_usage(self):
+        """Octets occupés par les colonnes déjà chargées."""
+        return sum(col.memory_usage(deep=True, index=False) for col in self._loaded.values())
+
+    # ------------------------------
+    # 🔎 Projection
+    # ------------------------------
+    def project(self, columns):
+        """DataFrame limité à `columns`, en ne lisant que les colonnes manquantes."""
+        columns = list(dict.fromkeys(columns))
+        unknown = [col for col in columns if col not in self.columns]
+        if unknown:
+            raise KeyError(f"Colonnes inconnues : {unknown}")
+
+        with self._lock:
+            missing = [col for col in columns if col not in self._loaded]
+            if missing:
+                table = pd.read_parquet(self.source, engine='pyarrow', columns=missing)
+                for col in missing:
+                    self._loaded[col] = schema.optimize_column(table[col])
+            loaded = {col: self._loaded[col] for col in columns}
+        return pd.DataFrame(loaded, copy=False)
+
+    def frame(self):
+        """Dataset complet (toutes les colonnes chargées)."""
+        return self.project(self.columns)
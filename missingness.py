@@ -0,0 +1,127 @@
+"""
+Profil des valeurs manquantes, calculé sur des ensembles de bits compactés.
+
+Chaque colonne est réduite une seule fois à l'ensemble de bits de ses lignes
+manquantes (un bit par ligne, voir `indexes`). Tout le profil s'en déduit
+par opérations bit à bit et comptage de bits, sans revenir aux données :
+
+- le nombre de valeurs manquantes par colonne (comptage de bits) ;
+- la répartition du nombre de valeurs manquantes par ligne (somme des bits
+  dépliés, bloc par bloc) ;
+- la matrice de co-absence : nombre de lignes où deux colonnes sont
+  manquantes ensemble (comptage de bits du ET des deux ensembles).
+
+Les colonnes sans valeur manquante n'ont que des zéros dans la matrice et
+en sont écartées. Les calculs sont faits par blocs d'octets pour borner la
+mémoire sur des datasets très hauts. Tous ces comptages s'additionnent :
+après un ajout de ventes, le profil du lot est fusionné à celui de
+l'historique (`merge`).
+"""
+import numpy as np
+import pandas as pd
+
+from indexes import count_bits_by_set, pack_mask
+
+# Octets (8 lignes chacun) traités par bloc
+BLOCK_BYTES = 1 << 16
+
+
+# ------------------------------
+# 🧮 Calculs sur les ensembles de bits
+# ------------------------------
+def null_bitmaps(df, columns=None):
+    """Ensembles de bits des lignes manquantes, une ligne de la matrice par colonne."""
+    columns = list(df.columns if columns is None else columns)
+    if not columns:
+        return np.empty((0, (len(df) + 7) // 8), dtype=np.uint8)
+    return np.stack([pack_mask(df[col].isna().to_numpy()) for col in columns])
+
+
+def column_counts(bitmaps, block=BLOCK_BYTES):
+    """Nombre de bits à 1 de chaque ensemble (valeurs manquantes par colonne)."""
+    counts = np.zeros(len(bitmaps), dtype=np.int64)
+    for start in range(0, bitmaps.shape[1], block):
+        counts += count_bits_by_set(bitmaps[:, start:start + block])
+    return counts
+
+
+def row_counts(bitmaps, n_rows, block=BLOCK_BYTES):
+    """Nombre de colonnes manquantes sur chaque ligne."""
+    result = np.zeros(n_rows, dtype=np.int32)
+    for start in range(0, bitmaps.shape[1], block):
+        bits = np.unpackbits(bitmaps[:, start:start + block], axis=1, bitorder='little')
+        rows = min(bits.shape[1], n_rows - start * 8)
+        result[start * 8:start * 8 + rows] = bits[:, :rows].sum(axis=0, dtype=np.int32)
+    return result
+
+
+def co_missing_counts(bitmaps, block=BLOCK_BYTES):
+    """Matrice symétrique du nombre de lignes où deux colonnes sont manquantes ensemble."""
+    k = len(bitmaps)
+    counts = np.zeros((k, k), dtype=np.int64)
+    for start in range(0, bitmaps.shape[1], block):
+        chunk = bitmaps[:, start:start + block]
+        for i in range(k):
+            counts[i, i:] += count_bits_by_set(chunk[i] & chunk[i:])
+    # Seul le triangle supérieur (diagonale comprise) a été calculé
+    return counts + np.triu(counts, 1).T
+
+
+# ------------------------------
+# 📦 Profil d'une version
+# ------------------------------
+class MissingnessProfile:
+    """Valeurs manquantes par colonne, par ligne et par paire de colonnes."""
+
+    def __init__(self, n_rows, counts, co_missing, rows_histogram):
+        self.n_rows = n_rows
+        self.counts = counts
+        self.co_missing = co_missing
+        self.rows_histogram = rows_histogram
+
+    @classmethod
+    def from_frame(cls, df, block=BLOCK_BYTES):
+        bitmaps = null_bitmaps(df)
+        counts = pd.Series(column_counts(bitmaps, block), index=df.columns)
+        missing = counts.to_numpy() > 0
+        co_missing = pd.DataFrame(co_missing_counts(bitmaps[missing], block),
+                                  index=counts.index[missing], columns=counts.index[missing])
+        histogram = pd.Series(np.bincount(row_counts(bitmaps, len(df), block)))
+        histogram.index.name = 'Valeurs manquantes par ligne'
+        return cls(len(df), counts, co_missing, histogram)
+
+    def merge(self, other):
+        """Profil des lignes des deux profils réunies (par exemple l'historique et un lot ajouté).
+
+        Comptages, co-absences et répartition par ligne s'additionnent : seul
+        le lot ajouté a besoin d'être réduit en ensembles de bits.
+        """
+        counts = self.counts.add(other.counts, fill_value=0).astype(np.int64).reindex(self.counts.index)
+        missing = counts.index[counts.to_numpy() > 0]
+        co_missing = (self.co_missing.reindex(index=missing, columns=missing, fill_value=0)
+                      + other.co_missing.reindex(index=missing, columns=missing, fill_value=0))
+        histogram = self.rows_histogram.add(other.rows_histogram, fill_value=0).astype(np.int64)
+        histogram.index.name = self.rows_histogram.index.name
+        return MissingnessProfile(self.n_rows + other.n_rows, counts, co_missing, histogram)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def rates(self):
+        """Pourcentage de valeurs manquantes par colonne, du plus élevé au plus faible."""
+        return (self.counts / max(self.n_rows, 1) * 100).sort_values(ascending=False, kind='stable')
+
+    def conditional(self, columns=None):
+        """Part (%) des lignes où la colonne en colonne manque, parmi celles où la colonne en ligne manque."""
+        co_missing = self.co_missing if columns is None else self.co_missing.loc[columns, columns]
+        diagonal = np.diag(co_missing.to_numpy()).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return co_missing.div(diagonal, axis=0) * 100
+
+    def save(self, path):
+        pd.to_pickle(self, path)
+
+    @staticmethod
+    def load(path):
+        return pd.read_pickle(path)
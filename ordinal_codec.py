@@ -0,0 +1,94 @@
+"""
+Codec ordinal pour les variables de qualité et d'état.
+
+Les colonnes notées sur une échelle ordonnée (Po < Fa < TA < Gd < Ex, etc.)
+sont stockées en catégories ordonnées : chaque cellule n'occupe qu'un code
+int8, et les libellés ne sont reconstitués qu'à l'affichage. Les codes
+servent directement de variables numériques, sans `map` sur des chaînes.
+"""
+import numpy as np
+import pandas as pd
+
+# ------------------------------
+# 📐 Échelles ordonnées (de la plus faible à la plus élevée)
+# ------------------------------
+QUALITY_SCALE = ('Po', 'Fa', 'TA', 'Gd', 'Ex')
+EXPOSURE_SCALE = ('No', 'Mn', 'Av', 'Gd')
+FINISH_TYPE_SCALE = ('Unf', 'LwQ', 'Rec', 'BLQ', 'ALQ', 'GLQ')
+GARAGE_FINISH_SCALE = ('Unf', 'RFn', 'Fin')
+
+ORDINAL_SCALES = {
+    'ExterQual': QUALITY_SCALE,
+    'ExterCond': QUALITY_SCALE,
+    'BsmtQual': QUALITY_SCALE,
+    'BsmtCond': QUALITY_SCALE,
+    'HeatingQC': QUALITY_SCALE,
+    'KitchenQual': QUALITY_SCALE,
+    'FireplaceQu': QUALITY_SCALE,
+    'GarageQual': QUALITY_SCALE,
+    'GarageCond': QUALITY_SCALE,
+    'PoolQC': QUALITY_SCALE,
+    'BsmtExposure': EXPOSURE_SCALE,
+    'BsmtFinType1': FINISH_TYPE_SCALE,
+    'BsmtFinType2': FINISH_TYPE_SCALE,
+    'GarageFinish': GARAGE_FINISH_SCALE,
+}
+
+
+def ordinal_dtype(column):
+    """Type catégoriel ordonné associé à une colonne ordinale."""
+    return pd.CategoricalDtype(categories=list(ORDINAL_SCALES[column]), ordered=True)
+
+
+def ordinal_columns(df):
+    """Colonnes ordinales présentes dans le DataFrame."""
+    return [col for col in ORDINAL_SCALES if col in df.columns]
+
+
+# ------------------------------
+# 🔁 Encodage / décodage
+# ------------------------------
+def unknown_labels(series):
+    """Libellés présents dans la colonne mais absents de son échelle ordinale."""
+    scale = ORDINAL_SCALES[series.name]
+    values = series.dropna()
+    return sorted(str(label) for label in pd.unique(values[~values.isin(scale)]))
+
+
+def encode(series):
+    """Convertit une colonne ordinale en catégorie ordonnée (codes int8).
+
+    Un libellé hors de l'échelle lève une `ValueError` qui le nomme, au lieu
+    de devenir silencieusement une valeur manquante.
+    """
+    encoded = series.astype(ordinal_dtype(series.name))
+    if (encoded.isna() & series.notna()).any():
+        unknown = unknown_labels(series)
+        raise ValueError(f"{series.name} : libellé(s) hors de l'échelle ordinale {unknown}")
+    return encoded
+
+
+def codes(df, columns=None):
+    """Codes int8 des colonnes ordinales (-1 pour une valeur manquante)."""
+    columns = ordinal_columns(df) if columns is None else columns
+    return pd.DataFrame({col: df[col].cat.codes for col in columns}, index=df.index)
+
+
+def numeric_features(df, columns=None):
+    """Codes ordinaux utilisables comme variables numériques (NaN si manquant)."""
+    raw = codes(df, columns)
+    return pd.DataFrame(
+        {col: np.where(raw[col] >= 0, raw[col], np.nan).astype(np.float32) for col in raw.columns},
+        index=df.index
+    )
+
+
+def decode(values, column):
+    """Retrouve les libellés d'origine à partir des codes d'une colonne."""
+    return pd.Categorical.from_codes(np.asarray(values, dtype=np.int8), dtype=ordinal_dtype(column))
+
+
+def axis_ticks(column):
+    """Graduations Plotly affichant les libellés à la place des codes."""
+    scale = ORDINAL_SCALES[column]
+    return dict(tickmode='array', tickvals=list(range(len(scale))), ticktext=list(scale))
@@ -0,0 +1,200 @@
+"""
+Requêtes composables sur le dataset immobilier.
+
+Un filtre est un arbre de prédicats simples (plage numérique, appartenance à
+un ensemble, valeur manquante ou non, fenêtre d'années) combinés par `&` et
+`|`. Le même filtre s'évalue de deux façons :
+
+- `execute` le traduit en expression Arrow et le pousse vers le stockage
+  Parquet : seules les colonnes demandées sont lues et les groupes de lignes
+  dont les statistiques min/max excluent toute correspondance sont ignorés ;
+- `Predicate.bits` le résout en mémoire sur les index d'un `IndexSet`
+  (index trié, index bitmap, lignes manquantes) pour l'affichage interactif.
+
+Comme en SQL, une ligne dont la valeur est manquante ne satisfait ni une
+plage ni un ensemble.
+"""
+import numpy as np
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+import schema
+from schema import YEAR_COLUMNS
+
+
+# ------------------------------
+# 🧩 Prédicats
+# ------------------------------
+class Predicate:
+    """Prédicat de filtrage ; se combine avec `&` (ET) et `|` (OU)."""
+
+    def expression(self):
+        """Expression Arrow équivalente, pour la lecture avec filtre poussé."""
+        raise NotImplementedError
+
+    def bits(self, indexes):
+        """Ensemble de bits des lignes retenues, calculé sur un `IndexSet`."""
+        raise NotImplementedError
+
+    def columns(self):
+        raise NotImplementedError
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+
+class Range(Predicate):
+    """`low <= colonne <= high` ; une borne à None n'est pas appliquée."""
+
+    def __init__(self, column, low=None, high=None):
+        self.column, self.low, self.high = column, low, high
+
+    def expression(self):
+        field = pc.field(self.column)
+        expr = field.is_valid()
+        if self.low is not None:
+            expr = expr & (field >= self.low)
+        if self.high is not None:
+            expr = expr & (field <= self.high)
+        return expr
+
+    def bits(self, indexes):
+        low = -np.inf if self.low is None else self.low
+        high = np.inf if self.high is None else self.high
+        return indexes.sorted(self.column).bits(low, high)
+
+    def columns(self):
+        return [self.column]
+
+    def __repr__(self):
+        return f"Range({self.column!r}, {self.low!r}, {self.high!r})"
+
+
+class In(Predicate):
+    """La colonne prend l'une des valeurs données."""
+
+    def __init__(self, column, values):
+        self.column, self.values = column, list(values)
+
+    def expression(self):
+        return pc.field(self.column).isin(self.values)
+
+    def bits(self, indexes):
+        return indexes.bitmap(self.column).any_of(self.values)
+
+    def columns(self):
+        return [self.column]
+
+    def __repr__(self):
+        return f"In({self.column!r}, {self.values!r})"
+
+
+class IsNull(Predicate):
+    """La colonne est manquante."""
+
+    def __init__(self, column):
+        self.column = column
+
+    def expression(self):
+        return pc.field(self.column).is_null()
+
+    def bits(self, indexes):
+        return indexes.nulls(self.column).copy()
+
+    def columns(self):
+        return [self.column]
+
+    def __repr__(self):
+        return f"IsNull({self.column!r})"
+
+
+class NotNull(IsNull):
+    """La colonne est renseignée."""
+
+    def expression(self):
+        return pc.field(self.column).is_valid()
+
+    def bits(self, indexes):
+        bits = ~indexes.nulls(self.column)
+        if indexes.n_rows % 8:
+            # Les bits de remplissage du dernier octet ne correspondent à aucune ligne
+            bits[-1] &= (1 << indexes.n_rows % 8) - 1
+        return bits
+
+    def __repr__(self):
+        return f"NotNull({self.column!r})"
+
+
+def year_window(column, start=None, end=None):
+    """Fenêtre d'années (ou de mois pour MoSold), bornes incluses."""
+    if column not in YEAR_COLUMNS:
+        raise ValueError(f"{column} n'est pas une colonne temporelle ({', '.join(YEAR_COLUMNS)})")
+    return Range(column, start, end)
+
+
+class And(Predicate):
+    def __init__(self, *predicates):
+        self.predicates = list(predicates)
+
+    def expression(self):
+        expr = self.predicates[0].expression()
+        for predicate in self.predicates[1:]:
+            expr = expr & predicate.expression()
+        return expr
+
+    def bits(self, indexes):
+        result = self.predicates[0].bits(indexes)
+        for predicate in self.predicates[1:]:
+            result &= predicate.bits(indexes)
+        return result
+
+    def columns(self):
+        return list(dict.fromkeys(col for p in self.predicates for col in p.columns()))
+
+    def __repr__(self):
+        return " & ".join(f"({p!r})" for p in self.predicates)
+
+
+class Or(And):
+    def expression(self):
+        expr = self.predicates[0].expression()
+        for predicate in self.predicates[1:]:
+            expr = expr | predicate.expression()
+        return expr
+
+    def bits(self, indexes):
+        result = self.predicates[0].bits(indexes)
+        for predicate in self.predicates[1:]:
+            result |= predicate.bits(indexes)
+        return result
+
+    def __repr__(self):
+        return " | ".join(f"({p!r})" for p in self.predicates)
+
+
+def all_of(predicates):
+    """Conjonction d'une liste de prédicats (None si la liste est vide)."""
+    predicates = [p for p in predicates if p is not None]
+    if not predicates:
+        return None
+    return predicates[0] if len(predicates) == 1 else And(*predicates)
+
+
+# ------------------------------
+# 📥 Exécution avec filtre poussé
+# ------------------------------
+def execute(source, predicate=None, columns=None):
+    """Lit le dataset Parquet `source` en poussant le filtre vers le stockage.
+
+    Seules `columns` (toutes par défaut) sont lues, et seulement dans les
+    groupes de lignes susceptibles de satisfaire le prédicat.
+    """
+    dataset = ds.dataset(source, format='parquet')
+    table = dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=predicate.expression() if predicate is not None else None,
+    )
+    return schema.apply_schema(table.to_pandas())
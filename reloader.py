@@ -0,0 +1,87 @@
+"""
+Rechargement d'artefacts piloté par empreinte de fichier.
+
+Une empreinte bon marché (taille + date de modification, éventuellement
+complétée d'un hash du contenu) détecte qu'un fichier a changé sur disque.
+`BackgroundReloader` continue alors de servir la version déjà chargée
+pendant qu'il prépare la nouvelle dans un thread, puis bascule dessus. Un
+échec de préparation est journalisé et conservé dans `error` jusqu'à la
+préparation réussie suivante.
+"""
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def file_fingerprint(path, content_hash=False):
+    """Empreinte d'un fichier : (taille, mtime en ns[, sha1 du contenu])."""
+    info = os.stat(path)
+    fingerprint = (info.st_size, info.st_mtime_ns)
+    if content_hash:
+        digest = hashlib.sha1()
+        with open(Path(path), 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+        fingerprint += (digest.hexdigest(),)
+    return fingerprint
+
+
+class BackgroundReloader:
+    """Sert la dernière version prête d'un artefact et prépare la suivante en arrière-plan.
+
+    `fingerprint` est appelé à chaque accès (il doit être peu coûteux) ;
+    `load(fingerprint)` n'est appelé que lorsque l'empreinte change. Seul le
+    tout premier chargement est bloquant, sauf si une valeur initiale est
+    fournie.
+    """
+
+    def __init__(self, fingerprint, load, initial=None, initial_fingerprint=None):
+        self._fingerprint = fingerprint
+        self._load = load
+        self._lock = threading.Lock()
+        self._value = initial
+        self._current = initial_fingerprint if initial is not None else None
+        self._pending = None
+        self._failed = None
+        self.error = None
+
+    def get(self):
+        """Valeur correspondant à l'empreinte actuelle ou, à défaut, la dernière prête."""
+        fingerprint = self._fingerprint()
+        with self._lock:
+            if fingerprint == self._current:
+                return self._value
+            if self._value is None:
+                # Premier chargement : rien à servir en attendant
+                self._value = self._load(fingerprint)
+                self._current = fingerprint
+                return self._value
+            if fingerprint not in (self._pending, self._failed):
+                self._pending = fingerprint
+                threading.Thread(target=self._prewarm, args=(fingerprint,), daemon=True).start()
+            return self._value
+
+    def _prewarm(self, fingerprint):
+        try:
+            value = self._load(fingerprint)
+        except Exception as e:
+            # La version précédente reste servie : l'échec est journalisé et exposé via `error`
+            logger.exception("Échec de la préparation de la nouvelle version ; la précédente reste servie")
+            with self._lock:
+                self._failed, self.error = fingerprint, e
+                if self._pending == fingerprint:
+                    self._pending = None
+            return
+        with self._lock:
+            self._value, self._current, self.error = value, fingerprint, None
+            if self._pending == fingerprint:
+                self._pending = None
+
+    @property
+    def reloading(self):
+        """Une nouvelle version est-elle en cours de préparation ?"""
+        return self._pending is not None
@@ -0,0 +1,89 @@
+"""
+Schéma de types compact pour le dataset immobilier fusionné.
+
+Les colonnes texte sont stockées en `category`, les comptages, années et
+surfaces sont réduits au plus petit type entier ou flottant qui les contient
+sans perte, et les valeurs manquantes restent de vraies valeurs manquantes
+(au lieu de la chaîne littérale "nan"). Les échelles de qualité sont
+déléguées au codec ordinal.
+"""
+import numpy as np
+import pandas as pd
+
+import ordinal_codec
+
+# Colonnes qualitatives du dataset (43 variables)
+CATEGORICAL_COLUMNS = (
+    'MSZoning', 'Street', 'Alley', 'LotShape', 'LandContour', 'Utilities',
+    'LotConfig', 'LandSlope', 'Neighborhood', 'Condition1', 'Condition2',
+    'BldgType', 'HouseStyle', 'RoofStyle', 'RoofMatl', 'Exterior1st',
+    'Exterior2nd', 'MasVnrType', 'ExterQual', 'ExterCond', 'Foundation',
+    'BsmtQual', 'BsmtCond', 'BsmtExposure', 'BsmtFinType1', 'BsmtFinType2',
+    'Heating', 'HeatingQC', 'CentralAir', 'Electrical', 'KitchenQual',
+    'Functional', 'FireplaceQu', 'GarageType', 'GarageFinish', 'GarageQual',
+    'GarageCond', 'PavedDrive', 'PoolQC', 'Fence', 'MiscFeature', 'SaleType',
+    'SaleCondition',
+)
+
+# Colonnes temporelles utilisables comme fenêtres d'années (ou de mois)
+YEAR_COLUMNS = ('YearBuilt', 'YearRemodAdd', 'YrSold', 'MoSold')
+
+
+# ------------------------------
+# 🔧 Réduction des types
+# ------------------------------
+def _downcast_numeric(series):
+    """Réduit une colonne numérique au plus petit type qui la contient sans perte."""
+    values = series.to_numpy()
+
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+
+    finite = values[~np.isnan(values)]
+    if len(finite) == len(values) and np.array_equal(finite, np.round(finite)):
+        # Flottant sans valeur manquante et à valeurs entières → entier
+        return pd.to_numeric(series, downcast='integer')
+
+    as_float32 = values.astype(np.float32)
+    if np.array_equal(as_float32.astype(values.dtype), values, equal_nan=True):
+        return series.astype(np.float32)
+    return series
+
+
+def optimize_column(series):
+    """Retourne la colonne convertie dans son type compact."""
+    if series.name in ordinal_codec.ORDINAL_SCALES:
+        return ordinal_codec.encode(series)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return _downcast_numeric(series)
+    if series.name in CATEGORICAL_COLUMNS or pd.api.types.is_object_dtype(series) \
+            or pd.api.types.is_string_dtype(series):
+        return series.astype('category')
+    return series
+
+
+def apply_schema(df):
+    """Applique le schéma compact à toutes les colonnes du DataFrame."""
+    return pd.DataFrame({col: optimize_column(df[col]) for col in df.columns})
+
+
+# ------------------------------
+# 📏 Rapport mémoire
+# ------------------------------
+def memory_report(before, after):
+    """Compare l'empreinte mémoire, colonne par colonne, avant et après le schéma."""
+    bytes_before = before.memory_usage(deep=True, index=False)
+    bytes_after = after.memory_usage(deep=True, index=False)
+
+    report = pd.DataFrame({
+        'Variable': bytes_before.index,
+        'Type avant': [str(before[col].dtype) for col in bytes_before.index],
+        'Type après': [str(after[col].dtype) for col in bytes_before.index],
+        'Octets avant': bytes_before.values,
+        'Octets après': bytes_after.reindex(bytes_before.index).values,
+    })
+    report['Octets économisés'] = report['Octets avant'] - report['Octets après']
+    report['Ratio'] = (report['Octets avant'] / report['Octets après']).round(1)
+    return report.sort_values('Octets économisés', ascending=False).reset_index(drop=True)
@@ -0,0 +1,194 @@
+"""
+Statistiques descriptives incrémentales et fusionnables.
+
+Les moments centrés d'ordre 2 à 4 sont accumulés par blocs avec les
+formules de fusion de Chan et Pébay (variante par lots de l'algorithme de
+Welford) : deux accumulateurs calculés sur des morceaux disjoints se
+fusionnent exactement, ce qui permet de calculer les statistiques au fil
+d'une ingestion en streaming, ou en parallèle sur des partitions, sans
+second passage.
+"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+
+class RunningStats:
+    """Effectif, moyenne, variance, asymétrie, aplatissement, min/max et manquants par colonne."""
+
+    def __init__(self, numeric_columns, columns=None):
+        self.numeric_columns = list(numeric_columns)
+        self.columns = list(columns) if columns is not None else list(self.numeric_columns)
+        k = len(self.numeric_columns)
+        self.rows = 0
+        self.count = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.m3 = np.zeros(k)
+        self.m4 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        self.missing = np.zeros(len(self.columns), dtype=np.int64)
+
+    # ------------------------------
+    # 🔄 Mise à jour / fusion
+    # ------------------------------
+    def update(self, frame):
+        """Intègre un bloc de lignes (DataFrame) dans l'accumulateur."""
+        self.merge(RunningStats.from_frame(frame, self.numeric_columns, self.columns))
+        return self
+
+    @classmethod
+    def from_frame(cls, frame, numeric_columns, columns=None):
+        """Accumulateur calculé en une passe vectorisée sur un DataFrame."""
+        acc = cls(numeric_columns, columns)
+        acc.rows = len(frame)
+        acc.missing = frame[acc.columns].isna().sum().to_numpy(dtype=np.int64)
+
+        values = frame[acc.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        acc.count = present.sum(axis=0)
+        filled = np.where(present, values, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            acc.mean = np.where(acc.count > 0, filled.sum(axis=0) / acc.count, 0.0)
+        deviations = np.where(present, values - acc.mean, 0.0)
+        squared = deviations ** 2
+        acc.m2 = squared.sum(axis=0)
+        acc.m3 = (squared * deviations).sum(axis=0)
+        acc.m4 = (squared ** 2).sum(axis=0)
+        acc.min = np.where(present, values, np.inf).min(axis=0, initial=np.inf)
+        acc.max = np.where(present, values, -np.inf).max(axis=0, initial=-np.inf)
+        return acc
+
+    def merge(self, other):
+        """Fusionne exactement un autre accumulateur (formules de Chan et Pébay)."""
+        n_a, n_b = self.count.astype(np.float64), other.count.astype(np.float64)
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            safe_n = np.where(n > 0, n, 1.0)
+            m2 = self.m2 + other.m2 + delta ** 2 * n_a * n_b / safe_n
+            m3 = (self.m3 + other.m3
+                  + delta ** 3 * n_a * n_b * (n_a - n_b) / safe_n ** 2
+                  + 3 * delta * (n_a * other.m2 - n_b * self.m2) / safe_n)
+            m4 = (self.m4 + other.m4
+                  + delta ** 4 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2) / safe_n ** 3
+                  + 6 * delta ** 2 * (n_a ** 2 * other.m2 + n_b ** 2 * self.m2) / safe_n ** 2
+                  + 4 * delta * (n_a * other.m3 - n_b * self.m3) / safe_n)
+            self.mean = self.mean + delta * n_b / safe_n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.count = self.count + other.count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.missing = self.missing + other.missing
+        self.rows += other.rows
+        return self
+
+    # ------------------------------
+    # 📊 Résultats
+    # ------------------------------
+    def variance(self, ddof=1):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def skewness(self):
+        """Asymétrie corrigée du biais (comme `Series.skew`)."""
+        n = self.count.astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g1 = np.sqrt(n) * self.m3 / self.m2 ** 1.5
+            result = g1 * np.sqrt(n * (n - 1)) / (n - 2)
+        return np.where((n > 2) & (self.m2 > 0), result, np.nan)
+
+    def kurtosis(self):
+        """Excès d'aplatissement corrigé du biais (comme `Series.kurt`)."""
+        n = self.count.astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g2 = n * self.m4 / self.m2 ** 2 - 3
+            result = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6)
+        return np.where((n > 3) & (self.m2 > 0), result, np.nan)
+
+    def summary(self):
+        """Tableau des statistiques numériques, une ligne par colonne."""
+        empty = self.count == 0
+        return pd.DataFrame({
+            'count': self.count,
+            'mean': np.where(empty, np.nan, self.mean),
+            'std': np.sqrt(self.variance()),
+            'skew': self.skewness(),
+            'kurtosis': self.kurtosis(),
+            'min': np.where(empty, np.nan, self.min),
+            'max': np.where(empty, np.nan, self.max),
+        }, index=self.numeric_columns)
+
+    def missing_counts(self):
+        """Nombre de valeurs manquantes par colonne."""
+        return pd.Series(self.missing, index=self.columns)
+
+    # ------------------------------
+    # 💾 Sérialisation
+    # ------------------------------
+    def to_dict(self):
+        return {
+            'numeric_columns': self.numeric_columns,
+            'columns': self.columns,
+            'rows': self.rows,
+            'count': self.count.tolist(),
+            'mean': self.mean.tolist(),
+            'm2': self.m2.tolist(),
+            'm3': self.m3.tolist(),
+            'm4': self.m4.tolist(),
+            'min': self.min.tolist(),
+            'max': self.max.tolist(),
+            'missing': self.missing.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        acc = cls(data['numeric_columns'], data['columns'])
+        acc.rows = data['rows']
+        acc.count = np.asarray(data['count'], dtype=np.int64)
+        acc.mean = np.asarray(data['mean'], dtype=np.float64)
+        acc.m2 = np.asarray(data['m2'], dtype=np.float64)
+        acc.m3 = np.asarray(data['m3'], dtype=np.float64)
+        acc.m4 = np.asarray(data['m4'], dtype=np.float64)
+        acc.min = np.asarray(data['min'], dtype=np.float64)
+        acc.max = np.asarray(data['max'], dtype=np.float64)
+        acc.missing = np.asarray(data['missing'], dtype=np.int64)
+        return acc
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as file:
+            return cls.from_dict(json.load(file))
+
+
+# ------------------------------
+# ⚡ Calcul parallèle
+# ------------------------------
+def parallel_stats(partitions, numeric_columns, columns=None, executor=None):
+    """Statistiques de plusieurs partitions calculées en parallèle puis fusionnées.
+
+    `partitions` est une suite de DataFrames (blocs, groupes de lignes...).
+    Par défaut un pool de threads est utilisé (NumPy libère le GIL) ; un
+    `ProcessPoolExecutor` peut être fourni pour répartir le calcul sur des
+    processus.
+    """
+    partitions = list(partitions)
+    if not partitions:
+        return RunningStats(numeric_columns, columns)
+    if executor is None:
+        with ThreadPoolExecutor() as pool:
+            results = list(pool.map(RunningStats.from_frame, partitions,
+                                    repeat(numeric_columns), repeat(columns)))
+    else:
+        results = list(executor.map(RunningStats.from_frame, partitions,
+                                    repeat(numeric_columns), repeat(columns)))
+    return reduce(RunningStats.merge, results)
@@ -0,0 +1,22 @@
+"""Fixtures partagées : copie des sources et dataset construit dans un répertoire temporaire."""
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import data_store
+
+
+@pytest.fixture
+def sources(tmp_path):
+    for name in data_store.SOURCE_FILES:
+        shutil.copy(data_store.DATA_DIR / name, tmp_path / name)
+    return tmp_path
+
+
+@pytest.fixture
+def store(sources):
+    data_store.build_columnar_cache(sources)
+    return sources
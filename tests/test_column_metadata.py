@@ -0,0 +1,31 @@
+"""Comptage des valeurs distinctes : exact en deçà de `EXACT_LIMIT`, HyperLogLog au-delà."""
+import numpy as np
+import pytest
+
+from column_metadata import EXACT_LIMIT, DistinctCounter, HyperLogLog
+
+
+@pytest.mark.parametrize('n_distinct', [500, 20_000, 1_000_000])
+def test_hyperloglog_relative_error(n_distinct):
+    values = np.random.default_rng(n_distinct).permutation(n_distinct).astype(np.float64) * 1.5
+    sketch = HyperLogLog()
+    for batch in np.array_split(np.concatenate([values, values[:n_distinct // 2]]), 10):
+        sketch.update(batch)
+
+    # Trois erreurs types (1,04 / sqrt(2**p) ≈ 0,8 %)
+    assert abs(sketch.count() - n_distinct) / n_distinct < 3 * sketch.relative_error
+
+
+def test_merged_hyperloglogs_count_the_union():
+    values = np.arange(300_000, dtype=np.float64)
+    left, right = HyperLogLog().update(values[:200_000]), HyperLogLog().update(values[100_000:])
+    assert abs(left.merge(right).count() - len(values)) / len(values) < 3 * left.relative_error
+
+
+def test_counter_is_exact_below_limit_then_approximate():
+    counter = DistinctCounter().update(np.arange(EXACT_LIMIT, dtype=np.float64) % 700)
+    assert counter.exact and counter.count() == 700
+
+    counter.update(np.arange(50_000, dtype=np.float64))
+    assert not counter.exact
+    assert abs(counter.count() - 50_000) / 50_000 < 3 * counter.sketch.relative_error
@@ -0,0 +1,115 @@
+"""Versions immuables : un ajout de ventes ne modifie jamais la version servie."""
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_store
+from descriptive import DescriptiveSummary
+from indexes import IndexSet
+from missingness import MissingnessProfile
+
+
+def sales(store, n_rows):
+    csv_path = store / data_store.SOURCE_FILES[0]
+    return pd.read_csv(csv_path, nrows=n_rows, **data_store.CSV_OPTIONS).drop(columns=['Id'])
+
+
+def test_append_leaves_served_version_unchanged(store):
+    served = data_store.current_manifest(store)
+    view = data_store.shared_view(store)
+    rows = served['rows']
+
+    version = data_store.append_sales(sales(store, 50), store)
+
+    assert version == served['version'] + 1
+    # Colonnes lues après l'ajout sur la vue de l'ancienne version : mêmes lignes
+    assert view.project(['SalePrice', 'GrLivArea']).shape == (rows, 2)
+    assert len(data_store.read_store(store, served)) == rows
+    assert data_store.load_stats(store, version=served['version']).rows == rows
+    assert data_store.load_stats(store, version=version).rows == rows + 50
+    assert len(data_store.open_feature_store(store, version=version)) == rows + 50
+
+
+def test_files_of_older_versions_are_removed(store):
+    first = data_store.read_manifest(store)
+    data_store.append_sales(sales(store, 5), store)
+    data_store.append_sales(sales(store, 5), store)
+
+    assert data_store.read_manifest(store, first['version']) is None
+    assert not (store / data_store.STORE_NAME / first['artifacts']).exists()
+    assert all(path.exists() for path in data_store.part_paths(data_store.read_manifest(store), store))
+
+
+def test_failed_reload_is_reported(store):
+    served = data_store.current_manifest(store)
+    csv_path = store / data_store.SOURCE_FILES[0]
+    with open(csv_path, 'a', encoding='utf-8') as file:
+        file.write(csv_path.read_text(encoding='utf-8').splitlines()[1].replace(';Gd;', ';Excellent;', 1) + '\n')
+
+    assert data_store.current_manifest(store)['version'] == served['version']
+    for _ in range(100):
+        if data_store.reload_error(store) is not None:
+            break
+        time.sleep(0.1)
+    assert "Excellent" in str(data_store.reload_error(store))
+    assert data_store.current_manifest(store)['version'] == served['version']
+
+
+def test_indexes_are_extended_with_appended_rows(store):
+    served = data_store.current_manifest(store)
+    previous = data_store.shared_indexes(store)
+    previous.sorted('SalePrice'), previous.bitmap('Neighborhood'), previous.nulls('Alley')
+
+    # Lot de taille quelconque : les nouvelles lignes ne commencent pas sur un octet
+    version = data_store.append_sales(sales(store, 13), store)
+    extended = data_store.shared_indexes(store, version=version)
+    rebuilt = IndexSet(data_store.shared_view(store, version=version), served['rows'] + 13)
+
+    assert extended.n_rows == served['rows'] + 13
+    assert np.array_equal(extended.sorted('SalePrice').values, rebuilt.sorted('SalePrice').values)
+    assert np.array_equal(extended.sorted('SalePrice').positions, rebuilt.sorted('SalePrice').positions)
+    for category in rebuilt.bitmap('Neighborhood').categories:
+        assert np.array_equal(extended.bitmap('Neighborhood').bits(category),
+                              rebuilt.bitmap('Neighborhood').bits(category))
+    assert np.array_equal(extended.nulls('Alley'), rebuilt.nulls('Alley'))
+    # Les index de la version précédente restent inchangés
+    assert previous.sorted('SalePrice').n_rows == served['rows']
+
+
+@pytest.mark.parametrize('failing', ['append_rows', 'source_fingerprints'])
+def test_failed_append_leaves_sources_unchanged(store, monkeypatch, failing):
+    served = data_store.current_manifest(store)
+    csv_path = store / data_store.SOURCE_FILES[0]
+    csv_size = csv_path.stat().st_size
+
+    def fail(*args, **kwargs):
+        raise OSError("disque plein")
+    monkeypatch.setattr(data_store, failing, fail)
+    with pytest.raises(OSError):
+        data_store.append_sales(sales(store, 20), store)
+    monkeypatch.undo()
+
+    assert csv_path.stat().st_size == csv_size
+    assert data_store.is_current(data_store.read_manifest(store), store)
+    assert data_store.current_manifest(store)['version'] == served['version']
+
+
+def test_build_prepares_version_chunk_by_chunk(sources, monkeypatch):
+    original = data_store.ingestion.ingest_csv
+    monkeypatch.setattr(data_store.ingestion, 'ingest_csv',
+                        lambda *args, **kwargs: original(*args, chunksize=300, **kwargs))
+    monkeypatch.setattr(data_store, 'read_store', lambda *args, **kwargs: pytest.fail("lecture complète"))
+    data_store.build_columnar_cache(sources)
+    monkeypatch.undo()
+
+    df = data_store.read_store(sources, data_store.read_manifest(sources))
+    summary = data_store.load_summary(sources)
+    expected = DescriptiveSummary.from_frame(df, data_store.load_artifacts(sources))
+    assert summary.categorical.equals(expected.categorical)
+    assert summary.column_dtypes.equals(expected.column_dtypes)
+    assert data_store.load_missingness(sources).counts.equals(MissingnessProfile.from_frame(df).counts)
+    features = data_store.open_feature_store(sources)
+    assert len(features) == len(df)
+    assert np.array_equal(features.array('SalePrice'), df['SalePrice'].to_numpy(dtype=np.float64))
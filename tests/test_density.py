@@ -0,0 +1,39 @@
+"""KDE sur grille par FFT : même courbe que `scipy.stats.gaussian_kde`."""
+import numpy as np
+import pytest
+from scipy import stats
+
+import density
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    return np.concatenate([rng.lognormal(12, 0.35, 3_000), rng.lognormal(12.8, 0.2, 800)])
+
+
+@pytest.mark.parametrize('bw_factor', density.BANDWIDTH_FACTORS)
+def test_binned_kde_matches_gaussian_kde(prices, bw_factor):
+    kde = density.binned_kde(prices, bw_factor)
+    exact = stats.gaussian_kde(prices, bw_method=stats.gaussian_kde(prices).factor * bw_factor)
+    points = np.linspace(prices.min(), prices.max(), 200)
+
+    assert kde.bandwidth == pytest.approx(np.sqrt(exact.covariance[0, 0]), rel=1e-9)
+    assert np.abs(kde(points) - exact(points)).max() / exact(points).max() < 1e-3
+    assert kde.density.sum() * (kde.x[1] - kde.x[0]) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_grouped_kde_matches_each_group(prices):
+    groups = np.arange(len(prices)) % 3
+    x, densities, counts = density.grouped_kde(prices, groups, 3)
+
+    assert counts.tolist() == np.bincount(groups).tolist()
+    for group in range(3):
+        values = prices[groups == group]
+        exact = stats.gaussian_kde(values)(x)
+        assert np.abs(densities[group] - exact).max() / exact.max() < 1e-3
+
+
+def test_missing_values_are_ignored(prices):
+    with_missing = np.concatenate([prices, [np.nan] * 10])
+    assert np.array_equal(density.binned_kde(with_missing).density, density.binned_kde(prices).density)
@@ -0,0 +1,34 @@
+"""Libellés hors des échelles ordinales : rejetés au lieu de devenir des valeurs manquantes."""
+
+import pandas as pd
+import pytest
+
+import data_store
+import ingestion
+import ordinal_codec
+
+
+def test_encode_keeps_known_labels_and_missing_values():
+    encoded = ordinal_codec.encode(pd.Series(['Gd', None, 'Po'], name='KitchenQual'))
+    assert encoded.cat.codes.tolist() == [3, -1, 0]
+
+
+def test_encode_names_unknown_labels():
+    series = pd.Series(['Gd', 'Excellent', None, 'gd'], name='KitchenQual')
+    assert ordinal_codec.unknown_labels(series) == ['Excellent', 'gd']
+    with pytest.raises(ValueError, match=r"KitchenQual.*Excellent.*gd"):
+        ordinal_codec.encode(series)
+
+
+def test_append_sales_rejects_unknown_labels(store):
+    csv_path = store / data_store.SOURCE_FILES[0]
+    csv_before = csv_path.read_bytes()
+    version = data_store.read_manifest(store)['version']
+
+    batch = pd.read_csv(csv_path, nrows=3, **data_store.CSV_OPTIONS).drop(columns=['Id'])
+    batch.loc[1, 'ExterQual'] = 'Excellent'
+    with pytest.raises(ingestion.IngestionError, match=r"ExterQual.*Excellent"):
+        data_store.append_sales(batch, store)
+
+    assert csv_path.read_bytes() == csv_before
+    assert data_store.read_manifest(store)['version'] == version
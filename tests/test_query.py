@@ -0,0 +1,49 @@
+"""Un même filtre donne les mêmes lignes poussé vers le Parquet et résolu sur les index."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_store
+import query
+from indexes import IndexSet, bits_to_rows
+
+PREDICATES = [
+    query.Range('SalePrice', 150_000, 250_000),
+    query.Range('GrLivArea', low=2_000),
+    query.In('Neighborhood', ['NAmes', 'CollgCr', 'Inconnu']),
+    query.IsNull('Alley'),
+    query.NotNull('LotFrontage') & query.In('KitchenQual', ['Gd', 'Ex']),
+    query.year_window('YearBuilt', 1950, 1980) | query.In('MSZoning', ['FV']),
+    query.all_of([query.Range('SalePrice', high=200_000), query.In('HouseStyle', ['1Story']),
+                  query.year_window('YrSold', 2007, 2008)]),
+]
+
+
+@pytest.mark.parametrize('predicate', PREDICATES, ids=repr)
+def test_pushdown_matches_index_bits(store, predicate):
+    manifest = data_store.current_manifest(store)
+    view = data_store.shared_view(store)
+    indexes = IndexSet(view, manifest['rows'])
+
+    rows = bits_to_rows(predicate.bits(indexes), manifest['rows'])
+    expected = view.project(['SalePrice', 'OverallQual']).take(rows)
+    pushed = data_store.query_store(predicate, ['SalePrice', 'OverallQual'], store)
+
+    assert len(pushed) > 0
+    assert np.array_equal(pushed['SalePrice'].to_numpy(), expected['SalePrice'].to_numpy())
+    assert np.array_equal(pushed['OverallQual'].to_numpy(), expected['OverallQual'].to_numpy())
+
+
+def test_pushdown_matches_index_bits_across_appended_parts(store):
+    batch = pd.read_csv(store / data_store.SOURCE_FILES[0], nrows=40, **data_store.CSV_OPTIONS)
+    version = data_store.append_sales(batch.drop(columns=['Id']), store)
+    manifest = data_store.manifest_for(version, store)
+    predicate = query.Range('SalePrice', 150_000, 250_000) & query.In('Neighborhood', ['NAmes', 'CollgCr'])
+
+    indexes = data_store.shared_indexes(store, version=version)
+    rows = bits_to_rows(predicate.bits(indexes), manifest['rows'])
+    expected = data_store.shared_view(store, version=version).project(['SalePrice']).take(rows)
+    pushed = data_store.query_store(predicate, ['SalePrice'], store, version=version)
+
+    assert len(data_store.part_paths(manifest, store)) == 2
+    assert np.array_equal(pushed['SalePrice'].to_numpy(), expected['SalePrice'].to_numpy())
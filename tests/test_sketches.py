@@ -0,0 +1,46 @@
+"""Sketches de quantiles KLL : erreur de rang bornée, y compris après fusion."""
+import numpy as np
+import pytest
+
+from sketches import KLLSketch
+
+# Borne d'erreur sur le rang normalisé annoncée pour k = 200 (voir `sketches`)
+RANK_ERROR = 0.0165
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def rank_errors(sketch, values):
+    """Écart entre le rang visé et le rang exact du quantile estimé, pour chaque quantile."""
+    ordered = np.sort(values)
+    estimates = sketch.quantile(QUANTILES)
+    low = np.searchsorted(ordered, estimates, side='left') / len(ordered)
+    high = np.searchsorted(ordered, estimates, side='right') / len(ordered)
+    return np.maximum(low - QUANTILES, QUANTILES - high).clip(0)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_rank_error_is_bounded(seed):
+    values = np.random.default_rng(seed).lognormal(12, 0.4, 200_000)
+    sketch = KLLSketch(seed=seed)
+    for batch in np.array_split(values, 20):
+        sketch.update(batch)
+
+    assert rank_errors(sketch, values).max() < RANK_ERROR
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+    assert sketch.retained < 2_000
+
+
+def test_merged_sketches_keep_the_bound():
+    values = np.random.default_rng(0).normal(size=120_000)
+    merged = KLLSketch(seed=1)
+    for part in np.array_split(values, 6):
+        merged.merge(KLLSketch(seed=2).update(part))
+
+    assert merged.count == len(values)
+    assert rank_errors(merged, values).max() < RANK_ERROR
+
+
+def test_small_inputs_are_exact():
+    values = np.arange(150, dtype=np.float64)
+    sketch = KLLSketch().update(values)
+    assert sketch.quantile(0.5) == np.quantile(values, 0.5, method='inverted_cdf')
@@ -0,0 +1,44 @@
+"""Accumulateur de moments : la fusion de blocs redonne exactement les statistiques pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats_engine import RunningStats, parallel_stats
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'lognormal': rng.lognormal(12, 0.4, 5_000),
+        'counts': rng.integers(0, 10, 5_000).astype(np.float64),
+    })
+    df.loc[rng.choice(5_000, 400, replace=False), 'lognormal'] = np.nan
+    return df
+
+
+def expected(df):
+    return pd.DataFrame({'mean': df.mean(), 'std': df.std(), 'skew': df.skew(), 'kurtosis': df.kurt(),
+                         'min': df.min(), 'max': df.max()})
+
+
+def chunks(df, n_chunks):
+    return [df.iloc[rows] for rows in np.array_split(np.arange(len(df)), n_chunks)]
+
+
+@pytest.mark.parametrize('n_chunks', [1, 2, 7, 50])
+def test_merged_chunks_match_pandas(frame, n_chunks):
+    stats = RunningStats(frame.columns)
+    for chunk in chunks(frame, n_chunks):
+        stats.update(chunk)
+    summary = stats.summary()
+
+    assert summary['count'].tolist() == frame.count().tolist()
+    assert stats.missing_counts().tolist() == frame.isna().sum().tolist()
+    pd.testing.assert_frame_equal(summary[expected(frame).columns], expected(frame), rtol=1e-9, check_dtype=False)
+
+
+def test_parallel_partitions_match_single_pass(frame):
+    single = RunningStats.from_frame(frame, frame.columns).summary()
+    merged = parallel_stats(chunks(frame, 4), frame.columns).summary()
+    pd.testing.assert_frame_equal(merged, single, rtol=1e-9)
@@ -0,0 +1,21 @@
+"""
+Éléments d'interface communs aux pages d'analyse.
+"""
+import streamlit as st
+
+import data_store
+
+
+def served_version():
+    """Version du dataset à afficher, avec un avertissement si la suivante n'a pas pu être préparée.
+
+    Les caches des pages sont indexés par cette version : un ajout de ventes
+    les invalide. Quand la préparation en arrière-plan d'une nouvelle version
+    échoue, la version précédente reste servie et la page le signale.
+    """
+    version = data_store.dataset_version()
+    reload_error = data_store.reload_error()
+    if reload_error is not None:
+        st.warning(f"⚠️ Les données sources ont changé mais la nouvelle version n'a pas pu être préparée "
+                   f"({reload_error}) : la version {version} reste affichée.")
+    return version